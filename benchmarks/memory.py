@@ -0,0 +1,80 @@
+"""Memory footprint of a multi tenant ruler configuration.
+
+Builds a Ruler with many RuleSet objects and measures the memory allocated by the rule sets and their rules with
+tracemalloc, comparing the RuleStore used by the rule sets with the previous LinkedList storage.
+
+Usage: PYTHONPATH=. python benchmarks/memory.py [--sets 10000] [--rules 100000]
+"""
+
+import argparse
+import operator
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from pyruler import Rule, Ruler, RuleSet
+from pyruler.linked_list import LinkedList
+from pyruler.rule_store import RuleStore
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Measure the memory allocated by a build function.
+
+    :param build: Function that builds the measured objects
+    :return: Built objects and allocated bytes
+    """
+
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    built = build()
+    allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(start, 'filename'))
+    tracemalloc.stop()
+
+    return built, allocated
+
+
+def build_ruler(sets: int, rules: int) -> Ruler:
+    """Build a ruler with the given number of sets and rules distributed across the sets.
+
+    :param sets: Number of rule sets
+    :param rules: Total number of rules
+    :return Ruler: Configured ruler
+    """
+
+    ruler = Ruler()
+    per_set = rules // sets
+    rule_sets = []
+
+    for set_index in range(sets):
+        rule_set = RuleSet(name=f'tenant-{set_index}')
+        rule_set.add_many(Rule(name=f'rule-{index}', resolver=operator.truth) for index in range(per_set))
+        rule_sets.append(rule_set)
+
+    ruler.add_many(rule_sets)
+
+    return ruler
+
+
+def main():
+    """Run the memory benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sets', type=int, default=10000, help='Number of rule sets')
+    parser.add_argument('--rules', type=int, default=100000, help='Total number of rules')
+    args = parser.parse_args()
+
+    rules = [Rule(name=f'rule-{index}', resolver=operator.truth) for index in range(args.rules)]
+
+    _, store_bytes = measure(lambda: [RuleStore(rules[start:start + args.rules // args.sets])
+                                      for start in range(0, args.rules, args.rules // args.sets)])
+    _, list_bytes = measure(lambda: [LinkedList(rules[start:start + args.rules // args.sets])
+                                     for start in range(0, args.rules, args.rules // args.sets)])
+    _, ruler_bytes = measure(lambda: build_ruler(args.sets, args.rules))
+
+    print(f'{args.rules} rules across {args.sets} sets')
+    print(f'  ruler total:        {ruler_bytes / 2 ** 20:8.2f} MiB ({ruler_bytes / args.rules:6.1f} bytes per rule)')
+    print(f'  RuleStore storage:  {store_bytes / 2 ** 20:8.2f} MiB ({store_bytes / args.rules:6.1f} bytes per rule)')
+    print(f'  LinkedList storage: {list_bytes / 2 ** 20:8.2f} MiB ({list_bytes / args.rules:6.1f} bytes per rule)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""Throughput benchmarks of the apply hot paths.
+
+Measures RuleSet.apply and Ruler.apply on fail fast and collect all modes, with data that passes or fails every rule,
+different numbers of rules and sets, and rules with custom errors or the default RuleError. Each case reports the
+operations per second and the memory allocated by one call. Results can be saved as a JSON baseline and compared with a
+stored baseline, flagging the cases that got slower than the allowed threshold.
+
+Usage: PYTHONPATH=. python benchmarks/suite.py [--filter ruleset/] [--save baseline.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import operator
+import platform
+import sys
+import time
+import tracemalloc
+from functools import partial
+from itertools import product
+from typing import Any, AnyStr, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pyruler import Rule, Ruler, RuleSet
+
+RULE_COUNTS = (1, 10, 100, 1000)
+SET_COUNTS = (1, 10)
+REPEATS = 5
+
+
+class BenchmarkError(Exception):
+    """Custom error of the rules of the benchmarks."""
+
+
+def build_set(name: AnyStr, rules: int, custom_error: bool) -> RuleSet:
+    """Build a rule set which rules pass with truthy data and fail with falsy data.
+
+    :param name: Name of the set
+    :param rules: Number of rules
+    :param custom_error: Configure a custom error on every rule
+    :return RuleSet: Configured set
+    """
+
+    rule_set = RuleSet(name=name)
+    rule_set.add_many(
+        Rule(name=f'rule-{index}', resolver=operator.truth, error=BenchmarkError(index) if custom_error else None)
+        for index in range(rules))
+
+    return rule_set
+
+
+def applier(target: Any, data: Any, fail_fast: bool) -> Callable[[], None]:
+    """Build the benchmarked call of a rule set or a ruler.
+
+    :param target: Rule set or ruler
+    :param data: Validated data
+    :param fail_fast: Run on fail fast mode
+    :return Callable[[], None]: Benchmarked call
+    """
+
+    apply = target.apply
+
+    def call():
+        try:
+            apply(data, fail_fast=fail_fast)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    return call
+
+
+def build_case(target: AnyStr, sets: int, rules: int, fail_fast: bool, passing: bool,
+               custom_error: bool) -> Callable[[], None]:
+    """Configure the rule sets of a case and build its benchmarked call.
+
+    :param target: 'ruleset' to apply one set directly or 'ruler' to apply all the sets of a ruler
+    :param sets: Number of sets
+    :param rules: Number of rules of each set
+    :param fail_fast: Run on fail fast mode
+    :param passing: Validate data that passes all the rules, otherwise the data fails all the rules
+    :param custom_error: Configure a custom error on every rule
+    :return Callable[[], None]: Benchmarked call
+    """
+
+    rule_sets = [build_set(f'set-{index}', rules, custom_error) for index in range(sets)]
+    data = 1 if passing else 0
+
+    if target == 'ruleset':
+        return applier(rule_sets[0], data, fail_fast)
+
+    ruler = Ruler()
+    ruler.add_many(rule_sets)
+
+    return applier(ruler, data, fail_fast)
+
+
+def cases() -> Iterator[Tuple[AnyStr, Callable[[], Callable[[], None]]]]:
+    """Generate the benchmark cases. The rules of a case are only built when the case runs.
+
+    :return: Pairs of case name and function that builds the benchmarked call
+    """
+
+    for target, sets, rules, mode, outcome, error in product(('ruleset', 'ruler'), SET_COUNTS, RULE_COUNTS,
+                                                             ('fail_fast', 'collect'), ('pass', 'fail'),
+                                                             ('rule', 'custom')):
+        if (target == 'ruleset' and sets > 1) or (outcome == 'pass' and error == 'custom'):
+            continue
+
+        name = f'{target}/{mode}/{outcome}/rules={rules}/sets={sets}/error={error}'
+
+        yield name, partial(build_case, target, sets, rules, mode == 'fail_fast', outcome == 'pass', error == 'custom')
+
+
+def measure(call: Callable[[], None], min_time: float) -> Dict[AnyStr, float]:
+    """Measure the operations per second and the memory allocated by a call.
+
+    :param call: Benchmarked call
+    :param min_time: Minimum seconds of each timed repeat
+    :return Dict[AnyStr, float]: Operations per second and allocated bytes per call
+    """
+
+    call()
+    loops = 1
+
+    while True:
+        start = time.perf_counter()
+
+        for _ in range(loops):
+            call()
+
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= min_time:
+            break
+
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    best = elapsed
+
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+
+        for _ in range(loops):
+            call()
+
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'ops': loops / best, 'alloc_bytes': peak - before}
+
+
+def compare(results: Dict[AnyStr, Dict[AnyStr, float]], baseline: Dict[AnyStr, Any], threshold: float) -> int:
+    """Print the cases that are slower than the baseline by more than the threshold.
+
+    :param results: Current results by case name
+    :param baseline: Stored baseline
+    :param threshold: Allowed relative slowdown
+    :return int: Number of regressions
+    """
+
+    regressions = 0
+
+    for name, result in results.items():
+        expected = baseline['results'].get(name)
+
+        if expected is None:
+            continue
+
+        change = result['ops'] / expected['ops'] - 1
+
+        if change < -threshold:
+            regressions += 1
+            print(f'REGRESSION {name}: {expected["ops"]:,.0f} -> {result["ops"]:,.0f} ops/sec ({change:+.1%})')
+
+    return regressions
+
+
+def main(argv: Optional[List[AnyStr]] = None) -> int:
+    """Run the benchmark suite.
+
+    :param argv: Command line arguments
+    :return int: Exit code, 1 when some regression was found
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default='', help='Run only the cases which name contains the given text')
+    parser.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds of each timed repeat')
+    parser.add_argument('--save', help='Save the results as a JSON baseline on the given path')
+    parser.add_argument('--compare', help='Compare the results with the JSON baseline of the given path')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed relative slowdown, by default 15%%')
+    args = parser.parse_args(argv)
+
+    results = {}
+
+    print(f'{"case":<62} {"ops/sec":>14} {"bytes/call":>12}')
+
+    for name, build in cases():
+        if args.filter not in name:
+            continue
+
+        results[name] = measure(build(), args.min_time)
+        print(f'{name:<62} {results[name]["ops"]:>14,.0f} {results[name]["alloc_bytes"]:>12,}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline:
+            json.dump({'python': platform.python_version(), 'results': results}, baseline, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline:
+            regressions = compare(results, json.load(baseline), args.threshold)
+
+        print(f'{regressions} regressions against {args.compare}')
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
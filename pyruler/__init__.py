@@ -1,5 +1,13 @@
 """Pyruler main API objects to generate validations."""
 
+from .adaptive import AdaptiveOrder
+from .batch import BatchReport
+from .cache import RuleCache
+from .column_rule import ColumnResult, ColumnRule
+from .metrics import Metrics
 from .pyruler import Ruler
+from .result import ValidationResult
 from .rule import Rule
 from .ruleset import RuleSet
+from .runner import ProcessRunner
+from .sampling import FixedRate, KeyRate, LoadRate, Sampler
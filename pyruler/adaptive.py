@@ -0,0 +1,238 @@
+"""Adaptive ordering of the rules of a RuleSet on fail fast mode."""
+
+from threading import Lock
+from time import perf_counter
+from typing import Any, AnyStr, Dict, List, Optional, Sequence, Tuple
+
+from .errors import RuleSetConfigError
+from .rule import PlanEntry
+
+MIN_COST = 1e-9
+
+AdaptiveState = Tuple[Tuple[PlanEntry, ...], List['RuleStats'], Tuple[PlanEntry, ...]]
+
+
+class RuleStats:
+    """Decaying statistics of the executions of one rule.
+
+    :param name: Name of the rule
+    :param order_sensitive: Flag that tells if the rule keeps its position when the rules are reordered
+    """
+
+    __slots__ = ('name', 'order_sensitive', 'samples', 'failure_rate', 'mean_cost')
+
+    name: AnyStr
+    order_sensitive: bool
+    samples: int
+    failure_rate: float
+    mean_cost: float
+
+    def __init__(self, name: AnyStr, order_sensitive: bool = False):
+        self.name = name
+        self.order_sensitive = order_sensitive
+        self.samples = 0
+        self.failure_rate = 0.0
+        self.mean_cost = 0.0
+
+    @property
+    def score(self) -> float:
+        """Failure probability per unit of cost, rules with higher scores run first.
+
+        :return float: Score of the rule
+        """
+
+        return self.failure_rate / max(self.mean_cost, MIN_COST)
+
+
+class AdaptiveOrder:
+    """Track the failure rate and the cost of each rule of a set with exponentially decaying averages and
+    periodically reorder the execution by failure probability per unit of cost. Order sensitive rules keep their
+    position and the other rules are never moved across them.
+
+    The bound plan, its statistics and the execution order are published together on a single tuple, so a rule set
+    reloaded while other threads run the rules never mixes the statistics of one plan with the order of another.
+    Each rule set needs its own instance.
+
+    :param interval: Number of executions between reorders
+    :param decay: Weight of the newest sample on the decaying averages
+    """
+
+    _interval: int
+    _decay: float
+    _calls: int
+    _state: AdaptiveState
+    _owner: Optional[AnyStr]
+    _lock: Lock
+
+    def __init__(self, interval: int = 1000, decay: float = 0.05):
+        self._interval = interval
+        self._decay = decay
+        self._calls = 0
+        self._state = ((), [], ())
+        self._owner = None
+        self._lock = Lock()
+
+    @property
+    def order(self) -> Tuple[PlanEntry, ...]:
+        """Current execution order of the plan entries.
+
+        :return Tuple[PlanEntry, ...]: Reordered plan
+        """
+
+        return self._state[2]
+
+    def attach(self, owner: AnyStr) -> None:
+        """Reserve the adaptive order for a rule set, as the statistics are tracked by the rules of a single set.
+
+        :param owner: Name of the rule set
+        :raises RuleSetConfigError: When the adaptive order is already used by another rule set
+        """
+
+        with self._lock:
+            if self._owner is not None:
+                raise RuleSetConfigError(
+                    f"AdaptiveOrder is already used by RuleSet '{self._owner}', each RuleSet needs its own instance")
+
+            self._owner = owner
+
+    def bind(self, plan: Tuple[PlanEntry, ...], order_sensitive: Sequence[bool]) -> None:
+        """Start tracking a new execution plan. Statistics of the rules already tracked are kept, matched by the
+        name of the rules.
+
+        :param plan: Compiled execution plan of the set
+        :param order_sensitive: Order sensitive flag of each entry of the plan
+        """
+
+        with self._lock:
+            tracked = {}
+
+            for rule_stats in self._state[1]:
+                tracked.setdefault(rule_stats.name, []).append(rule_stats)
+
+            stats = []
+
+            for index, _, name, _ in plan:
+                kept = tracked.get(name)
+                rule_stats = kept.pop(0) if kept else RuleStats(name)
+                rule_stats.order_sensitive = order_sensitive[index]
+                stats.append(rule_stats)
+
+            self._calls = 0
+            self._state = (plan, stats, self._sorted(plan, stats))
+
+    def run(self, data: Any) -> Optional[PlanEntry]:
+        """Execute the rules on the current order until the first failure, measuring each execution.
+
+        :param data: Data to be validated
+        :return Optional[PlanEntry]: Entry of the failing rule or None if all the rules pass
+        """
+
+        decay = self._decay
+        _, stats, order = self._state
+        failed = None
+
+        for entry in order:
+            start = perf_counter()
+            passed = entry[1](data)
+            cost = perf_counter() - start
+
+            rule_stats = stats[entry[0]]
+            failure = 0.0 if passed else 1.0
+
+            if rule_stats.samples:
+                rule_stats.failure_rate += decay * (failure - rule_stats.failure_rate)
+                rule_stats.mean_cost += decay * (cost - rule_stats.mean_cost)
+            else:
+                rule_stats.failure_rate = failure
+                rule_stats.mean_cost = cost
+
+            rule_stats.samples += 1
+
+            if not passed:
+                failed = entry
+                break
+
+        self._calls += 1
+
+        if self._calls >= self._interval:
+            self.reorder()
+
+        return failed
+
+    def reorder(self) -> None:
+        """Recalculate the execution order with the current statistics."""
+
+        with self._lock:
+            plan, stats, _ = self._state
+            self._calls = 0
+            self._state = (plan, stats, self._sorted(plan, stats))
+
+    def stats(self) -> List[Dict[AnyStr, Any]]:
+        """Return the statistics of the rules on the current execution order.
+
+        :return List[Dict[AnyStr, Any]]: Statistics of each rule
+        """
+
+        _, stats, order = self._state
+
+        return [{
+            'name': stats[index].name,
+            'position': index,
+            'order_sensitive': stats[index].order_sensitive,
+            'samples': stats[index].samples,
+            'failure_rate': stats[index].failure_rate,
+            'mean_cost': stats[index].mean_cost,
+            'score': stats[index].score,
+        } for index, _, _, _ in order]
+
+    @classmethod
+    def _sorted(cls, plan: Tuple[PlanEntry, ...], stats: List[RuleStats]) -> Tuple[PlanEntry, ...]:
+        """Sort the plan entries by score between the order sensitive rules.
+
+        :param plan: Bound execution plan
+        :param stats: Statistics of each entry of the plan
+        :return Tuple[PlanEntry, ...]: Sorted plan
+        """
+
+        order = []
+        segment = []
+
+        for entry in plan:
+            if stats[entry[0]].order_sensitive:
+                order.extend(cls._sorted_segment(segment, stats))
+                order.append(entry)
+                segment = []
+                continue
+
+            segment.append(entry)
+
+        order.extend(cls._sorted_segment(segment, stats))
+
+        return tuple(order)
+
+    def __getstate__(self) -> Dict[AnyStr, Any]:
+        """Get the configuration to be pickled. The statistics and the bound plan are not pickled.
+
+        :return Dict[AnyStr, Any]: Adaptive order configuration
+        """
+
+        return {'interval': self._interval, 'decay': self._decay}
+
+    def __setstate__(self, state: Dict[AnyStr, Any]) -> None:
+        """Restore a pickled adaptive order without statistics.
+
+        :param state: Adaptive order configuration
+        """
+
+        self.__init__(**state)  # pylint: disable=unnecessary-dunder-call
+
+    @staticmethod
+    def _sorted_segment(segment: List[PlanEntry], stats: List[RuleStats]) -> List[PlanEntry]:
+        """Sort a segment of reorderable entries by descending score. Ties keep the insertion order.
+
+        :param segment: Plan entries without order sensitive rules
+        :param stats: Statistics of each entry of the plan
+        :return List[PlanEntry]: Sorted entries
+        """
+
+        return sorted(segment, key=lambda entry: -stats[entry[0]].score)
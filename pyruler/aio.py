@@ -0,0 +1,126 @@
+"""Asyncio helpers to run rule validations concurrently."""
+
+import asyncio
+import inspect
+from operator import itemgetter
+from typing import Any, AnyStr, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from .result import ValidationResult
+
+AsyncPlanEntry = Tuple[int, Callable[[Any], Any], AnyStr, Optional[Exception], bool]
+
+
+class _Cancelled:
+    """Result of the awaitables cancelled by gather_until."""
+
+    def __repr__(self) -> str:
+        return 'CANCELLED'
+
+
+CANCELLED = _Cancelled()
+
+
+def is_async_callable(func: Any) -> bool:
+    """Tells if a callable returns an awaitable, like async functions and objects with an async __call__ method.
+
+    :param func: Callable to be checked
+    :return bool: Assertion
+    """
+
+    if inspect.iscoroutinefunction(func):
+        return True
+
+    call = getattr(func, '__call__', None)
+
+    return call is not None and not inspect.isfunction(func) and inspect.iscoroutinefunction(call)
+
+
+async def gather_until(awaitables: Sequence[Awaitable], stop: Callable[[Any], bool]) -> List[Any]:
+    """Run the awaitables concurrently and return their results in the same order. As soon as a result makes the stop
+    function return True, the pending awaitables are cancelled and their results are CANCELLED. If some awaitable
+    raises an error the pending ones are cancelled and the error is propagated.
+
+    :param awaitables: Awaitables to be executed
+    :param stop: Function that receives each result and tells if the pending awaitables should be cancelled
+    :return List[Any]: Results of the awaitables
+    """
+
+    if len(awaitables) == 1:
+        return [await awaitables[0]]
+
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    positions = {task: position for position, task in enumerate(tasks)}
+    results = [CANCELLED] * len(tasks)
+    pending = set(tasks)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            stopped = False
+
+            for task in sorted(done, key=positions.get):
+                result = task.result()
+                results[positions[task]] = result
+                stopped = stopped or stop(result)
+
+            if stopped:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return results
+
+
+async def run_async_plan(set_name: AnyStr, plan: Tuple[AsyncPlanEntry, ...], data: Any,
+                         fail_fast: Optional[bool] = True) -> ValidationResult:
+    """Apply the async execution plan of a rule set to the data. Sync rules run first inline in their order and then
+    all the async rules run concurrently. On fail fast mode the pending async rules are cancelled as soon as one of
+    them fails.
+
+    :param set_name: Name of the rule set of the plan
+    :param plan: Async execution plan of the set
+    :param data: Data to be validated by the rule set
+    :param fail_fast: flag to determine if the validation stops at first not True rule
+    :return ValidationResult: Result of the validation
+    """
+
+    failures = []
+    pending = []
+
+    for entry in plan:
+        if entry[4]:
+            pending.append(entry)
+        elif not entry[1](data):
+            failures.append(entry)
+
+            if fail_fast:
+                break
+
+    if pending and not (fail_fast and failures):
+        stop = _is_failure if fail_fast else _never
+        passes = await gather_until([entry[1](data) for entry in pending], stop)
+
+        failures.extend(entry for entry, passed in zip(pending, passes) if passed is not CANCELLED and not passed)
+        failures.sort(key=itemgetter(0))
+
+    if fail_fast:
+        failures = failures[:1]
+
+    return ValidationResult(
+        tuple(entry[2] for entry in failures),
+        tuple(entry[3] for entry in failures),
+        (set_name, ) * len(failures),
+        bool(fail_fast),
+    )
+
+
+def _is_failure(passed: bool) -> bool:
+    return not passed
+
+
+def _never(_: Any) -> bool:
+    return False
@@ -0,0 +1,205 @@
+"""Validation of batches of records by many rule sets and compact reports of their failures."""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, AnyStr, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from .result import ValidationResult
+from .rule import PlanEntry
+
+POSITION_TYPECODE = 'I'
+
+Failures = Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]
+
+
+class BatchReport:
+    """Failures of a batch of records stored as one array of failing record positions for each rule, so the memory of
+    the report grows with the number of failures instead of the number of records. The names and errors of the
+    failing rules of a record are only built when the record is looked up.
+
+    :param plans: Execution plans of the applied rule sets by set name
+    :param fail_fast: Flag that tells if the validation of each record stopped at the first failing rule
+    """
+
+    __slots__ = ('size', 'failed', 'fail_fast', '_plans', '_columns')
+
+    size: int
+    failed: int
+    fail_fast: bool
+    _plans: Mapping[AnyStr, Tuple[PlanEntry, ...]]
+    _columns: Dict[Tuple[AnyStr, int], array]
+
+    def __init__(self, plans: Mapping[AnyStr, Tuple[PlanEntry, ...]], fail_fast: Optional[bool] = True):
+        self.size = 0
+        self.failed = 0
+        self.fail_fast = bool(fail_fast)
+        self._plans = plans
+        self._columns = dict()
+
+    @property
+    def ok(self) -> bool:
+        """Tells if all the records of the batch passed.
+
+        :return bool: Assertion
+        """
+
+        return not self.failed
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the failing positions of the report.
+
+        :return int: Size in bytes
+        """
+
+        return sum(len(column) * column.itemsize for column in self._columns.values())
+
+    def append(self, failures: Failures) -> None:
+        """Add the failures of the next record of the batch.
+
+        :param failures: Pairs with the name of a failing set and the positions of its failing rules
+        """
+
+        position = self.size
+        self.size += 1
+
+        if not failures:
+            return
+
+        self.failed += 1
+
+        for set_name, indexes in failures:
+            for index in indexes:
+                column = self._columns.get((set_name, index))
+
+                if column is None:
+                    column = self._columns[(set_name, index)] = array(POSITION_TYPECODE)
+
+                column.append(position)
+
+    def counts(self) -> Dict[Tuple[AnyStr, AnyStr], int]:
+        """Count the failing records of each rule, on the order of the sets and their rules. Rules without failures
+        are not included.
+
+        :return Dict[Tuple[AnyStr, AnyStr], int]: Number of failing records by set name and rule name
+        """
+
+        return {(set_name, name): len(column) for set_name, name, column in self._failing_columns()}
+
+    def positions(self, set_name: AnyStr, rule_name: AnyStr) -> array:
+        """Get the positions of the records that failed a rule.
+
+        :param set_name: Name of the rule set
+        :param rule_name: Name of the rule
+        :return array: Sorted positions of the failing records, empty when the rule didn't fail
+        """
+
+        for failing_set, name, column in self._failing_columns():
+            if failing_set == set_name and name == rule_name:
+                return column
+
+        return array(POSITION_TYPECODE)
+
+    def row(self, position: int) -> ValidationResult:
+        """Build the result of one record of the batch.
+
+        :param position: Position of the record on the batch
+        :return ValidationResult: Result of the record
+        :raises IndexError: When the position is out of the batch
+        """
+
+        if not 0 <= position < self.size:
+            raise IndexError(f'Record {position} is out of a batch of {self.size} records')
+
+        rule_names = []
+        errors = []
+        set_names = []
+
+        for set_name, plan in self._plans.items():
+            for index, _, name, error in plan:
+                column = self._columns.get((set_name, index))
+
+                if column is None:
+                    continue
+
+                found = bisect_left(column, position)
+
+                if found < len(column) and column[found] == position:
+                    rule_names.append(name)
+                    errors.append(error)
+                    set_names.append(set_name)
+
+        return ValidationResult(tuple(rule_names), tuple(errors), tuple(set_names), self.fail_fast)
+
+    def _failing_columns(self) -> Iterator[Tuple[AnyStr, AnyStr, array]]:
+        """Iterate the failing positions of the rules with failures, on the order of the sets and their rules.
+
+        :return: Set name, rule name and failing positions of each rule
+        """
+
+        for set_name, plan in self._plans.items():
+            for index, _, name, _ in plan:
+                column = self._columns.get((set_name, index))
+
+                if column is not None:
+                    yield set_name, name, column
+
+    def __repr__(self) -> AnyStr:
+        return f'<BatchReport: {self.failed} of {self.size} records fail>'
+
+
+def fail_fast_indexes(indexers: Tuple[Tuple[AnyStr, Callable[[Any], Tuple[int, ...]]], ...], data: Any) -> Failures:
+    """Return the set name and the position of the first rule that fails with the data.
+
+    :param indexers: Pairs of set names and rule set validation functions
+    :param data: Data to be validated by the rule sets
+    :return: Failing set and rule position, or an empty tuple if all the sets pass
+    """
+
+    for set_name, index in indexers:
+        failed = index(data)
+
+        if failed:
+            return ((set_name, failed), )
+
+    return ()
+
+
+def collect_indexes(indexers: Tuple[Tuple[AnyStr, Callable[[Any], Tuple[int, ...]]], ...], data: Any) -> Failures:
+    """Return the set names and the positions of all the rules that fail with the data.
+
+    :param indexers: Pairs of set names and rule set validation functions
+    :param data: Data to be validated by the rule sets
+    :return: Failing sets and rule positions, or an empty tuple if all the sets pass
+    """
+
+    failures = ((set_name, index(data)) for set_name, index in indexers)
+
+    return tuple(failure for failure in failures if failure[1])
+
+
+def dependent_indexes(indexers: Tuple[Tuple[AnyStr, Callable[[Any], Tuple[int, ...]], Tuple[AnyStr, ...]], ...],
+                      data: Any) -> Failures:
+    """Return the set names and the positions of all the rules that fail with the data, skipping the sets that
+    depend on a failing set.
+
+    :param indexers: Set names, rule set validation functions and names of the sets each set depends on
+    :param data: Data to be validated by the rule sets
+    :return: Failing sets and rule positions, or an empty tuple if all the sets pass
+    """
+
+    failures = []
+    failed = set()
+
+    for set_name, index, depends_on in indexers:
+        if failed and failed.intersection(depends_on):
+            failed.add(set_name)
+            continue
+
+        positions = index(data)
+
+        if positions:
+            failures.append((set_name, positions))
+            failed.add(set_name)
+
+    return tuple(failures)
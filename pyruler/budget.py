@@ -0,0 +1,77 @@
+"""Cost tiers and time budgets of the rule set validations."""
+
+from operator import itemgetter
+from time import perf_counter
+from typing import Any, AnyStr, Callable, Iterable, Optional, Tuple
+
+from .result import ValidationResult
+from .rule import CHEAP, TIERS, PlanEntry, Rule
+
+TieredPlanEntry = Tuple[PlanEntry, bool]
+
+
+def resolve_deadline(budget: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """Get the deadline of a validation from a time budget and an absolute deadline, taking the earliest one.
+
+    :param budget: Seconds that the validation can take from now
+    :param deadline: Absolute deadline as a time.perf_counter value
+    :return Optional[float]: Deadline as a time.perf_counter value or None when the validation doesn't have limit
+    """
+
+    if budget is None:
+        return deadline
+
+    budget_deadline = perf_counter() + budget
+
+    return budget_deadline if deadline is None else min(deadline, budget_deadline)
+
+
+def tiered_plan(rules: Iterable[Rule],
+                compile_rule: Callable[[Rule], Callable[[Any], bool]]) -> Tuple[TieredPlanEntry, ...]:
+    """Build the execution plan of the validations with a time budget. It has the entries of the execution plan
+    sorted by the cost tier of their rules, each one with a flag that tells if the rule is cheap.
+
+    :param rules: Rules of the set in their order
+    :param compile_rule: Function that returns the resolver of a rule for the execution plan
+    :return Tuple[TieredPlanEntry, ...]: Tiered execution plan
+    """
+
+    ordered = sorted(enumerate(rules), key=lambda item: TIERS.index(item[1].tier))
+
+    return tuple(((index, compile_rule(rule), rule.name, rule.error), rule.tier == CHEAP) for index, rule in ordered)
+
+
+def run_tiers(set_name: AnyStr, plan: Tuple[TieredPlanEntry, ...], data: Any, fail_fast: Optional[bool],
+              deadline: float) -> ValidationResult:
+    """Apply the tiered execution plan to the data skipping the rules that are not cheap after the deadline.
+
+    :param set_name: Name of the rule set of the plan
+    :param plan: Tiered execution plan of the set
+    :param data: Data to be validated by the rule set
+    :param fail_fast: flag to determine if the validation stops at first not True rule
+    :param deadline: Deadline of the validation as a time.perf_counter value
+    :return ValidationResult: Result of the validation with the skipped rules
+    """
+
+    failures = []
+    skipped = []
+
+    for entry, cheap in plan:
+        if not cheap and perf_counter() >= deadline:
+            skipped.append(entry)
+        elif not entry[1](data):
+            failures.append(entry)
+
+            if fail_fast:
+                break
+
+    failures.sort(key=itemgetter(0))
+    skipped.sort(key=itemgetter(0))
+
+    return ValidationResult(
+        tuple(entry[2] for entry in failures),
+        tuple(entry[3] for entry in failures),
+        (set_name, ) * len(failures),
+        bool(fail_fast),
+        skipped_rules=tuple(entry[2] for entry in skipped),
+    )
@@ -0,0 +1,138 @@
+"""Result cache for pure rules."""
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, AnyStr, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class RuleCache:
+    """Bounded LRU cache of rule results for pure rules, this is rules which result only depends on a key extracted
+    from the validated data. Optionally the results can expire after a time to live.
+
+    :param key: Callable that receives the validated data and returns the hashable key of the result
+    :param size: Maximum number of cached results
+    :param ttl: Seconds that a cached result is valid, None for results that never expire
+    """
+
+    _key: Callable[[Any], Hashable]
+    _size: int
+    _ttl: Optional[float]
+    _values: 'OrderedDict[Hashable, Tuple[bool, float]]'
+    _hits: int
+    _misses: int
+    _lock: Lock
+
+    def __init__(self, key: Callable[[Any], Hashable], size: int = 1024, ttl: Optional[float] = None):
+        self._key = key
+        self._size = size
+        self._ttl = ttl
+        self._values = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def key(self) -> Callable[[Any], Hashable]:
+        """Callable that extracts the key of the results from the validated data.
+
+        :return Callable: Key extractor
+        """
+
+        return self._key
+
+    @property
+    def hits(self) -> int:
+        """Number of results served from the cache.
+
+        :return int: Cache hits
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of results that were calculated by the resolver.
+
+        :return int: Cache misses
+        """
+
+        return self._misses
+
+    def stats(self) -> Dict[AnyStr, Any]:
+        """Return the cache statistics.
+
+        :return Dict[AnyStr, Any]: Hits, misses, size and max size of the cache
+        """
+
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'size': len(self._values),
+            'max_size': self._size,
+        }
+
+    def resolve(self, resolver: Callable[[Any], bool], data: Any) -> bool:
+        """Return the cached result for the key of the data or calculate and store it with the resolver.
+
+        :param resolver: Rule resolver
+        :param data: Validated data
+        :return bool: Rule result
+        """
+
+        key = self._key(data)
+
+        with self._lock:
+            cached = self._values.get(key, _MISSING)
+
+            if cached is not _MISSING and (self._ttl is None or cached[1] > monotonic()):
+                self._values.move_to_end(key)
+                self._hits += 1
+                return cached[0]
+
+        result = resolver(data)
+        expires = 0.0 if self._ttl is None else monotonic() + self._ttl
+
+        with self._lock:
+            self._misses += 1
+            self._values[key] = (result, expires)
+            self._values.move_to_end(key)
+
+            if len(self._values) > self._size:
+                self._values.popitem(last=False)
+
+        return result
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Remove one cached result or all the cached results when no key is given.
+
+        :param key: Key of the result to be removed
+        """
+
+        with self._lock:
+            if key is _MISSING:
+                self._values.clear()
+                return
+
+            self._values.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getstate__(self) -> Dict[AnyStr, Any]:
+        """Get the configuration of the cache to be pickled. Cached results are not pickled.
+
+        :return Dict[AnyStr, Any]: Cache configuration
+        """
+
+        return {'key': self._key, 'size': self._size, 'ttl': self._ttl}
+
+    def __setstate__(self, state: Dict[AnyStr, Any]) -> None:
+        """Restore a pickled cache without results.
+
+        :param state: Cache configuration
+        """
+
+        self.__init__(**state)  # pylint: disable=unnecessary-dunder-call
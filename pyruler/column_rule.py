@@ -0,0 +1,119 @@
+"""Implementation of vectorized rules that validate columns of data at once."""
+
+from typing import Any, AnyStr, Callable, Dict, Mapping, Tuple, Type
+
+from .errors import RuleConfigError, RuleSetError
+from .rule import PlanEntry, Rule
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def require_numpy(feature: AnyStr, error: Type[Exception] = RuleConfigError) -> None:
+    """Check that NumPy is installed before using a columnar feature.
+
+    :param feature: Name of the feature that requires NumPy
+    :param error: Configuration error raised when NumPy is missing
+    :raise RuleConfigError: When NumPy is not installed, or the given error
+    """
+
+    if numpy is None:
+        raise error(f"{feature} requires numpy to be installed, "
+                    "install it with 'pip install pyruler[numpy]'")
+
+
+class ColumnRule(Rule):
+    """Rule that validates many rows at once. The resolver receives a mapping of column names to NumPy arrays and
+    should return a boolean mask with one value per row. This rule type requires NumPy to be installed.
+
+    :param name: Name of the rule
+    :param resolver: Callable function that receives the columns and returns a boolean mask
+    :param error: Custom exception that can be raised by the RuleSet in case the rule validation fails
+    :raise RuleConfigError: When NumPy is not installed
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name: AnyStr, resolver: Callable = None, error: Exception = None):
+        require_numpy(f"ColumnRule '{name}'")
+        super().__init__(name, resolver, error)
+
+    def execute(self, data: Mapping[AnyStr, Any]) -> Any:
+        """Execute the rule validation over the columns.
+
+        :param data: Mapping of column names to arrays
+        :return numpy.ndarray: Boolean mask with the rows that pass the rule
+        :raise RuleConfigError: When the resolver is not callable
+        """
+
+        return numpy.asarray(self.compile()(data), dtype=bool)
+
+
+class ColumnResult:
+    """Outcome of a columnar validation.
+
+    :param mask: Boolean mask with the rows that passed all the evaluated rules
+    :param failures: Indices of the failing rows of each evaluated rule. Rules that were not evaluated because all the
+        rows already failed are not included.
+    """
+
+    __slots__ = ('mask', 'failures')
+
+    mask: Any
+    failures: Dict[AnyStr, Any]
+
+    def __init__(self, mask: Any, failures: Dict[AnyStr, Any]):
+        self.mask = mask
+        self.failures = failures
+
+    @property
+    def ok(self) -> bool:
+        """Tells if all the rows passed the validation.
+
+        :return bool: Assertion
+        """
+
+        return bool(self.mask.all())
+
+    @property
+    def failing_rows(self) -> Any:
+        """Indices of the rows that failed some rule.
+
+        :return numpy.ndarray: Row indices
+        """
+
+        return numpy.flatnonzero(~self.mask)
+
+    def __repr__(self) -> AnyStr:
+        return f'<ColumnResult: {len(self.failing_rows)} of {len(self.mask)} rows fail>'
+
+
+def apply_columns(plan: Tuple[PlanEntry, ...], columns: Mapping[AnyStr, Any]) -> ColumnResult:
+    """Apply the execution plan of a set of column rules to many rows at once. The masks of the rules are combined and
+    the evaluation stops as soon as every row has failed.
+
+    :param plan: Compiled execution plan of the column rules
+    :param columns: Mapping of column names to NumPy arrays of the same size
+    :return ColumnResult: Combined mask and failing row indices of each rule
+    :raise RuleSetError: When the columns have different sizes
+    """
+
+    sizes = {len(column) for column in columns.values()}
+
+    if len(sizes) > 1:
+        raise RuleSetError(f'Columns should have the same size, got sizes {sorted(sizes)}')
+
+    valid = numpy.ones(sizes.pop() if sizes else 0, dtype=bool)
+    failures = {}
+
+    for _, resolver, name, _ in plan:
+        mask = numpy.asarray(resolver(columns), dtype=bool)
+        failures[name] = numpy.flatnonzero(~mask)
+        valid &= mask
+
+        if not valid.any():
+            break
+
+    return ColumnResult(valid, failures)
@@ -0,0 +1,174 @@
+"""Small expression language compiled to Python functions.
+
+Expressions use the Python syntax for comparisons, boolean operators, arithmetic and literals, and every name or
+dotted name is a field path of the validated data, like ``amount > 0 and currency in {"USD", "EUR"}``. Missing
+fields are evaluated as None and operations that can't be applied to the field values make the expression False.
+"""
+
+import ast
+from functools import lru_cache
+from typing import Any, AnyStr, Callable, Tuple
+
+from .errors import RuleConfigError
+from .fields import MISSING, extract, split_path
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Is,
+    ast.IsNot,
+    ast.Name,
+    ast.Attribute,
+    ast.Constant,
+    ast.Set,
+    ast.List,
+    ast.Tuple,
+    ast.Load,
+)
+
+_TEMPLATE = '''
+def rule(data):
+    try:
+        return bool(__expression__)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return False
+'''
+
+CACHE_SIZE = 4096
+
+_BUILTINS = {
+    'bool': bool,
+    'TypeError': TypeError,
+    'ValueError': ValueError,
+    'ZeroDivisionError': ZeroDivisionError,
+}
+
+
+def _get(data: Any, path: AnyStr, parts: Tuple[AnyStr, ...]) -> Any:
+    """Get a field value for the compiled expressions.
+
+    :param data: Validated data
+    :param path: Dotted field path
+    :param parts: Path parts
+    :return Any: Value of the field or None when it doesn't exist
+    """
+
+    value = extract(data, path, parts)
+
+    return None if value is MISSING else value
+
+
+class _FieldTransformer(ast.NodeTransformer):
+    """Replace the names and dotted names of an expression with field lookups."""
+
+    def __init__(self):
+        self.reads = []
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:  # pylint: disable=invalid-name
+        """Transform a single field name."""
+
+        return self._lookup(node.id, node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:  # pylint: disable=invalid-name
+        """Transform a dotted field name."""
+
+        parts = []
+        current = node
+
+        while isinstance(current, ast.Attribute):
+            parts.append(current.attr)
+            current = current.value
+
+        if not isinstance(current, ast.Name):
+            raise RuleConfigError('Only field names can be used before a dot on rule expressions')
+
+        parts.append(current.id)
+
+        return self._lookup('.'.join(reversed(parts)), node)
+
+    def _lookup(self, path: AnyStr, node: ast.AST) -> ast.AST:
+        """Build the field lookup call of a path.
+
+        :param path: Dotted field path
+        :param node: Replaced node
+        :return ast.AST: Lookup call
+        """
+
+        if path not in self.reads:
+            self.reads.append(path)
+
+        call = ast.Call(
+            func=ast.Name(id='_get', ctx=ast.Load()),
+            args=[
+                ast.Name(id='data', ctx=ast.Load()),
+                ast.Constant(value=path),
+                ast.Constant(value=split_path(path)),
+            ],
+            keywords=[],
+        )
+
+        return ast.copy_location(call, node)
+
+
+class _ExpressionInjector(ast.NodeTransformer):
+    """Put the transformed expression in the function template."""
+
+    def __init__(self, expression: ast.AST):
+        self._expression = expression
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:  # pylint: disable=invalid-name
+        """Replace the expression placeholder."""
+
+        return self._expression if node.id == '__expression__' else node
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expression: AnyStr) -> Tuple[Callable[[Any], bool], Tuple[AnyStr, ...]]:
+    """Compile a rule expression to a Python function. Compiled functions are cached by the expression text.
+
+    :param expression: Rule expression
+    :return: Compiled function and the field paths read by the expression
+    :raises RuleConfigError: When the expression is not valid
+    """
+
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as error:
+        raise RuleConfigError(f"Invalid rule expression '{expression}': {error.msg}")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise RuleConfigError(f"Invalid rule expression '{expression}': {type(node).__name__} is not allowed")
+
+    transformer = _FieldTransformer()
+    body = transformer.visit(tree).body
+
+    module = _ExpressionInjector(body).visit(ast.parse(_TEMPLATE))
+    ast.fix_missing_locations(module)
+
+    namespace = {'_get': _get, '__builtins__': _BUILTINS}
+    exec(compile(module, f'<rule: {expression}>', 'exec'), namespace)  # pylint: disable=exec-used
+
+    return namespace['rule'], tuple(transformer.reads)
@@ -0,0 +1,314 @@
+"""Field path extraction and operators of the declarative field rules."""
+
+import operator
+import re
+from threading import local
+from typing import Any, AnyStr, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Sequence, Set, Tuple, Union
+
+from .errors import RuleConfigError
+
+
+class _Missing:
+    """Value of the field paths that don't exist on the data."""
+
+    def __repr__(self) -> AnyStr:
+        return 'MISSING'
+
+    def __bool__(self) -> bool:
+        return False
+
+
+MISSING = _Missing()
+
+_LOOKUP_ERRORS = (KeyError, IndexError, AttributeError, TypeError, ValueError)
+
+_UNSET = object()
+
+_local = local()
+
+
+def _is_in(value: Any, expected: Any) -> bool:
+    return value in expected
+
+
+def _not_in(value: Any, expected: Any) -> bool:
+    return value not in expected
+
+
+def _contains(value: Any, expected: Any) -> bool:
+    return expected in value
+
+
+def _matches(value: Any, expected: Any) -> bool:
+    return expected.search(value) is not None
+
+
+OPERATORS: Dict[AnyStr, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': _is_in,
+    'not in': _not_in,
+    'contains': _contains,
+    'matches': _matches,
+}
+
+PRESENCE_OPERATORS = ('exists', 'missing')
+
+
+def split_path(path: AnyStr) -> Tuple[AnyStr, ...]:
+    """Split a dotted field path on its parts.
+
+    :param path: Field path like 'user.address.country'
+    :return Tuple[AnyStr, ...]: Path parts
+    """
+
+    return tuple(path.split('.'))
+
+
+def overlaps(path: AnyStr, other: AnyStr) -> bool:
+    """Tells if two field paths are the same field or one of them is nested on the other.
+
+    :param path: Dotted field path
+    :param other: Dotted field path
+    :return bool: Assertion
+    """
+
+    return path == other or path.startswith(other + '.') or other.startswith(path + '.')
+
+
+class ReadsIndex:
+    """Index of the rules of a set by the field paths they read, to find the rules affected by a change of some fields
+    with a few lookups for each changed field, whatever the number of rules.
+
+    :param reads: Field paths read by each rule, None for the rules that can read any field
+    """
+
+    __slots__ = ('_opaque', '_exact', '_nested')
+
+    _opaque: Tuple[int, ...]
+    _exact: Dict[AnyStr, Set[int]]
+    _nested: Dict[AnyStr, Set[int]]
+
+    def __init__(self, reads: Sequence[Optional[Tuple[AnyStr, ...]]]):
+        opaque = []
+        self._exact = dict()
+        self._nested = dict()
+
+        for position, paths in enumerate(reads):
+            if paths is None:
+                opaque.append(position)
+                continue
+
+            for path in paths:
+                parts = split_path(path)
+                self._exact.setdefault(path, set()).add(position)
+
+                for size in range(1, len(parts) + 1):
+                    self._nested.setdefault('.'.join(parts[:size]), set()).add(position)
+
+        self._opaque = tuple(opaque)
+
+    def affected(self, changed_fields: Iterable[AnyStr]) -> Set[int]:
+        """Get the positions of the rules that read a changed field, a field nested on it or a field it is nested on.
+        The rules that can read any field are always affected.
+
+        :param changed_fields: Dotted paths of the changed fields
+        :return Set[int]: Positions of the affected rules
+        """
+
+        positions = set(self._opaque)
+
+        for path in changed_fields:
+            positions.update(self._nested.get(path, ()))
+            parts = split_path(path)
+
+            for size in range(1, len(parts)):
+                positions.update(self._exact.get('.'.join(parts[:size]), ()))
+
+        return positions
+
+
+def traverse(data: Any, parts: Tuple[AnyStr, ...]) -> Any:
+    """Get the value of a field path from nested mappings, sequences or object attributes.
+
+    :param data: Data to be traversed
+    :param parts: Path parts
+    :return Any: Value of the field or MISSING when the path doesn't exist
+    """
+
+    for part in parts:
+        try:
+            data = data[part]
+        except TypeError:
+            try:
+                data = data[int(part)] if part.isdigit() else getattr(data, part)
+            except _LOOKUP_ERRORS:
+                return MISSING
+        except _LOOKUP_ERRORS:
+            return MISSING
+
+    return data
+
+
+def extract(data: Any, path: AnyStr, parts: Tuple[AnyStr, ...]) -> Any:
+    """Get the value of a field path. Inside a shared extraction of the same data the value is only traversed once
+    and reused by all the rules that read the same path.
+
+    :param data: Data to be traversed
+    :param path: Dotted field path
+    :param parts: Path parts
+    :return Any: Value of the field or MISSING when the path doesn't exist
+    """
+
+    scope = getattr(_local, 'scope', None)
+
+    if scope is None or scope[0] is not data:
+        return traverse(data, parts)
+
+    values = scope[1]
+    value = values.get(path, _UNSET)
+
+    if value is _UNSET:
+        value = values[path] = traverse(data, parts)
+
+    return value
+
+
+def call_once(data: Any, func: Callable[[Any], Any]) -> Any:
+    """Call a function of the data. Inside a shared extraction of the same data the function is only called once and
+    its result is reused, stored with the field values by the function itself.
+
+    :param data: Data passed to the function
+    :param func: Hashable function of one argument
+    :return Any: Value returned by the function
+    """
+
+    scope = getattr(_local, 'scope', None)
+
+    if scope is None or scope[0] is not data:
+        return func(data)
+
+    values = scope[1]
+    value = values.get(func, _UNSET)
+
+    if value is _UNSET:
+        value = values[func] = func(data)
+
+    return value
+
+
+def call_shared(data: Any, func: Callable, *args: Any) -> Any:
+    """Call a function sharing the field values extracted from the data between all the rules executed by it.
+
+    :param data: Data which field values will be shared
+    :param func: Function to be called
+    :param args: Arguments of the function
+    :return Any: Value returned by the function
+    """
+
+    previous = getattr(_local, 'scope', None)
+
+    if previous is not None and previous[0] is data:
+        return func(*args)
+
+    return call_with_values(data, {}, func, *args)
+
+
+def call_with_values(data: Any, values: Dict[Hashable, Any], func: Callable, *args: Any) -> Any:
+    """Call a function sharing the field values extracted from the data through the given dict. Functions called on
+    different threads with the same dict share their extracted values.
+
+    :param data: Data which field values will be shared
+    :param values: Extracted field values by path
+    :param func: Function to be called
+    :param args: Arguments of the function
+    :return Any: Value returned by the function
+    """
+
+    previous = getattr(_local, 'scope', None)
+    _local.scope = (data, values)
+
+    try:
+        return func(*args)
+    finally:
+        _local.scope = previous
+
+
+def field_resolver(path: AnyStr, operation: AnyStr, expected: Any = None) -> Callable[[Any], bool]:
+    """Build the resolver of a field rule.
+
+    :param path: Dotted field path
+    :param operation: Operator name, one of the OPERATORS keys, 'exists' or 'missing'
+    :param expected: Value to compare the field with
+    :return Callable[[Any], bool]: Rule resolver
+    :raises RuleConfigError: When the operator is not supported
+    """
+
+    if operation not in OPERATORS and operation not in PRESENCE_OPERATORS:
+        raise RuleConfigError(f"Operator '{operation}' is not supported by field rules")
+
+    parts = split_path(path)
+
+    if operation == 'exists':
+        return lambda data: extract(data, path, parts) is not MISSING
+
+    if operation == 'missing':
+        return lambda data: extract(data, path, parts) is MISSING
+
+    compare = OPERATORS[operation]
+
+    if operation == 'matches':
+        expected = re.compile(expected)
+
+    def resolver(data: Any) -> bool:
+        value = extract(data, path, parts)
+
+        if value is MISSING:
+            return False
+
+        try:
+            return bool(compare(value, expected))
+        except (TypeError, ValueError):
+            return False
+
+    return resolver
+
+
+def guard_resolver(when: Union[AnyStr, Callable[[Any], Any]], resolver: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """Build the resolver of a guarded rule, that passes without calling the rule resolver when the guard is false.
+    Inside a shared extraction the guard is evaluated once per data for all the rules behind it.
+
+    :param when: Field path which value should be truthy, or predicate function of the data
+    :param resolver: Resolver of the rule
+    :return Callable[[Any], bool]: Guarded resolver
+    """
+
+    if isinstance(when, str):
+        parts = split_path(when)
+        return lambda data: not extract(data, when, parts) or resolver(data)
+
+    return lambda data: not call_once(data, when) or resolver(data)
+
+
+def async_guard_resolver(when: Union[AnyStr, Callable[[Any], Any]],
+                         resolver: Callable[[Any], Awaitable[bool]]) -> Callable[[Any], Awaitable[bool]]:
+    """Build the async resolver of a guarded rule, like guard_resolver does for sync resolvers.
+
+    :param when: Field path which value should be truthy, or predicate function of the data
+    :param resolver: Async resolver of the rule
+    :return Callable[[Any], Awaitable[bool]]: Guarded async resolver
+    """
+
+    guard = guard_resolver(when, lambda data: False)
+
+    async def guarded(data: Any) -> bool:
+        if guard(data):
+            return True
+
+        return await resolver(data)
+
+    return guarded
@@ -0,0 +1,258 @@
+"""Runtime instrumentation of rules, rule sets and rulers."""
+
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import Any, AnyStr, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+
+RULE = 'rule'
+SET = 'set'
+RULER = 'ruler'
+
+_LABELS = {
+    RULE: ('set', 'rule'),
+    SET: ('set', ),
+    RULER: ('ruler', ),
+}
+
+
+class Series:
+    """Call counters and latency histogram of one instrumented object.
+
+    :param buckets: Upper bounds in seconds of the latency histogram buckets
+    """
+
+    __slots__ = ('calls', 'passed', 'failed', 'total', 'counts', '_buckets', '_lock')
+
+    calls: int
+    passed: int
+    failed: int
+    total: float
+    counts: List[int]
+
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = buckets
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Set all the values of the series to zero."""
+
+        with self._lock:
+            self.calls = 0
+            self.passed = 0
+            self.failed = 0
+            self.total = 0.0
+            self.counts = [0] * (len(self._buckets) + 1)
+
+    def observe(self, passed: bool, elapsed: float) -> None:
+        """Register one execution.
+
+        :param passed: Validation outcome
+        :param elapsed: Execution time in seconds
+        """
+
+        bucket = bisect_left(self._buckets, elapsed)
+
+        with self._lock:
+            self.calls += 1
+            self.total += elapsed
+            self.counts[bucket] += 1
+
+            if passed:
+                self.passed += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> Dict[AnyStr, Any]:
+        """Return the values of the series as a dict.
+
+        :return Dict[AnyStr, Any]: Series values
+        """
+
+        buckets = {}
+        cumulative = 0
+
+        for bound, count in zip(list(self._buckets) + ['+Inf'], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {
+            'calls': self.calls,
+            'passed': self.passed,
+            'failed': self.failed,
+            'latency': {
+                'sum': self.total,
+                'count': self.calls,
+                'buckets': buckets,
+            },
+        }
+
+
+class Metrics:
+    """Registry of the instrumentation series of rules, rule sets and rulers. A Metrics object is attached to a
+    RuleSet or a Ruler with their `instrument` method, and detached passing None.
+
+    :param buckets: Upper bounds in seconds of the latency histogram buckets
+    """
+
+    _buckets: Tuple[float, ...]
+    _series: Dict[Tuple[AnyStr, Tuple[AnyStr, ...]], Series]
+    _lock: Lock
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._series = dict()
+        self._lock = Lock()
+
+    def series(self, kind: AnyStr, *labels: AnyStr) -> Series:
+        """Get or create the series of an instrumented object.
+
+        :param kind: Type of the instrumented object, one of 'rule', 'set' or 'ruler'
+        :param labels: Label values that identify the object
+        :return Series: Series of the object
+        """
+
+        key = (kind, labels)
+        series = self._series.get(key, None)
+
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, Series(self._buckets))
+
+        return series
+
+    def wrap_rule(self, set_name: AnyStr, rule_name: AnyStr, resolver: Callable[[Any], bool]) -> Callable[[Any], bool]:
+        """Wrap a rule resolver to record its executions.
+
+        :param set_name: Name of the set of the rule
+        :param rule_name: Name of the rule
+        :param resolver: Resolver to be instrumented
+        :return Callable: Instrumented resolver
+        """
+
+        observe = self.series(RULE, set_name, rule_name).observe
+
+        def instrumented(data: Any) -> bool:
+            start = perf_counter()
+            passed = resolver(data)
+            observe(passed, perf_counter() - start)
+
+            return passed
+
+        return instrumented
+
+    def wrap_async_rule(
+        self,
+        set_name: AnyStr,
+        rule_name: AnyStr,
+        resolver: Callable[[Any], Awaitable[bool]],
+    ) -> Callable[[Any], Awaitable[bool]]:
+        """Wrap an async rule resolver to record its executions.
+
+        :param set_name: Name of the set of the rule
+        :param rule_name: Name of the rule
+        :param resolver: Async resolver to be instrumented
+        :return Callable: Instrumented async resolver
+        """
+
+        observe = self.series(RULE, set_name, rule_name).observe
+
+        async def instrumented(data: Any) -> bool:
+            start = perf_counter()
+            passed = await resolver(data)
+            observe(passed, perf_counter() - start)
+
+            return passed
+
+        return instrumented
+
+    def reset(self) -> None:
+        """Set all the recorded values to zero. Instrumented objects keep recording on the same series."""
+
+        for series in list(self._series.values()):
+            series.reset()
+
+    def snapshot(self) -> Dict[AnyStr, Any]:
+        """Export the recorded values as a nested dict grouped by rulers, sets and rules.
+
+        :return Dict[AnyStr, Any]: Recorded values
+        """
+
+        snapshot = {'rulers': {}, 'sets': {}, 'rules': {}}
+
+        for (kind, labels), series in sorted(self._series.items()):
+            if kind == RULE:
+                snapshot['rules'].setdefault(labels[0], {})[labels[1]] = series.snapshot()
+                continue
+
+            snapshot[f'{kind}s'][labels[0]] = series.snapshot()
+
+        return snapshot
+
+    def to_prometheus(self, prefix: AnyStr = 'pyruler') -> AnyStr:
+        """Export the recorded values on Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names
+        :return AnyStr: Prometheus text
+        """
+
+        lines = []
+        items = sorted(self._series.items())
+
+        for kind in (RULER, SET, RULE):
+            series = [(labels, values) for (item_kind, labels), values in items if item_kind == kind]
+
+            if series:
+                lines.extend(self._prometheus_lines(f'{prefix}_{kind}', _LABELS[kind], series))
+
+        return '\n'.join(lines) + '\n'
+
+    def _prometheus_lines(
+        self,
+        name: AnyStr,
+        label_names: Tuple[AnyStr, ...],
+        series: List[Tuple[Tuple[AnyStr, ...], Series]],
+    ) -> List[AnyStr]:
+        """Format the series of one type of object.
+
+        :param name: Metric name prefix
+        :param label_names: Names of the labels of the series
+        :param series: Labels and values of each series
+        :return List[AnyStr]: Prometheus text lines
+        """
+
+        calls = [f'# HELP {name}_calls_total Total executions.', f'# TYPE {name}_calls_total counter']
+        failures = [f'# HELP {name}_failures_total Failed executions.', f'# TYPE {name}_failures_total counter']
+        latency = [
+            f'# HELP {name}_latency_seconds Execution latency.',
+            f'# TYPE {name}_latency_seconds histogram',
+        ]
+
+        for labels, values in series:
+            label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in zip(label_names, labels))
+            calls.append(f'{name}_calls_total{{{label_text}}} {values.calls}')
+            failures.append(f'{name}_failures_total{{{label_text}}} {values.failed}')
+
+            cumulative = 0
+
+            for bound, count in zip(list(self._buckets) + ['+Inf'], values.counts):
+                cumulative += count
+                latency.append(f'{name}_latency_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}')
+
+            latency.append(f'{name}_latency_seconds_sum{{{label_text}}} {values.total}')
+            latency.append(f'{name}_latency_seconds_count{{{label_text}}} {values.calls}')
+
+        return calls + failures + latency
+
+
+def _escape(value: AnyStr) -> AnyStr:
+    """Escape a Prometheus label value.
+
+    :param value: Label value
+    :return AnyStr: Escaped value
+    """
+
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,148 @@
+"""Parallel execution helpers for rule set validations."""
+
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from itertools import islice
+from queue import Full, Queue
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from .aio import CANCELLED
+
+_shared_pool: Optional[ThreadPoolExecutor] = None  # pylint: disable=invalid-name
+_shared_pool_lock = Lock()
+
+
+def shared_thread_pool() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all the rulers that run on parallel mode without their own executor. The pool
+    is created on the first call.
+
+    :return ThreadPoolExecutor: Shared thread pool
+    """
+
+    global _shared_pool  # pylint: disable=global-statement
+
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = ThreadPoolExecutor(thread_name_prefix='pyruler')
+
+    return _shared_pool
+
+
+def map_until(executor: Executor, calls: Sequence[Callable[[], Any]], stop: Callable[[Any], bool]) -> List[Any]:
+    """Run the calls on the executor and return their results in the same order. When a result makes the stop
+    function return True, the calls placed after it are cancelled and their results are CANCELLED, while the calls
+    placed before it are still awaited, so the outcome is the same as running the calls one after another and stopping
+    at the first result that matches. If some call raises an error the pending calls are cancelled and the error is
+    propagated.
+
+    :param executor: Executor that runs the calls
+    :param calls: Functions without arguments to be executed
+    :param stop: Function that receives each result and tells if the calls placed after it should be cancelled
+    :return List[Any]: Results of the calls
+    """
+
+    futures = [executor.submit(call) for call in calls]
+    positions = {future: position for position, future in enumerate(futures)}
+    results = [CANCELLED] * len(futures)
+    pending = set(futures)
+    limit = len(futures)
+
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in sorted(done, key=positions.get):
+                position = positions[future]
+
+                if position < limit:
+                    results[position] = future.result()
+
+                    if stop(results[position]):
+                        limit = position
+
+            for future in [future for future in pending if positions[future] > limit]:
+                future.cancel()
+                pending.discard(future)
+
+            results[limit + 1:] = [CANCELLED] * (len(futures) - limit - 1)
+    finally:
+        for future in pending:
+            future.cancel()
+
+    return results
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split the items on lists of the given size, consuming them lazily.
+
+    :param items: Items to be split
+    :param size: Number of items of each chunk
+    :return Iterator[List[Any]]: Chunks of items
+    """
+
+    items = iter(items)
+    chunk = list(islice(items, size))
+
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+
+def prefetch(items: Iterable[Any], size: int) -> Iterator[Any]:
+    """Iterate over the items while a background thread consumes up to the given number of items ahead, so slow
+    sources like files or network consumers overlap with the processing of the items. Errors raised by the source are
+    raised on the iteration and the thread stops when the iteration is closed.
+
+    :param items: Items to be consumed
+    :param size: Maximum number of items consumed ahead
+    :return Iterator[Any]: Same items in the same order
+    """
+
+    queue = Queue(maxsize=size)
+    stop = Event()
+
+    def produce():
+        try:
+            for item in items:
+                if not _put(queue, (True, item), stop):
+                    return
+
+            _put(queue, (False, None), stop)
+        except Exception as error:  # pylint: disable=broad-except
+            _put(queue, (False, error), stop)
+
+    Thread(target=produce, name='pyruler-prefetch', daemon=True).start()
+
+    try:
+        while True:
+            has_item, item = queue.get()
+
+            if not has_item:
+                if item is not None:
+                    raise item
+
+                return
+
+            yield item
+    finally:
+        stop.set()
+
+
+def _put(queue: Queue, item: Any, stop: Event) -> bool:
+    """Put an item on a bounded queue waiting for free space until the stop event is set.
+
+    :param queue: Bounded queue
+    :param item: Item to be put
+    :param stop: Event that cancels the wait
+    :return bool: True if the item was put on the queue
+    """
+
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            continue
+
+    return False
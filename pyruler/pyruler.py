@@ -1,58 +1,204 @@
 """Ruler definitions."""
 
+import os
+from concurrent.futures import Executor
+from functools import partial
+from threading import Lock
+from time import perf_counter
 from typing import (
+    IO,
     Any,
     AnyStr,
+    Callable,
     Dict,
+    Hashable,
     Iterable,
+    Iterator,
     List,
+    Mapping,
     NoReturn,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Union,
 )
 
+from .aio import CANCELLED
+from .batch import BatchReport, collect_indexes, dependent_indexes, fail_fast_indexes
+from .budget import resolve_deadline
 from .errors import RulerConfigError, RulerError
+from .fields import call_shared
+from .metrics import RULER, Metrics
+from .parallel import chunked, prefetch, shared_thread_pool
+from .result import ValidationResult
+from .sampling import Sampler, observe_result, sample_sets, sampled_indexer
+from .scheduling import (
+    RoutingIndex,
+    check_cycles,
+    check_layers,
+    check_layers_async,
+    check_sets,
+    dependents_index,
+    merge_results,
+    prerequisites,
+    routing_index,
+    revalidate_sets,
+    schedule_layers,
+    shares_fields,
+    update_dependents,
+)
+from .snapshot import LazyRuleSet, copy_rule_set, materialize, read_snapshot, write_snapshot
 from .ruleset import RuleSet
 
+ORDER_CACHE_SIZE = 256
+
 
-class Ruler:
+class Ruler:  # pylint: disable=too-many-instance-attributes
     """Store RuleSet objects to be applied over a given data. This class can apply one single stored RuleSet,
     a list of of some of the configured RuleSet objects or all of them.
+
+    The configuration can be changed while other threads apply the ruler: every change builds a new mapping of rule
+    sets and publishes it at once, so the running validations keep using the rule sets they started with and never
+    wait for a lock. As each call copies the mapping once, a ruler built set by set should get its sets with add_many.
+
+    Rule sets can depend on other rule sets of the ruler. A rule set is applied after the sets it depends on, which
+    are applied too even when they are not selected, and it is skipped when some of them fails.
+
+    Rule sets configured with a match are only applied to the data they match. The ruler routes each data to the
+    matching rule sets through a hash index of the matched values, so the caller doesn't need to select them.
+
+    :param executor: Executor used to apply the rule sets in parallel. When it is set the rule sets are applied on
+        parallel mode by default.
     """
 
     _rule_sets: Dict[AnyStr, RuleSet]
     _rule_set_hashes: Set[int]
-
-    def __init__(self):
+    _dependents: Dict[AnyStr, Set[AnyStr]]
+    _metrics: Optional[Metrics]
+    _label: AnyStr
+    _executor: Optional[Executor]
+    _lock: Lock
+    _orders: Dict[Hashable, Tuple[Dict[AnyStr, RuleSet], Tuple[RuleSet, ...], Tuple[Tuple[RuleSet, ...], ...],
+                                  Optional[RoutingIndex], bool, Tuple[int, ...]]]
+
+    def __init__(self, executor: Optional[Executor] = None):
         self._rule_sets = dict()
         self._rule_set_hashes = set()
+        self._dependents = dict()
+        self._metrics = None
+        self._label = 'default'
+        self._executor = executor
+        self._lock = Lock()
+        self._orders = dict()
 
     def add_set(self, rule_set: RuleSet) -> NoReturn:
-        """Add a new Rule set to the ruler.
+        """Add a new Rule set to the ruler. The rule sets of the ruler are copied on each call, to add many sets use
+        add_many.
 
         :param rule_set: configured rule set object
-        :raises RulerConfigError: When the ruler detects that the provided rule_set was already configured
+        :raises RulerConfigError: When the ruler detects that the provided rule_set was already configured or its
+            dependencies make a cycle
         """
 
-        if rule_set.__hash__() in self._rule_set_hashes:
-            raise RulerConfigError(f"RuleSet '{rule_set.name}' was already configured on the ruler")
-
-        self._rule_sets.update({rule_set.name: rule_set})
-        self._rule_set_hashes.add(rule_set.__hash__())
+        self.add_many([rule_set])
 
     def add_many(self, rule_sets: Iterable[RuleSet]) -> NoReturn:
-        """Add many RuleSet objects at ones.
+        """Add many RuleSet objects at ones, copying the rule sets of the ruler once for all of them.
+
+        :param rule_sets: Iterable object of rule sets to be added
+        :raises RulerConfigError: When some of the rule sets was already configured or is duplicated, or their
+            dependencies make a cycle
+        """
+
+        with self._lock:
+            new_sets, hashes = self._new_sets(rule_sets, self._rule_set_hashes)
+
+            self._publish({**self._rule_sets, **new_sets}, hashes, names=new_sets)
+
+    def replace_set(self, rule_set: RuleSet) -> RuleSet:
+        """Replace the configured rule set that has the same name of the given one.
+
+        :param rule_set: New rule set object
+        :return RuleSet: Replaced rule set
+        :raises RulerConfigError: When there isn't a configured rule set with the same name, the new rule set was
+            already configured or its dependencies make a cycle
+        """
+
+        with self._lock:
+            previous = self._rule_sets.get(rule_set.name)
+
+            if previous is None:
+                raise RulerConfigError(f"RuleSet '{rule_set.name}' is not configured on the ruler")
+
+            hashes = self._rule_set_hashes - {previous.__hash__()}
+            new_sets, new_hashes = self._new_sets([rule_set], hashes)
+
+            self._publish({**self._rule_sets, **new_sets}, new_hashes, {previous.__hash__()}, new_sets)
+
+        return materialize(previous)
+
+    def remove_set(self, name: AnyStr) -> RuleSet:
+        """Remove a configured rule set by its name.
+
+        :param name: Name of the rule set
+        :return RuleSet: Removed rule set
+        :raises RulerConfigError: When there isn't a configured rule set with the given name or other configured sets
+            depend on it
+        """
+
+        with self._lock:
+            rule_sets = dict(self._rule_sets)
+            previous = rule_sets.pop(name, None)
+
+            if previous is None:
+                raise RulerConfigError(f"RuleSet '{name}' is not configured on the ruler")
+
+            if name in self._dependents:
+                dependents = ', '.join(f"'{set_name}'" for set_name in sorted(self._dependents[name]))
+                raise RulerConfigError(
+                    f"RuleSet '{name}' can't be removed because other sets depend on it: {dependents}")
+
+            self._publish(rule_sets, removed={previous.__hash__()}, names=())
+
+        return materialize(previous)
+
+    def swap(self, config: Union['Ruler', Iterable[RuleSet]]) -> List[RuleSet]:
+        """Replace all the configured rule sets at once with the rule sets of another ruler or the given ones. The
+        new configuration is validated before being published, so on error the current one is kept.
+
+        :param config: Ruler or iterable object with the new rule sets. The rule sets of a ruler are copied, so both
+            rulers can be changed on their own.
+        :return List[RuleSet]: Previous rule sets, that can be given back to swap to restore them. The sets loaded from
+            a snapshot that were not applied are returned without loading them.
+        :raises RulerConfigError: When some of the new rule sets is duplicated or their dependencies make a cycle
+        """
+
+        if isinstance(config, Ruler):
+            config = list(map(copy_rule_set, config._rule_sets.values()))  # pylint: disable=protected-access
+
+        with self._lock:
+            previous = list(self._rule_sets.values())
+            new_sets, hashes = self._new_sets(config, set())
+
+            self._publish(new_sets, hashes, set(self._rule_set_hashes))
+
+        return previous
+
+    def _new_sets(self, rule_sets: Iterable[RuleSet], configured: Set[int]) -> Tuple[Dict[AnyStr, RuleSet], Set[int]]:
+        """Validate the rule sets that will be added to the ruler and instrument them when the ruler has metrics.
 
         :param rule_sets: Iterable object of rule sets to be added
+        :param configured: Hashes of the rule sets that are kept on the ruler
+        :return: Rule sets by name and their hashes
+        :raises RulerConfigError: When some of the rule sets was already configured or is duplicated
         """
 
         hashes = set()
         new_sets = dict()
 
         for rule_set in rule_sets:
-            if rule_set.__hash__() in self._rule_set_hashes:
+            if rule_set.__hash__() in configured:
                 raise RulerConfigError(f"RuleSet '{rule_set.name}' was already configured on the ruler")
 
             if rule_set.__hash__() in hashes:
@@ -61,8 +207,56 @@ class Ruler:
             new_sets.update({rule_set.name: rule_set})
             hashes.add(rule_set.__hash__())
 
-        self._rule_sets.update(new_sets)
-        self._rule_set_hashes.update(hashes)
+        if self._metrics is not None:
+            for rule_set in new_sets.values():
+                rule_set.instrument(self._metrics)
+
+        return new_sets, hashes
+
+    def _publish(self, rule_sets: Dict[AnyStr, RuleSet], added: Set[int] = frozenset(),
+                 removed: Set[int] = frozenset(), names: Optional[Iterable[AnyStr]] = None) -> None:
+        """Replace the configured rule sets with a new mapping. The hashes of the rule sets are only read holding the
+        lock, so they are updated in place. It should be called holding the lock of the ruler.
+
+        The dependencies are checked from the added or replaced sets only. The ruler keeps the names of the sets
+        that depend on each name, so when no configured set depends on the changed sets the check doesn't leave them.
+
+        :param rule_sets: New rule sets by name
+        :param added: Hashes of the added rule sets
+        :param removed: Hashes of the removed rule sets
+        :param names: Names of the added or replaced rule sets, None when all the rule sets are new
+        :raises RulerConfigError: When the dependencies of the rule sets make a cycle
+        """
+
+        if names is None:
+            check_cycles(rule_sets)
+            self._dependents = dependents_index(rule_sets.values())
+        else:
+            check_cycles(rule_sets, names, all(name not in self._dependents for name in names))
+            previous = [
+                rule_set for name, rule_set in self._rule_sets.items() if name in names or name not in rule_sets
+            ]
+            update_dependents(self._dependents, previous, [rule_sets[name] for name in names])
+
+        self._rule_sets = rule_sets
+        self._rule_set_hashes -= removed
+        self._rule_set_hashes |= added
+        self._orders = dict()
+
+    def instrument(self, metrics: Optional[Metrics], label: AnyStr = 'default') -> None:
+        """Record the executions of the ruler, its rule sets and their rules on the given metrics registry. When
+        metrics is None the instrumentation is removed from the ruler and all its rule sets.
+
+        :param metrics: Metrics registry or None to disable the instrumentation
+        :param label: Name of the ruler on the recorded metrics
+        """
+
+        with self._lock:
+            self._metrics = metrics
+            self._label = label
+
+            for rule_set in self._rule_sets.values():
+                rule_set.instrument(metrics)
 
     def count_sets(self) -> int:
         """Count the total of configured sets.
@@ -80,11 +274,15 @@ class Ruler:
 
         return list(self._rule_sets.keys())
 
-    def apply(
+    def apply(  # pylint: disable=too-many-arguments
         self,
         data: Any,
         sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
         fail_fast: Optional[bool] = True,
+        parallel: Optional[bool] = None,
+        budget: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
     ) -> NoReturn:
         """Apply specified rule set, all of the stored sets or a sub collection
         of the stored rule sets.
@@ -92,75 +290,710 @@ class Ruler:
         :param sets: Rule sets to be applied
         :param data: Data to be validated by the rule sets
         :param fail_fast: Run on fail fast mode
+        :param parallel: Apply the rule sets in parallel on the executor of the ruler, or on a shared thread pool when
+            the ruler doesn't have one. By default the rule sets are applied in parallel only if the ruler has an
+            executor.
+        :param budget: Seconds the validation can take, like on the check method
+        :param deadline: Absolute deadline of the validation, like on the check method
+        :param sampling: Sampling policies by set name, like on the check method
         :raises RuleError: When some rule was not asserted successfully by the rule set
         :raises RulerError: When some set can't be applied
         """
 
-        if sets is None:
-            sets = set(self._rule_sets.keys())
+        deadline = resolve_deadline(budget, deadline)
 
-        sets = self._process_set_names(sets)
+        if sampling:
+            result = self.check(data, sets, fail_fast, parallel, None, deadline, sampling)
 
-        if isinstance(sets, set):
-            self._apply_set(set_names=sets, data=data, fail_fast=fail_fast)
+            if not result.ok:
+                raise result.exception()
+
+            return
+
+        if self._metrics is not None:
+            self._instrumented_apply(data, sets, fail_fast, parallel, deadline)
             return
 
-        self._apply_one(set_name=sets, data=data, fail_fast=fail_fast)
+        self._apply_names(data, sets, fail_fast, parallel, deadline)
+
+    def check(  # pylint: disable=too-many-arguments
+        self,
+        data: Any,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+        parallel: Optional[bool] = None,
+        budget: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
+    ) -> ValidationResult:
+        """Apply the specified rule sets to the data without raising errors for the failing rules. On fail fast mode
+        the validation stops at the first failing rule, otherwise the failures of all the sets are collected. With a
+        time budget or a deadline, shared by all the sets, the rules run by their cost tier like on RuleSet.check and
+        the rules skipped when the deadline is reached are reported on the result. The sets with a sampling policy
+        are only applied to the data their policy samples, and their outcomes are counted by the policy.
+
+        :param data: Data to be validated by the rule sets
+        :param sets: Rule sets to be applied
+        :param fail_fast: Run on fail fast mode
+        :param parallel: Apply the rule sets in parallel, like on the apply method
+        :param budget: Seconds the validation can take
+        :param deadline: Absolute deadline of the validation as a time.perf_counter value
+        :param sampling: Sampling policies by set name
+        :return ValidationResult: Result of the validation
+        :raises RulerError: When some set can't be applied
+        """
+
+        deadline = resolve_deadline(budget, deadline)
+
+        if self._metrics is None:
+            return self._check(data, sets, fail_fast, parallel, deadline, sampling)
+
+        start = perf_counter()
+        result = self._check(data, sets, fail_fast, parallel, deadline, sampling)
+        self._metrics.series(RULER, self._label).observe(result.ok, perf_counter() - start)
+
+        return result
+
+    def _check(  # pylint: disable=too-many-arguments
+        self,
+        data: Any,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+        parallel: Optional[bool] = None,
+        deadline: Optional[float] = None,
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
+    ) -> ValidationResult:
+        """Apply the specified rule sets to the data collecting the results of the sets.
+
+        :param data: Data to be validated by the rule sets
+        :param sets: Rule sets to be applied
+        :param fail_fast: Run on fail fast mode
+        :param parallel: Apply the rule sets in parallel
+        :param deadline: Deadline of the validation as a time.perf_counter value
+        :param sampling: Sampling policies by set name
+        :return ValidationResult: Result of the validation
+        """
+
+        rule_sets, layers, shared = self._route_sets(sets, data)
+
+        if not sampling:
+            return self._check_layers(rule_sets, layers, shared, data, fail_fast, parallel, deadline)
+
+        rule_sets, layers, sampled = sample_sets(sampling, rule_sets, layers, data)
+        result = self._check_layers(rule_sets, layers, shared, data, fail_fast, parallel, deadline)
+        observe_result(sampled, rule_sets, result)
+
+        return result
 
-    def _apply_set(
+    def _check_layers(  # pylint: disable=too-many-arguments
         self,
+        rule_sets: Sequence[RuleSet],
+        layers: Sequence[Sequence[RuleSet]],
+        shared: bool,
         data: Any,
-        set_names: Set[AnyStr],
+        fail_fast: Optional[bool] = True,
+        parallel: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> ValidationResult:
+        """Apply the scheduled rule sets to the data collecting the results of the sets.
+
+        :param rule_sets: Rule sets to be applied, on their execution order
+        :param layers: Layers of the rule sets to be applied
+        :param shared: Share the extracted field values between the sets
+        :param data: Data to be validated by the rule sets
+        :param fail_fast: Run on fail fast mode
+        :param parallel: Apply the rule sets in parallel
+        :param deadline: Deadline of the validation as a time.perf_counter value
+        :return ValidationResult: Result of the validation
+        """
+
+        executor = self._parallel_executor(rule_sets, parallel)
+
+        if executor is not None:
+            results = check_layers(executor, layers, data, fail_fast, deadline, shared)
+            return merge_results(rule_sets, results, fail_fast)
+
+        if shared:
+            return call_shared(data, check_sets, rule_sets, data, fail_fast, deadline)
+
+        return check_sets(rule_sets, data, fail_fast, deadline)
+
+    def _parallel_executor(self, rule_sets: Sequence[RuleSet], parallel: Optional[bool]) -> Optional[Executor]:
+        """Get the executor that should apply the rule sets, or None if they should be applied one after another.
+
+        :param rule_sets: Rule sets to be applied
+        :param parallel: Parallel mode required by the caller
+        :return Optional[Executor]: Executor of the rule sets
+        """
+
+        if parallel is False or len(rule_sets) < 2:
+            return None
+
+        if self._executor is not None:
+            return self._executor
+
+        return shared_thread_pool() if parallel else None
+
+    def revalidate(
+        self,
+        data: Any,
+        changed_fields: Union[AnyStr, Iterable[AnyStr]],
+        previous_result: ValidationResult,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+    ) -> ValidationResult:
+        """Validate the data again after a change of some of its fields. Only the rules that read the changed fields,
+        or that don't declare the fields they read, are applied again and the outcome of the other rules is kept from
+        the previous result. The previous result should come from the check method on collect all mode, or be a
+        passing result, with the same sets, and the validation runs on collect all mode. When the changed fields can
+        change the rule sets the data is routed to, the sets are checked again completely.
+
+        :param data: Changed data
+        :param changed_fields: Dotted paths of the changed fields
+        :param previous_result: Result of the previous validation of the data
+        :param sets: Rule sets to be applied
+        :return ValidationResult: Result of the validation
+        :raises RulerError: When the previous result stopped at the first failing rule or some set can't be applied
+        """
+
+        if previous_result.fail_fast and not previous_result.ok:
+            raise RulerError('Previous result should be checked on collect all mode to be revalidated')
+
+        changed_fields = (changed_fields, ) if isinstance(changed_fields, str) else tuple(changed_fields)
+        rule_sets, _, router, shared = self._schedule_sets(sets)
+
+        if router is not None:
+            if router.affected_by(changed_fields):
+                return self.check(data, sets, False)
+
+            rule_sets, _, shared = router.route(data)
+
+        start = perf_counter()
+
+        if shared:
+            result = call_shared(data, revalidate_sets, rule_sets, data, changed_fields, previous_result)
+        else:
+            result = revalidate_sets(rule_sets, data, changed_fields, previous_result)
+
+        if self._metrics is not None:
+            self._metrics.series(RULER, self._label).observe(result.ok, perf_counter() - start)
+
+        return result
+
+    async def apply_async(
+        self,
+        data: Any,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
         fail_fast: Optional[bool] = True,
     ) -> NoReturn:
-        """Apply configured rule sets to the provided data.
+        """Apply the specified rule sets to the data awaiting their async rules. The rule sets run concurrently and
+        the error of the first failing set, on the order of the sets, is raised.
 
-        :param set_names: List of set names
         :param data: Data to be validated by the rule sets
+        :param sets: Rule sets to be applied
         :param fail_fast: Run on fail fast mode
+        :raises RuleError: When some rule was not asserted successfully by the rule set
+        :raises RulerError: When some set can't be applied
+        """
+
+        for result in await check_layers_async(self._route_sets(sets, data)[1], data, fail_fast):
+            if result is not CANCELLED and not result.ok:
+                raise result.exception()
+
+    async def check_async(
+        self,
+        data: Any,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+    ) -> ValidationResult:
+        """Apply the specified rule sets to the data awaiting their async rules, without raising errors for the
+        failing rules. The rule sets run concurrently and on fail fast mode the pending sets are cancelled as soon as
+        one of them fails.
+
+        :param data: Data to be validated by the rule sets
+        :param sets: Rule sets to be applied
+        :param fail_fast: Run on fail fast mode
+        :return ValidationResult: Result of the validation
+        :raises RulerError: When some set can't be applied
+        """
+
+        start = perf_counter()
+        rule_sets, layers, _ = self._route_sets(sets, data)
+        result = merge_results(rule_sets, await check_layers_async(layers, data, fail_fast), fail_fast)
+
+        if self._metrics is not None:
+            self._metrics.series(RULER, self._label).observe(result.ok, perf_counter() - start)
+
+        return result
+
+    def apply_many(
+        self,
+        records: Iterable[Any],
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
+        compact: bool = False,
+    ) -> Union[List[Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]], BatchReport]:
+        """Apply the specified rule sets to a batch of records without raising errors for the records that fail.
+        The rule sets are resolved once for the whole batch.
+
+        :param records: Iterable object with the records to be validated
+        :param sets: Rule sets to be applied
+        :param fail_fast: Stop the validation of a record at the first failing rule
+        :param sampling: Sampling policies by set name, the records a set doesn't sample pass the set
+        :param compact: Return a BatchReport that stores the failing records of each rule on arrays
+        :return: For each record, a tuple of pairs with the name of a failing set and the positions of its failing
+            rules. An empty tuple means that the record passed all the sets. The sets skipped because some set they
+            depend on failed are not reported.
+        :raises RulerError: When some set can't be applied
+        """
+
+        validate = self._batch_validator(sets, fail_fast, sampling)
+
+        if not compact:
+            return self._validate_records(validate, records)
+
+        report = BatchReport({rule_set.name: rule_set.compile() for rule_set in self._resolve_sets(sets)}, fail_fast)
+
+        return self._validate_records(validate, records, report)
+
+    def stream(  # pylint: disable=too-many-arguments
+        self,
+        records: Iterable[Any],
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+        chunk_size: int = 1000,
+        only_failures: bool = False,
+        prefetch_size: int = 0,
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
+    ) -> Iterator[List[Tuple[int, Any, Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]]]:
+        """Validate the records of an iterable lazily, like a file or a message consumer, yielding the results chunk
+        by chunk. Only one chunk of records is kept in memory and the rule sets are resolved once for the whole
+        stream.
+
+        :param records: Iterable object with the records to be validated, it can be unbounded
+        :param sets: Rule sets to be applied
+        :param fail_fast: Stop the validation of a record at the first failing rule
+        :param chunk_size: Number of records validated on each chunk
+        :param only_failures: Yield only the results of the records that fail
+        :param prefetch_size: Number of chunks read ahead from the records by a background thread, 0 to read the
+            records on the validation thread
+        :param sampling: Sampling policies by set name, like on apply_many
+        :return: Iterator of chunks of results. Each result has the position of the record on the stream, the record
+            and the failing sets and rule positions like on apply_many. Chunks without results are not yielded.
+        :raises RulerConfigError: When the chunk size is not positive
+        :raises RulerError: When some set can't be applied
+        """
+
+        if chunk_size < 1:
+            raise RulerConfigError(f'Chunk size should be a positive number, got {chunk_size}')
+
+        validate = self._batch_validator(sets, fail_fast, sampling)
+        chunks = chunked(records, chunk_size)
+
+        if prefetch_size > 0:
+            chunks = prefetch(chunks, prefetch_size)
+
+        return self._stream_chunks(validate, chunks, only_failures)
+
+    def _stream_chunks(
+        self,
+        validate: Callable[[Any], Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]],
+        chunks: Iterable[List[Any]],
+        only_failures: bool,
+    ) -> Iterator[List[Tuple[int, Any, Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]]]:
+        """Validate the chunks of records yielding their results.
+
+        :param validate: Validation function of a record
+        :param chunks: Chunks of records
+        :param only_failures: Yield only the results of the records that fail
+        :return: Iterator of chunks of results
+        """
+
+        position = 0
+
+        for chunk in chunks:
+            results = zip(range(position, position + len(chunk)), chunk, self._validate_records(validate, chunk))
+            position += len(chunk)
+
+            if only_failures:
+                results = [result for result in results if result[2]]
+
+                if not results:
+                    continue
+
+            yield list(results)
+
+    def _batch_validator(
+        self,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]],
+        fail_fast: Optional[bool],
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
+    ) -> Callable[[Any], Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]:
+        """Build the function that validates each record of a batch, routing the records when some rule set has a
+        match.
+
+        :param sets: Rule sets to be applied
+        :param fail_fast: Stop the validation of a record at the first failing rule
+        :param sampling: Sampling policies by set name
+        :return: Validation function of a record
+        :raises RulerError: When some set can't be applied
+        """
+
+        rule_sets, _, router, shared = self._schedule_sets(sets)
+
+        if router is None:
+            return self._record_validator(rule_sets, shared, fail_fast, sampling)
+
+        return partial(self._routed_validate, router, fail_fast, sampling, dict())
+
+    def _routed_validate(  # pylint: disable=too-many-arguments
+        self,
+        router: RoutingIndex,
+        fail_fast: Optional[bool],
+        sampling: Optional[Mapping[AnyStr, Sampler]],
+        validators: Dict[Tuple[RuleSet, ...], Callable[[Any], Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]],
+        data: Any,
+    ) -> Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]:
+        """Validate a record with the rule sets it is routed to, building the validation function of each route once.
+
+        :param router: Routing index of the rule sets
+        :param fail_fast: Stop the validation of a record at the first failing rule
+        :param sampling: Sampling policies by set name
+        :param validators: Validation functions by routed rule sets
+        :param data: Data to be validated by the rule sets
+        :return: Failing sets and rule positions
+        """
+
+        rule_sets, _, shared = router.route(data)
+        validate = validators.get(rule_sets)
+
+        if validate is None:
+            validate = validators[rule_sets] = self._record_validator(rule_sets, shared, fail_fast, sampling)
+
+        return validate(data)
+
+    def _record_validator(
+        self,
+        rule_sets: Sequence[RuleSet],
+        shared: bool,
+        fail_fast: Optional[bool],
+        sampling: Optional[Mapping[AnyStr, Sampler]] = None,
+    ) -> Callable[[Any], Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]:
+        """Build the function that validates one record with the rule sets, returning the failing sets and rules.
+
+        :param rule_sets: Rule sets to be applied
+        :param shared: Share the extracted field values between the sets
+        :param fail_fast: Stop the validation of a record at the first failing rule
+        :param sampling: Sampling policies by set name
+        :return: Validation function of a record
+        """
+
+        if not fail_fast and any(rule_set.depends_on for rule_set in rule_sets):
+            dependent_indexers = tuple(
+                (rule_set.name, sampled_indexer(rule_set, False, sampling), rule_set.depends_on)
+                for rule_set in rule_sets)
+            validate = partial(dependent_indexes, dependent_indexers)
+        else:
+            indexers = tuple((rule_set.name, sampled_indexer(rule_set, fail_fast, sampling)) for rule_set in rule_sets)
+            validate = partial(fail_fast_indexes if fail_fast else collect_indexes, indexers)
+
+        if shared:
+            validate = partial(self._shared_validate, validate)
+
+        return validate
+
+    def _validate_records(
+        self,
+        validate: Callable[[Any], Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]],
+        records: Iterable[Any],
+        report: Optional[BatchReport] = None,
+    ) -> Union[List[Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]], BatchReport]:
+        """Validate the records recording each validation on the metrics of the ruler.
+
+        :param validate: Validation function of a record
+        :param records: Records to be validated
+        :param report: Compact report the failures are added to, instead of a list
+        :return: Failing sets and rule positions of each record, or the report
+        """
+
+        results = [] if report is None else report
+
+        if self._metrics is not None:
+            observe = self._metrics.series(RULER, self._label).observe
+
+            for record in records:
+                start = perf_counter()
+                failures = validate(record)
+                observe(not failures, perf_counter() - start)
+                results.append(failures)
+
+            return results
+
+        if report is None:
+            return [validate(record) for record in records]
+
+        for record in records:
+            report.append(validate(record))
+
+        return report
+
+    @staticmethod
+    def _shared_validate(validate: Callable[[Any], Any], data: Any) -> Any:
+        """Call a validation function sharing the extracted field values between all the rule sets.
+
+        :param validate: Validation function
+        :param data: Data to be validated by the rule sets
+        :return Any: Validation function result
+        """
+
+        return call_shared(data, validate, data)
+
+    def _resolve_sets(self, sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]]) -> Tuple[RuleSet, ...]:
+        """Get the rule set objects that should be applied for the given set names, on their execution order.
+
+        :param sets: Rule sets to be applied
+        :return Tuple[RuleSet, ...]: Rule sets to be applied
+        :raises RulerError: When the required rule set is not configured on the ruler or doesn't have rules
+        """
+
+        return self._schedule_sets(sets)[0]
+
+    def _route_sets(
+        self,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]],
+        data: Any,
+    ) -> Tuple[Tuple[RuleSet, ...], Tuple[Tuple[RuleSet, ...], ...], bool]:
+        """Get the rule sets that should be applied to the data, on their execution order and grouped on layers.
+        From the selected rule sets, only the ones that match the data and the sets they depend on are applied.
+
+        :param sets: Rule sets to be applied
+        :param data: Data to be validated by the rule sets
+        :return: Rule sets to be applied on their execution order, the same rule sets grouped on layers and whether
+            they share field values
+        :raises RulerError: When the required rule set is not configured on the ruler or doesn't have rules
+        """
+
+        rule_sets, layers, router, shared = self._schedule_sets(sets)
+
+        if router is None:
+            return rule_sets, layers, shared
+
+        return router.route(data)
+
+    def _schedule_sets(
+        self,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]],
+    ) -> Tuple[Tuple[RuleSet, ...], Tuple[Tuple[RuleSet, ...], ...], Optional[RoutingIndex], bool]:
+        """Get the rule set objects that should be applied for the given set names and the sets they depend on, on
+        their execution order. The sets are grouped on layers: the first layer has the sets without dependencies and
+        each set goes on the layer that follows the last layer of the sets it depends on. Inside a layer, sets with
+        higher priority go first, then the cheapest sets of the same priority, and then the order given by the caller
+        or, when no order is given, the order the sets were added to the ruler. The schedule is cached by the
+        selection of sets until the configuration of the ruler or the rules of the scheduled sets change, with the
+        routing index of the sets that have a match and whether the sets share field values, so they are analyzed once
+        per configuration.
+
+        :param sets: Rule sets to be applied
+        :return: Rule sets to be applied on their execution order, the same rule sets grouped on layers, their
+            routing index, None when all the sets apply to all the data, and whether they share field values
+        :raises RulerError: When the required rule set is not configured on the ruler or doesn't have rules
+        """
+
+        rule_sets = self._rule_sets
+        key = sets if sets is None or isinstance(sets, str) else self._selection_key(sets)
+        cached = self._orders.get(key)
+
+        if (cached is not None and cached[0] is rule_sets
+                and cached[5] == tuple(rule_set.version for rule_set in cached[1])):
+            return cached[1], cached[2], cached[3], cached[4]
+
+        if sets is None:
+            names = list(rule_sets)
+        elif isinstance(sets, str):
+            names = [sets]
+        elif isinstance(sets, (set, frozenset)):
+            positions = {name: position for position, name in enumerate(rule_sets)}
+            names = sorted(sets, key=lambda name: positions.get(name, len(positions)))
+        else:
+            names = list(dict.fromkeys(sets))
+
+        selected = [self._get_rule_set(rule_sets, set_name) for set_name in names]
+        missing = [self._get_rule_set(rule_sets, rule_set.name) for rule_set in prerequisites(rule_sets, selected)]
+        layers = schedule_layers(selected + missing)
+        order = tuple(rule_set for layer in layers for rule_set in layer)
+        router = routing_index(layers)
+        shared = shares_fields(order)
+
+        if len(self._orders) >= ORDER_CACHE_SIZE:
+            self._orders = dict()
+
+        self._orders[key] = (rule_sets, order, layers, router, shared, tuple(rule_set.version for rule_set in order))
+
+        return order, layers, router, shared
+
+    @staticmethod
+    def _selection_key(sets: Union[Tuple, List[AnyStr], Set[AnyStr]]) -> Hashable:
+        """Get the key of the execution order cache for a collection of set names.
+
+        :param sets: Collection of rule set names
+        :return Hashable: Cache key
+        """
+
+        if isinstance(sets, (set, frozenset)):
+            return frozenset(sets)
+
+        return tuple(sets)
+
+    def _apply_names(  # pylint: disable=too-many-arguments
+        self,
+        data: Any,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+        parallel: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> NoReturn:
+        """Apply the rule sets of the given names to the data.
+
+        :param data: Data to be validated by the rule sets
+        :param sets: Rule sets to be applied
+        :param fail_fast: Run on fail fast mode
+        :param parallel: Apply the rule sets in parallel
+        :param deadline: Deadline of the validation as a time.perf_counter value
         :raise RuleError: When some rule was not asserted successfully by the rule set
         :raise RulerError: When some set can't be applied
         """
 
-        for set_name in set_names:
-            self._apply_one(set_name, data, fail_fast)
+        rule_sets, layers, shared = self._route_sets(sets, data)
+        executor = self._parallel_executor(rule_sets, parallel)
+
+        if executor is not None:
+            for result in check_layers(executor, layers, data, fail_fast, deadline, shared):
+                if result is not CANCELLED and not result.ok:
+                    raise result.exception()
+
+            return
+
+        if shared:
+            call_shared(data, self._apply_set, rule_sets, data, fail_fast, deadline)
+            return
 
-    def _apply_one(self, set_name: AnyStr, data: Any, fail_fast: Optional[bool] = True) -> NoReturn:
-        """Apply just one rule set to the data.
+        self._apply_set(rule_sets, data, fail_fast, deadline)
+
+    def _instrumented_apply(  # pylint: disable=too-many-arguments
+        self,
+        data: Any,
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+        parallel: Optional[bool] = None,
+        deadline: Optional[float] = None,
+    ) -> NoReturn:
+        """Apply the rule sets recording the execution on the metrics of the ruler.
 
-        :param set_name: Rule set name to be applied
         :param data: Data to be validated by the rule sets
+        :param sets: Rule sets to be applied
         :param fail_fast: Run on fail fast mode
+        :param parallel: Apply the rule sets in parallel
+        :param deadline: Deadline of the validation as a time.perf_counter value
         :raise RuleError: When some rule was not asserted successfully by the rule set
         :raise RulerError: When some set can't be applied
         """
 
-        rule_set = self._get_rule_set(set_name)
-        rule_set.apply(data, fail_fast)
+        start = perf_counter()
+        passed = False
 
-    def _get_rule_set(self, set_name: AnyStr) -> RuleSet:
-        """Get the corresponding rule set by name.
+        try:
+            self._apply_names(data, sets, fail_fast, parallel, deadline)
+            passed = True
+        finally:
+            self._metrics.series(RULER, self._label).observe(passed, perf_counter() - start)
 
-        :param set_name: Rule set name.
-        :raises RulerError: When the required rule set is not configured on the ruler
+    @staticmethod
+    def _apply_set(rule_sets: Sequence[RuleSet], data: Any, fail_fast: Optional[bool] = True,
+                   deadline: Optional[float] = None) -> NoReturn:
+        """Apply configured rule sets to the provided data.
+
+        :param rule_sets: Rule sets to be applied
+        :param data: Data to be validated by the rule sets
+        :param fail_fast: Run on fail fast mode
+        :param deadline: Deadline of the validation as a time.perf_counter value
+        :raise RuleError: When some rule was not asserted successfully by the rule set
+        """
+
+        for rule_set in rule_sets:
+            rule_set.apply(data, fail_fast, None, deadline)
+
+    def check_picklable(self) -> None:
+        """Check that the rule sets of the ruler can be pickled, to be shipped to other processes or written to a
+        snapshot. The sets loaded from a snapshot were already pickled.
+
+        :raises RuleConfigError: When some rule can't be pickled
+        :raises RuleSetConfigError: When the match of some rule set can't be pickled
         """
 
-        rule_set = self._rule_sets.get(set_name, None)
+        for rule_set in self._rule_sets.values():
+            if not isinstance(rule_set, LazyRuleSet):
+                rule_set.check_picklable()
 
-        if rule_set is None:
-            raise RulerError(f"Not found RuleSet '{set_name}' on Ruler configuration")
+    def dump(self, file: Union[AnyStr, os.PathLike, IO[bytes]]) -> None:
+        """Write the configuration of the ruler to a compact binary snapshot that can be loaded quickly with the load
+        method. Each rule set is pickled and compressed on its own, so it can be loaded lazily.
+
+        :param file: Path or binary file object
+        :raises RuleConfigError: When some rule can't be pickled
+        :raises RuleSetConfigError: When the match of some rule set can't be pickled
+        """
+
+        write_snapshot(file, self._rule_sets.values(), self._label)
 
-        return rule_set
+    @classmethod
+    def load(cls, file: Union[AnyStr, os.PathLike, IO[bytes]], executor: Optional[Executor] = None) -> 'Ruler':
+        """Create a ruler from a binary snapshot written by the dump method. Only the names and the scheduling
+        configuration of the rule sets are read at once, the rules of each set are unpickled and compiled the first
+        time the set is applied.
+
+        :param file: Path or binary file object
+        :param executor: Executor used to apply the rule sets in parallel
+        :return Ruler: Loaded ruler
+        :raises RulerConfigError: When the file is not a snapshot of a supported version
+        """
+
+        label, rule_sets = read_snapshot(file)
+        ruler = cls(executor)
+        ruler.add_many(rule_sets)
+        ruler._label = label
+
+        return ruler
+
+    def __getstate__(self) -> Dict[AnyStr, Any]:
+        """Get the configuration of the ruler to be pickled. The metrics and the executor are not pickled.
+
+        :return Dict[AnyStr, Any]: Ruler configuration
+        """
+
+        return {'rule_sets': list(map(materialize, self._rule_sets.values())), 'label': self._label}
+
+    def __setstate__(self, state: Dict[AnyStr, Any]) -> None:
+        """Restore a pickled ruler.
+
+        :param state: Ruler configuration
+        """
+
+        self.__init__()  # pylint: disable=unnecessary-dunder-call
+        self.add_many(state['rule_sets'])
+        self._label = state['label']
 
     @staticmethod
-    def _process_set_names(sets: Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]) -> Union[AnyStr, Set[AnyStr]]:
-        """Verify the set names that will be applied and format it.
+    def _get_rule_set(rule_sets: Dict[AnyStr, RuleSet], set_name: AnyStr) -> RuleSet:
+        """Get the corresponding rule set by name.
 
-        :param sets: RuleSet name or List of RuleSet names.
-        :return Union[AnyStr, Set[AnyStr]]: Formatted set names
+        :param rule_sets: Configured rule sets by name
+        :param set_name: Rule set name.
+        :raises RulerError: When the required rule set is not configured on the ruler
         """
 
-        if isinstance(sets, (tuple, list)):
-            return set(sets)
+        rule_set = rule_sets.get(set_name, None)
+
+        if rule_set is None:
+            raise RulerError(f"Not found RuleSet '{set_name}' on Ruler configuration")
 
-        return sets
+        return materialize(rule_set)
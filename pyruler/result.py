@@ -0,0 +1,121 @@
+"""Validation results returned by the exception-free check methods."""
+
+from typing import AnyStr, Iterable, Optional, Tuple
+
+from .errors import RuleError
+
+
+class ValidationResult:
+    """Outcome of a validation. The error message of the result is only formatted when it is required.
+
+    :param rule_names: Names of the failing rules
+    :param errors: Custom errors configured on the failing rules, None for the rules without custom error
+    :param set_names: Names of the sets of each failing rule
+    :param fail_fast: Flag that tells if the validation was stopped at the first failing rule
+    :param skipped_sets: Names of the sets that were not applied because some set they depend on failed
+    :param skipped_rules: Names of the rules that were not evaluated because the time budget ran out
+    """
+
+    __slots__ = ('ok', 'rule_names', 'errors', 'set_names', 'fail_fast', 'skipped_sets', 'skipped_rules')
+
+    ok: bool
+    rule_names: Tuple[AnyStr, ...]
+    errors: Tuple[Optional[Exception], ...]
+    set_names: Tuple[AnyStr, ...]
+    fail_fast: bool
+    skipped_sets: Tuple[AnyStr, ...]
+    skipped_rules: Tuple[AnyStr, ...]
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        rule_names: Tuple[AnyStr, ...] = (),
+        errors: Tuple[Optional[Exception], ...] = (),
+        set_names: Tuple[AnyStr, ...] = (),
+        fail_fast: bool = True,
+        skipped_sets: Tuple[AnyStr, ...] = (),
+        skipped_rules: Tuple[AnyStr, ...] = (),
+    ):
+        self.ok = not rule_names
+        self.rule_names = rule_names
+        self.errors = errors
+        self.set_names = set_names
+        self.fail_fast = fail_fast
+        self.skipped_sets = skipped_sets
+        self.skipped_rules = skipped_rules
+
+    @classmethod
+    def combine(
+        cls,
+        results: Iterable['ValidationResult'],
+        fail_fast: bool = True,
+        skipped_sets: Tuple[AnyStr, ...] = (),
+    ) -> 'ValidationResult':
+        """Merge many results on a single one keeping the order of the failures and the skipped rules.
+
+        :param results: Results to be merged
+        :param fail_fast: Flag that tells if the merged validation was stopped at the first failure
+        :param skipped_sets: Names of the sets that were not applied because some set they depend on failed
+        :return ValidationResult: Merged result
+        """
+
+        rule_names = []
+        errors = []
+        set_names = []
+        skipped_rules = []
+
+        for result in results:
+            rule_names.extend(result.rule_names)
+            errors.extend(result.errors)
+            set_names.extend(result.set_names)
+            skipped_rules.extend(result.skipped_rules)
+
+        return cls(tuple(rule_names), tuple(errors), tuple(set_names), fail_fast, tuple(skipped_sets),
+                   tuple(skipped_rules))
+
+    @property
+    def complete(self) -> bool:
+        """Tells if all the rules were evaluated, without rules skipped because the time budget ran out.
+
+        :return bool: Assertion
+        """
+
+        return not self.skipped_rules
+
+    @property
+    def message(self) -> Optional[AnyStr]:
+        """Format the error message of the result.
+
+        :return Optional[AnyStr]: Error message or None when the validation passed
+        """
+
+        if self.ok:
+            return None
+
+        if self.fail_fast:
+            return f"Rule '{self.rule_names[0]}' fail"
+
+        return f"Rules '{str(list(self.rule_names))}' fail"
+
+    def exception(self) -> Optional[Exception]:
+        """Return the error that should be raised for the result. On fail fast mode this is the custom error of the
+        failing rule if it was configured.
+
+        :return Optional[Exception]: Error of the result or None when the validation passed
+        """
+
+        if self.ok:
+            return None
+
+        if self.fail_fast and self.errors[0] is not None:
+            return self.errors[0]
+
+        return RuleError(self.message)
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self) -> AnyStr:
+        if self.ok:
+            return '<ValidationResult: ok>'
+
+        return f"<ValidationResult: {', '.join(self.rule_names)} fail>"
@@ -0,0 +1,74 @@
+"""Incremental revalidation of the rules affected by a change of some fields of the data."""
+
+from typing import Any, AnyStr, Callable, Dict, Iterable, List, Set, Tuple
+
+from .fields import ReadsIndex
+from .result import ValidationResult
+from .rule import PlanEntry, Rule
+
+ReadsPlan = Tuple[Tuple[PlanEntry, ...], ReadsIndex, Dict[AnyStr, int]]
+
+
+def reads_plan(rules: Iterable[Rule], compile_rule: Callable[[Rule], Callable[[Any], bool]]) -> ReadsPlan:
+    """Build the execution plan of the revalidations. It has the entries of the execution plan, the index of the
+    rules by the fields they read and the position of each rule by name.
+
+    :param rules: Rules of the set in their order
+    :param compile_rule: Function that returns the resolver of a rule for the execution plan
+    :return ReadsPlan: Revalidation plan
+    """
+
+    rules = list(rules)
+
+    return (
+        tuple((index, compile_rule(rule), rule.name, rule.error) for index, rule in enumerate(rules)),
+        ReadsIndex([rule.declared_reads for rule in rules]),
+        {rule.name: index for index, rule in enumerate(rules)},
+    )
+
+
+def revalidate_plan(set_name: AnyStr, plan: ReadsPlan, data: Any, changed_fields: Iterable[AnyStr],
+                    previous_result: ValidationResult) -> ValidationResult:
+    """Apply again the rules of the revalidation plan affected by the changed fields, keeping the outcome of the
+    other rules of the set from the previous result. The rules skipped on the previous result always run again.
+
+    :param set_name: Name of the rule set of the plan
+    :param plan: Revalidation plan of the set
+    :param data: Changed data
+    :param changed_fields: Dotted paths of the changed fields
+    :param previous_result: Result of the previous validation of the data on collect all mode
+    :return ValidationResult: Result of the validation on collect all mode
+    """
+
+    entries, index, positions = plan
+
+    affected = index.affected(changed_fields)
+    affected.update(positions[name] for name in previous_result.skipped_rules if name in positions)
+    failed = {
+        positions[name] for name, rule_set in zip(previous_result.rule_names, previous_result.set_names)
+        if rule_set == set_name and name in positions
+    }
+    failures = _rerun(entries, affected, failed, data)
+
+    return ValidationResult(
+        tuple(entry[2] for entry in failures),
+        tuple(entry[3] for entry in failures),
+        (set_name, ) * len(failures),
+        False,
+    )
+
+
+def _rerun(plan: Tuple[PlanEntry, ...], affected: Set[int], failed: Set[int], data: Any) -> List[PlanEntry]:
+    """Apply the affected rules of the plan and keep the failures of the other rules.
+
+    :param plan: Compiled execution plan of the set
+    :param affected: Positions of the rules to be applied
+    :param failed: Positions of the rules that failed on the previous validation
+    :param data: Data to be validated by the rule set
+    :return List[PlanEntry]: Entries of the failing rules on the order of the rules
+    """
+
+    return [
+        plan[position] for position in sorted(affected | failed)
+        if position not in affected or not plan[position][1](data)
+    ]
@@ -1,26 +1,214 @@
 """Implementation of simple rule."""
 
-from typing import Any, AnyStr, Callable
+from functools import partial
+from importlib import import_module
+from typing import Any, AnyStr, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
 
+from .aio import is_async_callable
+from .cache import RuleCache
+from .dsl import compile_expression
 from .errors import RuleConfigError
+from .fields import PRESENCE_OPERATORS, async_guard_resolver, field_resolver, guard_resolver
 
+PlanEntry = Tuple[int, Callable[[Any], bool], AnyStr, Optional[Exception]]
 
-class Rule:
-    """Definition for atomic operation that validates data.
+CHEAP = 'cheap'
+NORMAL = 'normal'
+EXPENSIVE = 'expensive'
+
+TIERS = (CHEAP, NORMAL, EXPENSIVE)
+
+
+def import_resolver(reference: AnyStr) -> Callable:
+    """Import a resolver from a reference like 'package.module:function' or 'package.module:Class.method'.
+
+    :param reference: Import path of the resolver
+    :return Callable: Imported resolver
+    :raises RuleConfigError: When the resolver can't be imported
+    """
+
+    module_name, _, attributes = reference.partition(':')
+
+    if not module_name or not attributes:
+        raise RuleConfigError(f"Resolver reference '{reference}' should have the format 'package.module:function'")
+
+    try:
+        resolver = import_module(module_name)
+
+        for attribute in attributes.split('.'):
+            resolver = getattr(resolver, attribute)
+    except (ImportError, AttributeError) as error:
+        raise RuleConfigError(f"Resolver reference '{reference}' can't be imported: {error}")
+
+    return resolver
+
+
+def local_qualname(function: Any) -> Optional[AnyStr]:
+    """Get the qualified name of a lambda or a nested function, which can't be pickled by reference.
+
+    :param function: Function to be pickled
+    :return Optional[AnyStr]: Qualified name of the function or None when it can be pickled
+    """
+
+    qualname = getattr(function, '__qualname__', '')
+
+    return qualname if '<lambda>' in qualname or '<locals>' in qualname else None
+
+
+class Rule:  # pylint: disable=too-many-instance-attributes
+    """Definition for atomic operation that validates data. Rules can be pickled, to be shipped to other processes,
+    when their resolvers are module level functions, import references, or when they were created with the field or
+    the expression constructors.
 
     :param name: Name of the rule
-    :param resolver: Callable function that receives exactly 1 param as the data that will be validated
+    :param resolver: Callable function that receives exactly 1 param as the data that will be validated, or the import
+        reference of the function like 'package.module:function'. Async resolvers can only be executed with the async
+        methods of the rule, the RuleSet and the Ruler.
     :param error: Custom exception that can be raised by the RuleSet in case the rule validation fails
+    :param order_sensitive: Keep the position of the rule when an adaptive RuleSet reorders its rules
+    :param cache: Declare the rule as pure and cache its results by the key extracted from the data
+    :param when: Guard of the rule, a field path which value should be truthy or a predicate function of the data.
+        When the guard is false the rule passes without calling its resolver. RuleSets and Rulers evaluate each guard
+        once per data for all the rules behind it.
+    :param tier: Cost tier of the rule, 'cheap', 'normal' or 'expensive'. When a RuleSet is applied with a time
+        budget the cheap rules always run, the expensive rules run last and the rules that are not cheap are skipped
+        once the budget runs out.
+    :param reads: Dotted paths of all the fields read by the resolver. Rules that declare the fields they read are
+        only applied again by the revalidate methods when some of those fields change. Field and expression rules
+        declare their fields by themselves.
+    :raise RuleConfigError: When the tier is not supported
     """
 
-    _resolve: Callable
+    __slots__ = (
+        '_resolver',
+        '_name',
+        '_error',
+        '_order_sensitive',
+        '_cache',
+        '_reads',
+        '_is_async',
+        '_source',
+        '_when',
+        '_tier',
+        '_opaque',
+        '_compiled',
+    )
+
+    _resolver: Callable
     _name: AnyStr
     _error: Exception
+    _order_sensitive: bool
+    _cache: Optional[RuleCache]
+    _reads: Tuple[AnyStr, ...]
+    _is_async: bool
+    _source: Optional[Tuple[Any, ...]]
+    _when: Optional[Union[AnyStr, Callable[[Any], Any]]]
+    _tier: AnyStr
+    _opaque: bool
+    _compiled: Optional[Callable[[Any], bool]]
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: AnyStr,
+        resolver: Union[Callable, AnyStr] = None,
+        error: Exception = None,
+        order_sensitive: bool = False,
+        cache: Optional[RuleCache] = None,
+        when: Optional[Union[AnyStr, Callable[[Any], Any]]] = None,
+        tier: AnyStr = NORMAL,
+        reads: Optional[Iterable[AnyStr]] = None,
+    ):
+        if tier not in TIERS:
+            raise RuleConfigError(f"Tier '{tier}' of rule '{name}' is not supported, use one of {', '.join(TIERS)}")
+
+        self._source = None
+
+        if isinstance(resolver, str):
+            self._source = ('import', resolver)
+            resolver = import_resolver(resolver)
 
-    def __init__(self, name: AnyStr, resolver: Callable = None, error: Exception = None):
         self._resolver = resolver
         self._name = name
         self._error = error
+        self._order_sensitive = order_sensitive
+        self._cache = cache
+        self._reads = ((when, ) if isinstance(when, str) else ()) + tuple(reads or ())
+        self._opaque = reads is None or callable(when)
+        self._is_async = is_async_callable(resolver)
+        self._when = when
+        self._tier = tier
+        self._compiled = None
+
+        if self._is_async and cache is not None:
+            raise RuleConfigError(f"Rule '{name}' can't cache the results of an async resolver")
+
+    @classmethod
+    def field(  # pylint: disable=too-many-arguments
+        cls,
+        path: AnyStr,
+        operation: AnyStr,
+        value: Any = None,
+        name: Optional[AnyStr] = None,
+        error: Exception = None,
+        when: Optional[Union[AnyStr, Callable[[Any], Any]]] = None,
+        tier: AnyStr = NORMAL,
+    ) -> 'Rule':
+        """Create a declarative rule that compares the value of a field path with an operator. Missing fields fail
+        every operator except 'missing'.
+
+        :param path: Dotted path of the field, like 'user.address.country'
+        :param operation: One of '==', '!=', '<', '<=', '>', '>=', 'in', 'not in', 'contains', 'matches', 'exists'
+            or 'missing'
+        :param value: Value to compare the field with
+        :param name: Name of the rule, by default it is built from the path, the operator and the value
+        :param error: Custom exception that can be raised by the RuleSet in case the rule validation fails
+        :param when: Guard of the rule, like on the Rule constructor
+        :param tier: Cost tier of the rule, like on the Rule constructor
+        :return Rule: Field rule
+        :raise RuleConfigError: When the operator or the tier is not supported
+        """
+
+        if name is None:
+            name = f'{path} {operation}' if operation in PRESENCE_OPERATORS else f'{path} {operation} {value!r}'
+
+        rule = cls(name=name, resolver=field_resolver(path, operation, value), error=error, when=when,
+                   tier=tier)
+        rule._reads += (path, )  # pylint: disable=protected-access
+        rule._opaque = callable(when)  # pylint: disable=protected-access
+        rule._source = ('field', path, operation, value)  # pylint: disable=protected-access
+
+        return rule
+
+    @classmethod
+    def expression(
+        cls,
+        expression: AnyStr,
+        name: Optional[AnyStr] = None,
+        error: Exception = None,
+        when: Optional[Union[AnyStr, Callable[[Any], Any]]] = None,
+        tier: AnyStr = NORMAL,
+    ) -> 'Rule':
+        """Create a rule from an expression like 'amount > 0 and currency in {"USD", "EUR"}'. The expression is
+        compiled to a single Python function where every name or dotted name is a field path of the data. Compiled
+        functions are cached by the expression text.
+
+        :param expression: Rule expression
+        :param name: Name of the rule, by default it is the expression text
+        :param error: Custom exception that can be raised by the RuleSet in case the rule validation fails
+        :param when: Guard of the rule, like on the Rule constructor
+        :param tier: Cost tier of the rule, like on the Rule constructor
+        :return Rule: Compiled rule
+        :raise RuleConfigError: When the expression is not valid or the tier is not supported
+        """
+
+        resolver, reads = compile_expression(expression)
+
+        rule = cls(name=expression if name is None else name, resolver=resolver, error=error, when=when, tier=tier)
+        rule._reads += reads  # pylint: disable=protected-access
+        rule._opaque = callable(when)  # pylint: disable=protected-access
+        rule._source = ('expression', expression)  # pylint: disable=protected-access
+
+        return rule
 
     @property
     def name(self):
@@ -40,6 +228,70 @@ class Rule:
 
         return self._error
 
+    @property
+    def order_sensitive(self) -> bool:
+        """Tells if the rule should keep its position when the rules of a set are reordered.
+
+        :return bool: Assertion
+        """
+
+        return self._order_sensitive
+
+    @property
+    def reads(self) -> Tuple[AnyStr, ...]:
+        """Return the field paths read by the rule.
+
+        :return Tuple[AnyStr, ...]: Dotted field paths
+        """
+
+        return self._reads
+
+    @property
+    def declared_reads(self) -> Optional[Tuple[AnyStr, ...]]:
+        """Return the field paths read by the rule when all of them are known, like for field and expression rules or
+        rules configured with the fields they read.
+
+        :return: Dotted field paths, or None when the resolver or the guard of the rule can read any field
+        """
+
+        return None if self._opaque else self._reads
+
+    @property
+    def when(self) -> Optional[Union[AnyStr, Callable[[Any], Any]]]:
+        """Return the guard of the rule.
+
+        :return: Field path or predicate function, None when the rule doesn't have a guard
+        """
+
+        return self._when
+
+    @property
+    def tier(self) -> AnyStr:
+        """Return the cost tier of the rule.
+
+        :return AnyStr: 'cheap', 'normal' or 'expensive'
+        """
+
+        return self._tier
+
+    @property
+    def is_async(self) -> bool:
+        """Tells if the resolver of the rule is async.
+
+        :return bool: Assertion
+        """
+
+        return self._is_async
+
+    @property
+    def cache(self) -> Optional[RuleCache]:
+        """Return the result cache of a pure rule.
+
+        :return Optional[RuleCache]: Configured cache
+        """
+
+        return self._cache
+
     def execute(self, data: Any) -> bool:
         """Execute rule validation.
 
@@ -47,10 +299,139 @@ class Rule:
         :raise RuleConfigError: When the resolver is not callable
         """
 
+        return self.compile()(data)
+
+    async def execute_async(self, data: Any) -> bool:
+        """Execute rule validation awaiting the result of async resolvers.
+
+        :param data: Data to be validated by the Rule
+        :raise RuleConfigError: When the resolver is not callable
+        """
+
+        if self._is_async:
+            return await self.compile_async()(data)
+
+        return self.compile()(data)
+
+    def compile(self) -> Callable[[Any], bool]:
+        """Validate the configured resolver and return the callable that should be used to execute the rule. The
+        callable is built once and reused until the resolver of the rule is rebuilt.
+
+        :return Callable: Resolver of the rule
+        :raise RuleConfigError: When the resolver is not callable
+        """
+
+        compiled = self._compiled
+
+        if compiled is not None:
+            return compiled
+
         if self._resolver is None or not callable(self._resolver):
             raise RuleConfigError(f"Rule '{self._name}' doesn't have a Callable resolver")
 
-        return self._resolver(data)
+        if self._is_async:
+            compiled = self._sync_guard
+        else:
+            compiled = self._resolver
+
+            if self._cache is not None:
+                compiled = partial(self._cache.resolve, compiled)
+
+            if self._when is not None:
+                compiled = guard_resolver(self._when, compiled)
+
+        self._compiled = compiled
+
+        return compiled
+
+    def compile_async(self) -> Callable[[Any], Awaitable[bool]]:
+        """Validate the configured async resolver and return it.
+
+        :return Callable: Async resolver of the rule
+        :raise RuleConfigError: When the resolver is not callable or it is not async
+        """
+
+        if self._resolver is None or not callable(self._resolver):
+            raise RuleConfigError(f"Rule '{self._name}' doesn't have a Callable resolver")
+
+        if not self._is_async:
+            raise RuleConfigError(f"Rule '{self._name}' doesn't have an async resolver")
+
+        if self._when is not None:
+            return async_guard_resolver(self._when, self._resolver)
+
+        return self._resolver
+
+    def _sync_guard(self, data: Any) -> bool:
+        """Resolver used for async rules on synchronous executions.
+
+        :param data: Data to be validated by the Rule
+        :raise RuleConfigError: Always, async rules can't be executed synchronously
+        """
+
+        raise RuleConfigError(f"Rule '{self._name}' has an async resolver and should be applied with apply_async")
+
+    def check_picklable(self) -> None:
+        """Check that the rule can be pickled, to be shipped to other processes or written to a snapshot. Resolvers
+        built from an import reference, a field or an expression are always picklable.
+
+        :raises RuleConfigError: When the resolver, the guard or the key of the cache is a lambda or a nested function
+            that can't be pickled
+        """
+
+        functions = {
+            'resolver': self._resolver if self._source is None else None,
+            'guard': self._when,
+            'cache key': None if self._cache is None else self._cache.key,
+        }
+
+        for kind, function in functions.items():
+            qualname = local_qualname(function)
+
+            if qualname is not None:
+                raise RuleConfigError(
+                    f"Rule '{self._name}' can't be pickled because its {kind} {qualname} is not a module level "
+                    "function, use a module level function or an import reference like 'package.module:function'")
+
+    def __getstate__(self) -> Dict[AnyStr, Any]:
+        """Get the state of the rule to be pickled or copied, with the attributes of subclasses. Resolvers built from
+        an import reference, a field or an expression are rebuilt when the rule is unpickled.
+
+        :return Dict[AnyStr, Any]: Rule state
+        """
+
+        state = dict(getattr(self, '__dict__', {}))
+        state.update((attribute, getattr(self, attribute)) for cls in type(self).__mro__
+                     for attribute in getattr(cls, '__slots__', ()) if hasattr(self, attribute))
+        state['_compiled'] = None
+
+        if self._source is not None:
+            state['_resolver'] = None
+
+        return state
+
+    def __setstate__(self, state: Dict[AnyStr, Any]) -> None:
+        """Restore a pickled rule rebuilding its resolver.
+
+        :param state: Rule state
+        """
+
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+
+        self._compiled = None
+
+        if self._source is None:
+            return
+
+        kind, *args = self._source
+
+        if kind == 'import':
+            self._resolver = import_resolver(*args)
+        elif kind == 'field':
+            self._resolver = field_resolver(*args)
+        else:
+            self._resolver = compile_expression(*args)[0]
 
     def __hash__(self) -> int:
         """Generate hash representation.
@@ -0,0 +1,152 @@
+"""Compact array backed storage of the rules of a RuleSet."""
+
+from typing import AnyStr, Dict, Iterable, Iterator, List, Optional
+
+from .rule import Rule
+
+
+class RuleStore:
+    """Ordered storage of rules backed by a list, with an index of the rule positions by name. Appending a rule and
+    looking up a rule by name are O(1); inserting or removing a rule shifts the following rules and rebuilds the index
+    on the next lookup. When many rules share the same name the index points to the first one.
+
+    :param rules: Optional iterable object to initialize the store
+    """
+
+    __slots__ = ('_rules', '_positions')
+
+    _rules: List[Rule]
+    _positions: Optional[Dict[AnyStr, int]]
+
+    def __init__(self, rules: Optional[Iterable[Rule]] = None):
+        self._rules = []
+        self._positions = {}
+
+        if rules is not None:
+            self.extend(rules)
+
+    def copy(self) -> 'RuleStore':
+        """Create a new store with the same rules, to be modified without affecting this one.
+
+        :return RuleStore: Copy of the store
+        """
+
+        # pylint: disable=protected-access
+        store = RuleStore()
+        store._rules = list(self._rules)
+        store._positions = None if self._positions is None else dict(self._positions)
+
+        return store
+
+    def append(self, rule: Rule) -> None:
+        """Add a rule at the end of the store.
+
+        :param rule: Rule to be added
+        """
+
+        if self._positions is not None:
+            self._positions.setdefault(rule.name, len(self._rules))
+
+        self._rules.append(rule)
+
+    def extend(self, rules: Iterable[Rule]) -> None:
+        """Add many rules at the end of the store.
+
+        :param rules: Iterable object of rules
+        """
+
+        for rule in rules:
+            self.append(rule)
+
+    def insert(self, position: int, rule: Rule) -> None:
+        """Add a rule at the given position, moving the following rules one position.
+
+        :param position: Position of the new rule
+        :param rule: Rule to be added
+        """
+
+        self._rules.insert(position, rule)
+        self._positions = None
+
+    def remove(self, name: AnyStr) -> Rule:
+        """Remove the first rule with the given name.
+
+        :param name: Name of the rule
+        :return Rule: Removed rule
+        :raises KeyError: When there isn't a rule with the given name
+        """
+
+        rule = self._rules.pop(self.index(name))
+        self._positions = None
+
+        return rule
+
+    def replace(self, name: AnyStr, rule: Rule) -> Rule:
+        """Put a rule on the position of the first rule with the given name.
+
+        :param name: Name of the replaced rule
+        :param rule: New rule
+        :return Rule: Replaced rule
+        :raises KeyError: When there isn't a rule with the given name
+        """
+
+        position = self.index(name)
+        previous = self._rules[position]
+        self._rules[position] = rule
+
+        if rule.name != name:
+            self._positions = None
+
+        return previous
+
+    def index(self, name: AnyStr) -> int:
+        """Get the position of the first rule with the given name.
+
+        :param name: Name of the rule
+        :return int: Position of the rule
+        :raises KeyError: When there isn't a rule with the given name
+        """
+
+        positions = self._positions
+
+        if positions is None:
+            positions = {}
+
+            for position, rule in enumerate(self._rules):
+                positions.setdefault(rule.name, position)
+
+            self._positions = positions
+
+        return positions[name]
+
+    def get(self, name: AnyStr) -> Optional[Rule]:
+        """Get the first rule with the given name.
+
+        :param name: Name of the rule
+        :return Optional[Rule]: Stored rule or None if there isn't a rule with the given name
+        """
+
+        try:
+            return self._rules[self.index(name)]
+        except KeyError:
+            return None
+
+    def names(self) -> List[AnyStr]:
+        """Return the names of the stored rules in order.
+
+        :return List[AnyStr]: Rule names
+        """
+
+        return [rule.name for rule in self._rules]
+
+    def __contains__(self, name: AnyStr) -> bool:
+        return self.get(name) is not None
+
+    def __getitem__(self, position: int) -> Rule:
+        return self._rules[position]
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self._rules)
+
+    def __len__(self) -> int:
+        return len(self._rules)
@@ -1,64 +1,261 @@
 """Implementation of RuleSet policies."""
 
-from typing import Any, AnyStr, Iterable, List, NoReturn, Optional, Set
-
-from .errors import RuleError, RuleSetConfigError, RuleSetError
-from .linked_list import LinkedList
-from .rule import Rule
-
-
-class RuleSet:
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Any, AnyStr, Callable, Dict, Iterable, List, Mapping, NoReturn, Optional, Set, Tuple, Union
+
+from .adaptive import AdaptiveOrder
+from .aio import AsyncPlanEntry, run_async_plan
+from .batch import BatchReport
+from .budget import TieredPlanEntry, resolve_deadline, run_tiers, tiered_plan
+from .column_rule import ColumnResult, ColumnRule, apply_columns, require_numpy
+from .errors import RuleSetConfigError, RuleSetError
+from .fields import call_shared
+from .metrics import SET, Metrics
+from .result import ValidationResult
+from .revalidation import ReadsPlan, reads_plan, revalidate_plan
+from .rule import PlanEntry, Rule, local_qualname
+from .rule_store import RuleStore
+
+
+class RuleSet:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Rule Set definition to apply a set of rules to a context info.
 
+    The rules of the set can be modified while other threads apply it: every change builds a new copy of the rules
+    and publishes it at once, so the running validations keep using the rules they started with and never wait for a
+    lock. As each call copies the rules once, a set built rule by rule should get its rules with add_many.
+
     :param name: Identifier name of the rule set
+    :param adaptive: Reorder the rules on fail fast mode by their failure rate and cost. Can be True to use the
+        default AdaptiveOrder configuration or a configured AdaptiveOrder object.
+    :param priority: Sets with higher priority are applied first by the Ruler
+    :param cost: Relative cost hint of applying the set, between sets of the same priority the Ruler applies the
+        cheapest ones first
+    :param depends_on: Names of the sets that should pass before this set is applied by the Ruler
+    :param match: Kind of data the set applies to. It can be a pair of field path and value, like
+        ('event_type', 'payment'), or a list, tuple or set of values, that the Ruler looks up on a hash index, or a
+        predicate function of the data. The Ruler only applies the set to the data that matches. By default the set
+        applies to all the data.
+    :raises RuleSetConfigError: When the match is not a predicate or a pair of field path and value, or the adaptive
+        order is already used by another set
     """
 
+    __slots__ = (
+        '_name',
+        '_rules',
+        '_rule_hashes',
+        '_plan',
+        '_async_plan',
+        '_tiered_plan',
+        '_reads_plan',
+        '_adaptive',
+        '_metrics',
+        '_reads',
+        '_guards',
+        '_shared',
+        '_lock',
+        '_priority',
+        '_cost',
+        '_depends_on',
+        '_match',
+        '_version',
+    )
+
     _name: AnyStr
-    _rules: LinkedList[Rule]
+    _rules: RuleStore
     _rule_hashes: Set[int]
+    _plan: Optional[Tuple[PlanEntry, ...]]
+    _async_plan: Optional[Tuple[AsyncPlanEntry, ...]]
+    _tiered_plan: Optional[Tuple[TieredPlanEntry, ...]]
+    _reads_plan: Optional[ReadsPlan]
+    _adaptive: Optional[AdaptiveOrder]
+    _metrics: Optional[Metrics]
+    _reads: Tuple[AnyStr, ...]
+    _guards: Tuple[Callable[[Any], Any], ...]
+    _shared: bool
+    _lock: Lock
+    _priority: int
+    _cost: float
+    _depends_on: Tuple[AnyStr, ...]
+    _match: Optional[Union[Callable[[Any], bool], Tuple[AnyStr, Any]]]
+    _version: int
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: AnyStr,
+        adaptive: Union[bool, AdaptiveOrder] = False,
+        priority: int = 0,
+        cost: float = 1.0,
+        depends_on: Iterable[AnyStr] = (),
+        match: Optional[Union[Callable[[Any], bool], Tuple[AnyStr, Any]]] = None,
+    ):
+        if not (match is None or callable(match) or (isinstance(match, tuple) and len(match) == 2)):
+            raise RuleSetConfigError(
+                f"Match of RuleSet '{name}' should be a predicate or a pair of field path and value, got {match!r}")
+
+        if isinstance(adaptive, AdaptiveOrder):
+            adaptive.attach(name)
 
-    def __init__(self, name: AnyStr):
         self._name = name
-        self._rules = LinkedList()
+        self._rules = RuleStore()
         self._rule_hashes = set()
+        self._plan = None
+        self._async_plan = None
+        self._tiered_plan = None
+        self._reads_plan = None
+        self._adaptive = AdaptiveOrder() if adaptive is True else adaptive or None
+        self._metrics = None
+        self._reads = ()
+        self._guards = ()
+        self._shared = False
+        self._lock = Lock()
+        self._priority = priority
+        self._cost = cost
+        self._depends_on = tuple(depends_on)
+        self._match = match
+        self._version = 0
 
     @property
     def name(self):
         """Get property value."""
         return self._name
 
-    def add_rule(self, rule: Rule) -> NoReturn:
-        """Add new role to the set.
+    @property
+    def priority(self) -> int:
+        """Priority of the set on the execution order of the Ruler.
+
+        :return int: Set priority
+        """
+
+        return self._priority
+
+    @property
+    def cost(self) -> float:
+        """Relative cost hint of the set.
+
+        :return float: Set cost
+        """
+
+        return self._cost
+
+    @property
+    def depends_on(self) -> Tuple[AnyStr, ...]:
+        """Names of the sets that should pass before this set is applied by the Ruler.
+
+        :return Tuple[AnyStr, ...]: Set names
+        """
+
+        return self._depends_on
+
+    @property
+    def match(self) -> Optional[Union[Callable[[Any], bool], Tuple[AnyStr, Any]]]:
+        """Kind of data the set applies to, a pair of field path and value or a predicate function.
+
+        :return: Set match or None when the set applies to all the data
+        """
+
+        return self._match
+
+    @property
+    def version(self) -> int:
+        """Number of changes of the rules of the set, it grows each time rules are added, removed or replaced.
+
+        :return int: Rules version
+        """
+
+        return self._version
+
+    def add_rule(self, rule: Rule, position: Optional[int] = None) -> NoReturn:
+        """Add new role to the set. The rules of the set are copied on each call, to add many rules use add_many.
 
         :param rule: New Rule object to be applied by the set
+        :param position: Position of the rule on the set, by default the rule is added at the end
         :raises RuleSetConfigError: when the set detects that the provided rule was already added to the set
         """
 
-        if rule.__hash__() in self._rule_hashes:
-            raise RuleSetConfigError(f"Rule '{rule.name}' was already configured in the RuleSet")
+        if position is None:
+            self.add_many((rule, ))
+            return
+
+        with self._lock:
+            if rule.__hash__() in self._rule_hashes:
+                raise RuleSetConfigError(f"Rule '{rule.name}' was already configured in the RuleSet")
 
-        self._rules.add_last(rule)
-        self._rule_hashes.add(rule.__hash__())
+            rules = self._rules.copy()
+            rules.insert(position, rule)
+
+            self._publish(rules, {rule.__hash__()})
 
     def add_many(self, rules: Iterable[Rule]) -> None:
-        """Add many rules at ones.
+        """Add many rules at ones, copying the rules of the set once for all of them.
 
         :param rules: Iterable object of rules
+        :raises RuleSetConfigError: when some rule was already added to the set or is duplicated
         """
 
+        rules = list(rules)
         hashes = set()
 
-        for rule in rules:
-            if rule.__hash__() in self._rule_hashes:
+        with self._lock:
+            for rule in rules:
+                if rule.__hash__() in self._rule_hashes:
+                    raise RuleSetConfigError(f"Rule '{rule.name}' was already configured in the RuleSet")
+
+                if rule.__hash__() in hashes:
+                    raise RuleSetConfigError(f"Rule '{rule.name}' is duplicated on the given rules")
+
+                hashes.add(rule.__hash__())
+
+            store = self._rules.copy()
+            store.extend(rules)
+
+            self._publish(store, hashes)
+
+    def remove_rule(self, name: AnyStr) -> Rule:
+        """Remove a rule from the set by its name.
+
+        :param name: Name of the rule
+        :return Rule: Removed rule
+        :raises RuleSetConfigError: when the set doesn't have a rule with the given name
+        """
+
+        with self._lock:
+            if name not in self._rules:
+                raise RuleSetConfigError(f"Rule '{name}' is not configured in the RuleSet")
+
+            rules = self._rules.copy()
+            rule = rules.remove(name)
+
+            self._publish(rules, removed={rule.__hash__()})
+
+        return rule
+
+    def replace_rule(self, name: AnyStr, rule: Rule) -> Rule:
+        """Put a new rule on the position of the rule with the given name.
+
+        :param name: Name of the replaced rule
+        :param rule: New Rule object
+        :return Rule: Replaced rule
+        :raises RuleSetConfigError: when the set doesn't have a rule with the given name or the new rule was already
+            added to the set
+        """
+
+        with self._lock:
+            previous = self._rules.get(name)
+
+            if previous is None:
+                raise RuleSetConfigError(f"Rule '{name}' is not configured in the RuleSet")
+
+            if rule.__hash__() in self._rule_hashes and rule.__hash__() != previous.__hash__():
                 raise RuleSetConfigError(f"Rule '{rule.name}' was already configured in the RuleSet")
 
-            if rule.__hash__() in hashes:
-                raise RuleSetConfigError(f"Rule '{rule.name}' is duplicated on the given rules")
+            rules = self._rules.copy()
+            rules.replace(name, rule)
 
-            hashes.add(rule.__hash__())
+            self._publish(rules, {rule.__hash__()}, {previous.__hash__()})
 
-        self._rules.add_many(rules)
-        self._rule_hashes.update(hashes)
+        return previous
 
     def count_rules(self) -> int:
         """Count the total of rules configured on the set.
@@ -74,62 +271,604 @@ class RuleSet:
         :return List[AnyStr]: List of rule names
         """
 
-        names = []
+        return self._rules.names()
+
+    def get_rule(self, name: AnyStr) -> Rule:
+        """Get a configured rule by its name.
+
+        :param name: Name of the rule
+        :return Rule: Configured rule
+        :raises RuleSetConfigError: when the set doesn't have a rule with the given name
+        """
+
+        rule = self._rules.get(name)
+
+        if rule is None:
+            raise RuleSetConfigError(f"Rule '{name}' is not configured in the RuleSet")
+
+        return rule
+
+    def adaptive_stats(self) -> List[Dict[AnyStr, Any]]:
+        """Return the statistics used by the adaptive mode to order the rules, in the current execution order.
+
+        :return List[Dict[AnyStr, Any]]: Statistics of each rule
+        :raises RuleSetConfigError: when the set is not running on adaptive mode
+        """
+
+        if self._adaptive is None:
+            raise RuleSetConfigError(f'RuleSet {self._name} is not running on adaptive mode')
+
+        self.compile()
+
+        return self._adaptive.stats()
+
+    def reads(self) -> Tuple[AnyStr, ...]:
+        """Return the field paths read by the rules of the set, a path is repeated for each rule that reads it.
+
+        :return Tuple[AnyStr, ...]: Dotted field paths
+        """
+
+        self.compile()
+
+        return self._reads
+
+    def guards(self) -> Tuple[Callable[[Any], Any], ...]:
+        """Return the predicate guards of the rules of the set, a guard is repeated for each rule behind it. Field
+        path guards are returned by the reads method.
+
+        :return Tuple[Callable[[Any], Any], ...]: Guard functions
+        """
+
+        self.compile()
+
+        return self._guards
+
+    def check_picklable(self) -> None:
+        """Check that the set and its rules can be pickled, to be shipped to other processes or written to a snapshot.
+
+        :raises RuleConfigError: When some rule of the set can't be pickled
+        :raises RuleSetConfigError: When the match is a lambda or a nested function that can't be pickled
+        """
+
+        qualname = local_qualname(self._match)
+
+        if qualname is not None:
+            raise RuleSetConfigError(
+                f"RuleSet '{self._name}' can't be pickled because its match {qualname} is not a module level function, "
+                "use a module level function or a pair of field path and value")
 
         for rule in self._rules:
-            names.append(rule.name)
+            rule.check_picklable()
 
-        return names
+    def instrument(self, metrics: Optional[Metrics]) -> None:
+        """Record the executions of the set and its rules on the given metrics registry. When metrics is None the
+        instrumentation is removed and the set goes back to the uninstrumented execution path.
 
-    def apply(self, data: Any, fail_fast: Optional[bool] = True) -> NoReturn:
+        :param metrics: Metrics registry or None to disable the instrumentation
+        """
+
+        with self._lock:
+            self._metrics = metrics
+            self._invalidate()
+
+    def compile(self) -> Tuple[PlanEntry, ...]:
+        """Build the execution plan of the set. The plan is a flat tuple with the position, the validated resolver,
+        the name and the custom error of every rule, in the same order that the rules where added. The plan is cached
+        until the rules of the set change.
+
+        :return Tuple[PlanEntry, ...]: Execution plan
+        :raises RuleConfigError: When some rule doesn't have a callable resolver
+        """
+
+        plan = self._plan
+
+        if plan is not None:
+            return plan
+
+        with self._lock:
+            if self._plan is None:
+                rules = self._rules
+                plan = tuple((index, self._compile_rule(rule), rule.name, rule.error)
+                             for index, rule in enumerate(rules))
+
+                if self._adaptive is not None:
+                    self._adaptive.bind(plan, [rule.order_sensitive for rule in rules])
+
+                self._reads = tuple(path for rule in rules for path in rule.reads)
+                self._guards = tuple(rule.when for rule in rules if callable(rule.when))
+                self._shared = (len(self._reads) > len(set(self._reads))
+                                or len(self._guards) > len(set(self._guards)))
+                self._plan = plan
+
+            return self._plan
+
+    def apply(
+        self,
+        data: Any,
+        fail_fast: Optional[bool] = True,
+        budget: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> NoReturn:
         """Apply the configured rule set to a specific data.
 
         :param data: Data to be validated by the rule set
         :param fail_fast: flag to determine if the error will raise at first not True rule, or will execute all and
             collect all the rules that fails with the data before raise it.
+        :param budget: Seconds the validation can take, like on the check method
+        :param deadline: Absolute deadline of the validation, like on the check method
         :raises RuleError: when the data is not complaint with some rule of the set
         """
 
-        if self._rules.empty():
-            raise RuleSetError(f'No rules configured on rule set {self._name}')
+        result = self.check(data, fail_fast, budget, deadline)
+
+        if not result.ok:
+            raise result.exception()
+
+    def check(
+        self,
+        data: Any,
+        fail_fast: Optional[bool] = True,
+        budget: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> ValidationResult:
+        """Apply the configured rule set to a specific data without raising errors for the failing rules. With a time
+        budget or a deadline the rules run by their cost tier: the cheap rules always run, the expensive rules run
+        last, and the rules that are not cheap are skipped once the deadline is reached. The skipped rules are
+        reported on the skipped_rules attribute of the result.
+
+        :param data: Data to be validated by the rule set
+        :param fail_fast: flag to determine if the validation stops at first not True rule, or will execute all and
+            collect all the rules that fails with the data.
+        :param budget: Seconds the validation can take
+        :param deadline: Absolute deadline of the validation as a time.perf_counter value
+        :return ValidationResult: Result of the validation
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        if budget is not None or deadline is not None:
+            return self._budget_check(data, fail_fast, resolve_deadline(budget, deadline))
+
+        if self._metrics is not None:
+            return self._instrumented_check(data, fail_fast)
+
+        plan = self._plan or self._compiled_plan()
+
+        if self._shared:
+            return call_shared(data, self._run, plan, data, fail_fast)
 
         if fail_fast:
-            self._fail_fast_apply(data)
-            return
+            if self._adaptive is not None:
+                return self._adaptive_apply(data)
+
+            return self._fail_fast_apply(plan, data)
 
-        self._apply(data)
+        return self._apply(plan, data)
 
-    def _fail_fast_apply(self, data: Any) -> NoReturn:
-        """Apply the configured rule set to the data and raise and error with
-        the first rule failure.
+    def revalidate(self, data: Any, changed_fields: Iterable[AnyStr],
+                   previous_result: ValidationResult) -> ValidationResult:
+        """Apply again the rules affected by a change of some fields of the data, keeping the outcome of the other
+        rules from a previous validation on collect all mode. The rules that don't declare the fields they read, and
+        the rules skipped by a time budget on the previous validation, always run again.
+
+        :param data: Changed data
+        :param changed_fields: Dotted paths of the changed fields
+        :param previous_result: Result of the previous validation of the data on collect all mode
+        :return ValidationResult: Result of the validation on collect all mode
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        plan = self._reads_plan or self._compiled_reads_plan()
+
+        if self._shared:
+            return call_shared(data, revalidate_plan, self._name, plan, data, changed_fields, previous_result)
+
+        return revalidate_plan(self._name, plan, data, changed_fields, previous_result)
+
+    async def apply_async(self, data: Any, fail_fast: Optional[bool] = True) -> NoReturn:
+        """Apply the configured rule set to a specific data awaiting the async rules.
 
         :param data: Data to be validated by the rule set
+        :param fail_fast: flag to determine if the error will raise at first not True rule, or will execute all and
+            collect all the rules that fails with the data before raise it.
         :raises RuleError: when the data is not complaint with some rule of the set
         """
 
-        for rule in self._rules:
-            if not rule.execute(data):
-                if rule.error is not None:
-                    raise rule.error
+        result = await self.check_async(data, fail_fast)
 
-                raise RuleError(f"Rule '{rule.name}' fail")
+        if not result.ok:
+            raise result.exception()
 
-    def _apply(self, data: Any) -> NoReturn:
-        """Apply the configured rule set to the data and collect all the rules
-        that fail before raise an error.
+    async def check_async(self, data: Any, fail_fast: Optional[bool] = True) -> ValidationResult:
+        """Apply the configured rule set to a specific data awaiting the async rules, without raising errors for the
+        failing rules. Sync rules run first inline in their order and then all the async rules run concurrently. On
+        fail fast mode the pending async rules are cancelled as soon as one of them fails.
 
         :param data: Data to be validated by the rule set
-        :raises RuleError: when the data is not complaint with some rule of the set
+        :param fail_fast: flag to determine if the validation stops at first not True rule
+        :return ValidationResult: Result of the validation
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        start = perf_counter()
+        plan = self._async_plan or self._compiled_async_plan()
+        result = await run_async_plan(self._name, plan, data, fail_fast)
+
+        if self._metrics is not None:
+            self._metrics.series(SET, self._name).observe(result.ok, perf_counter() - start)
+
+        return result
+
+    def apply_many(self, records: Iterable[Any], fail_fast: Optional[bool] = True,
+                   compact: bool = False) -> Union[List[Tuple[int, ...]], BatchReport]:
+        """Apply the configured rule set to a batch of records without raising errors for the records that fail.
+
+        :param records: Iterable object with the records to be validated by the rule set
+        :param fail_fast: flag to determine if the validation of a record stops at the first not True rule, or will
+            execute all the rules of the set over the record.
+        :param compact: Return a BatchReport that stores the failing records of each rule on arrays, instead of the
+            failing rules of each record
+        :return: Positions of the failing rules of each record, in the same order of the records. An empty tuple
+            means that the record passed all the rules.
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        index = self.indexer(fail_fast)
+
+        if not compact:
+            return [index(record) for record in records]
+
+        report = BatchReport({self._name: self._plan or self._compiled_plan()}, fail_fast)
+        name = self._name
+
+        for record in records:
+            failed = index(record)
+            report.append(((name, failed), ) if failed else ())
+
+        return report
+
+    def indexer(self, fail_fast: Optional[bool] = True) -> Callable[[Any], Tuple[int, ...]]:
+        """Return a function that validates one record with the current execution plan and returns the positions of
+        the failing rules. This is the function used by `apply_many` on each record.
+
+        :param fail_fast: flag to determine if the validation of a record stops at the first not True rule
+        :return Callable[[Any], Tuple[int, ...]]: Validation function
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        plan = self._plan or self._compiled_plan()
+
+        if not fail_fast:
+            index = partial(self._collect_index, plan)
+        elif self._adaptive is not None:
+            index = self._adaptive_index
+        else:
+            index = partial(self._fail_fast_index, plan)
+
+        if self._shared:
+            index = partial(self._shared_index, index)
+
+        if self._metrics is None:
+            return index
+
+        observe = self._metrics.series(SET, self._name).observe
+
+        def instrumented(data: Any) -> Tuple[int, ...]:
+            start = perf_counter()
+            failed = index(data)
+            observe(not failed, perf_counter() - start)
+
+            return failed
+
+        return instrumented
+
+    def apply_columns(self, columns: Mapping[AnyStr, Any]) -> ColumnResult:
+        """Apply the configured column rules to many rows at once. The masks of the rules are combined and the
+        evaluation stops as soon as every row has failed.
+
+        :param columns: Mapping of column names to NumPy arrays of the same size
+        :return ColumnResult: Combined mask and failing row indices of each rule
+        :raises RuleSetConfigError: when NumPy is not installed or some rule of the set is not a ColumnRule
+        :raises RuleSetError: when the set doesn't have rules or the columns have different sizes
         """
 
-        errors = []
+        require_numpy(f"RuleSet '{self._name}' apply_columns", RuleSetConfigError)
+        plan = self._plan or self._compiled_plan()
 
         for rule in self._rules:
-            if not rule.execute(data):
-                errors.append(rule.name)
+            if not isinstance(rule, ColumnRule):
+                raise RuleSetConfigError(f"Rule '{rule.name}' can't be applied over columns")
+
+        return apply_columns(plan, columns)
+
+    def _compile_rule(self, rule: Rule) -> Callable[[Any], bool]:
+        """Get the resolver of a rule for the execution plan, instrumented when the set has metrics.
+
+        :param rule: Rule to be compiled
+        :return Callable[[Any], bool]: Resolver
+        """
+
+        resolver = rule.compile()
+
+        if self._metrics is None or isinstance(rule, ColumnRule):
+            return resolver
+
+        return self._metrics.wrap_rule(self._name, rule.name, resolver)
+
+    def _instrumented_check(self, data: Any, fail_fast: Optional[bool] = True) -> ValidationResult:
+        """Run the check method recording the execution on the metrics of the set.
+
+        :param data: Data to be validated by the rule set
+        :param fail_fast: flag to determine if the validation stops at first not True rule
+        :return ValidationResult: Result of the validation
+        """
+
+        start = perf_counter()
+        plan = self._plan or self._compiled_plan()
+
+        if self._shared:
+            result = call_shared(data, self._run, plan, data, fail_fast)
+        else:
+            result = self._run(plan, data, fail_fast)
+
+        self._metrics.series(SET, self._name).observe(result.ok, perf_counter() - start)
+
+        return result
+
+    def _run(self, plan: Tuple[PlanEntry, ...], data: Any, fail_fast: Optional[bool] = True) -> ValidationResult:
+        """Apply the execution plan to the data on the given mode.
+
+        :param plan: Compiled execution plan of the set
+        :param data: Data to be validated by the rule set
+        :param fail_fast: flag to determine if the validation stops at first not True rule
+        :return ValidationResult: Result of the validation
+        """
+
+        if not fail_fast:
+            return self._apply(plan, data)
+
+        if self._adaptive is not None:
+            return self._adaptive_apply(data)
+
+        return self._fail_fast_apply(plan, data)
+
+    def _budget_check(self, data: Any, fail_fast: Optional[bool], deadline: float) -> ValidationResult:
+        """Apply the rules by their cost tier until the deadline is reached.
+
+        :param data: Data to be validated by the rule set
+        :param fail_fast: flag to determine if the validation stops at first not True rule
+        :param deadline: Deadline of the validation as a time.perf_counter value
+        :return ValidationResult: Result of the validation with the skipped rules
+        """
+
+        start = perf_counter()
+        plan = self._tiered_plan or self._compiled_tiered_plan()
+
+        if self._shared:
+            result = call_shared(data, run_tiers, self._name, plan, data, fail_fast, deadline)
+        else:
+            result = run_tiers(self._name, plan, data, fail_fast, deadline)
+
+        if self._metrics is not None:
+            self._metrics.series(SET, self._name).observe(result.ok, perf_counter() - start)
+
+        return result
+
+    def _compiled_tiered_plan(self) -> Tuple[TieredPlanEntry, ...]:
+        """Return the execution plan of the validations with a time budget. It has the entries of the execution plan
+        sorted by the cost tier of their rules, each one with a flag that tells if the rule is cheap.
+
+        :return Tuple[TieredPlanEntry, ...]: Tiered execution plan
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        self._compiled_plan()
+
+        with self._lock:
+            if self._tiered_plan is None:
+                self._tiered_plan = tiered_plan(self._rules, self._compile_rule)
+
+            return self._tiered_plan
+
+    def _compiled_reads_plan(self) -> ReadsPlan:
+        """Return the execution plan of the revalidations. It has the entries of the execution plan, the index of the
+        rules by the fields they read and the position of each rule by name.
+
+        :return ReadsPlan: Revalidation plan
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        self._compiled_plan()
+
+        with self._lock:
+            if self._reads_plan is None:
+                self._reads_plan = reads_plan(self._rules, self._compile_rule)
+
+            return self._reads_plan
+
+    @staticmethod
+    def _shared_index(index: Callable[[Any], Tuple[int, ...]], data: Any) -> Tuple[int, ...]:
+        """Call a validation function sharing the extracted field values between the rules.
+
+        :param index: Validation function
+        :param data: Data to be validated by the rule set
+        :return Tuple[int, ...]: Positions of the failing rules
+        """
+
+        return call_shared(data, index, data)
+
+    def _compiled_async_plan(self) -> Tuple[AsyncPlanEntry, ...]:
+        """Return the execution plan of the async methods. Entries have the same values of the execution plan with
+        the async resolvers of the async rules, and an extra flag that tells if the rule is async.
+
+        :return Tuple[AsyncPlanEntry, ...]: Async execution plan
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        self._compiled_plan()
+
+        with self._lock:
+            if self._async_plan is None:
+                async_plan = []
 
-        if errors:
-            raise RuleError(f"Rules '{str(errors)}' fail")
+                for index, rule in enumerate(self._rules):
+                    if rule.is_async:
+                        resolver = rule.compile_async()
+
+                        if self._metrics is not None:
+                            resolver = self._metrics.wrap_async_rule(self._name, rule.name, resolver)
+                    else:
+                        resolver = self._compile_rule(rule)
+
+                    async_plan.append((index, resolver, rule.name, rule.error, rule.is_async))
+
+                self._async_plan = tuple(async_plan)
+
+            return self._async_plan
+
+    def _publish(self, rules: RuleStore, added: Set[int] = frozenset(), removed: Set[int] = frozenset()) -> None:
+        """Replace the rules of the set with a new copy and discard the compiled execution plans. The hashes of the
+        rules are only read holding the lock, so they are updated in place. It should be called holding the lock of
+        the set.
+
+        :param rules: New rules of the set
+        :param added: Hashes of the added rules
+        :param removed: Hashes of the removed rules
+        """
+
+        self._rules = rules
+        self._rule_hashes -= removed
+        self._rule_hashes |= added
+        self._version += 1
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Discard the compiled execution plans."""
+
+        self._plan = None
+        self._async_plan = None
+        self._tiered_plan = None
+        self._reads_plan = None
+
+    def _compiled_plan(self) -> Tuple[PlanEntry, ...]:
+        """Return the execution plan of the set verifying that the set has rules to be applied.
+
+        :return Tuple[PlanEntry, ...]: Execution plan
+        :raises RuleSetError: when the set doesn't have configured rules
+        """
+
+        if not self._rules:
+            raise RuleSetError(f'No rules configured on rule set {self._name}')
+
+        return self.compile()
+
+    @staticmethod
+    def _fail_fast_index(plan: Tuple[PlanEntry, ...], data: Any) -> Tuple[int, ...]:
+        """Return the position of the first rule of the plan that fails with the data.
+
+        :param plan: Compiled execution plan of the set
+        :param data: Data to be validated by the rule set
+        :return Tuple[int, ...]: Position of the failing rule or an empty tuple if all the rules pass
+        """
+
+        for index, resolver, _, _ in plan:
+            if not resolver(data):
+                return (index, )
+
+        return ()
+
+    @staticmethod
+    def _collect_index(plan: Tuple[PlanEntry, ...], data: Any) -> Tuple[int, ...]:
+        """Return the positions of all the rules of the plan that fail with the data.
+
+        :param plan: Compiled execution plan of the set
+        :param data: Data to be validated by the rule set
+        :return Tuple[int, ...]: Positions of the failing rules
+        """
+
+        return tuple(index for index, resolver, _, _ in plan if not resolver(data))
+
+    def _fail_fast_apply(self, plan: Tuple[PlanEntry, ...], data: Any) -> ValidationResult:
+        """Apply the configured rule set to the data and stop with the first rule failure.
+
+        :param plan: Compiled execution plan of the set
+        :param data: Data to be validated by the rule set
+        :return ValidationResult: Result with the first failing rule
+        """
+
+        for _, resolver, name, error in plan:
+            if not resolver(data):
+                return ValidationResult((name, ), (error, ), (self._name, ))
+
+        return ValidationResult()
+
+    def _adaptive_apply(self, data: Any) -> ValidationResult:
+        """Apply the rules on the adaptive order and stop with the first rule failure.
+
+        :param data: Data to be validated by the rule set
+        :return ValidationResult: Result with the first failing rule
+        """
+
+        entry = self._adaptive.run(data)
+
+        if entry is None:
+            return ValidationResult()
+
+        return ValidationResult((entry[2], ), (entry[3], ), (self._name, ))
+
+    def _adaptive_index(self, data: Any) -> Tuple[int, ...]:
+        """Return the position of the first rule that fails with the data running on the adaptive order.
+
+        :param data: Data to be validated by the rule set
+        :return Tuple[int, ...]: Position of the failing rule or an empty tuple if all the rules pass
+        """
+
+        entry = self._adaptive.run(data)
+
+        return () if entry is None else (entry[0], )
+
+    def _apply(self, plan: Tuple[PlanEntry, ...], data: Any) -> ValidationResult:
+        """Apply the configured rule set to the data and collect all the rules that fail.
+
+        :param plan: Compiled execution plan of the set
+        :param data: Data to be validated by the rule set
+        :return ValidationResult: Result with all the failing rules
+        """
+
+        failures = [(name, error) for _, resolver, name, error in plan if not resolver(data)]
+
+        if not failures:
+            return ValidationResult(fail_fast=False)
+
+        names, errors = zip(*failures)
+
+        return ValidationResult(names, errors, (self._name, ) * len(names), False)
+
+    def __getstate__(self) -> Dict[AnyStr, Any]:
+        """Get the configuration of the set to be pickled. Compiled plans and metrics are not pickled.
+
+        :return Dict[AnyStr, Any]: Rule set configuration
+        """
+
+        return {
+            'name': self._name,
+            'rules': list(self._rules),
+            'adaptive': self._adaptive,
+            'priority': self._priority,
+            'cost': self._cost,
+            'depends_on': self._depends_on,
+            'match': self._match,
+        }
+
+    def __setstate__(self, state: Dict[AnyStr, Any]) -> None:
+        """Restore a pickled rule set.
+
+        :param state: Rule set configuration
+        """
+
+        # pylint: disable=unnecessary-dunder-call
+        self.__init__(state['name'], state['adaptive'] or False, state['priority'], state['cost'], state['depends_on'],
+                      state['match'])
+        self.add_many(state['rules'])
 
     def __hash__(self) -> int:
         """Generate hash representation.
@@ -137,4 +876,5 @@ class RuleSet:
         :return int: Has representation
         """
 
-        return hash((self._name, self._rules))
+        return hash((self._name, id(self)))
+
@@ -0,0 +1,105 @@
+"""Validation of record batches on worker processes."""
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, AnyStr, Iterable, List, Optional, Set, Tuple, Union
+
+from .errors import RulerConfigError
+from .parallel import chunked
+from .pyruler import Ruler
+
+_worker_ruler: Optional[Ruler] = None  # pylint: disable=invalid-name
+
+
+def _init_worker(payload: bytes) -> None:
+    """Load the pickled ruler once on each worker process.
+
+    :param payload: Pickled ruler
+    """
+
+    global _worker_ruler  # pylint: disable=global-statement
+
+    _worker_ruler = pickle.loads(payload)
+
+
+def _apply_chunk(sets: Any, fail_fast: bool, chunk: List[Any]) -> List[Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]:
+    """Validate a chunk of records with the ruler of the worker process.
+
+    :param sets: Rule sets to be applied
+    :param fail_fast: Stop the validation of a record at the first failing rule
+    :param chunk: Records to be validated
+    :return: Failing sets and rule positions of each record
+    """
+
+    return _worker_ruler.apply_many(chunk, sets, fail_fast)
+
+
+class ProcessRunner:
+    """Validate batches of records with a ruler on a pool of worker processes, for CPU bound rules limited by the GIL.
+    The ruler is pickled once and loaded by each worker when it starts, so only the records and the results are sent
+    on each task. The rules of the ruler must be picklable, see the Rule class.
+
+    :param ruler: Configured ruler
+    :param workers: Number of worker processes, by default the number of CPUs of the machine
+    :param chunk_size: Number of records sent to a worker on each task
+    :raises RulerConfigError: When the chunk size is not positive
+    :raises RuleConfigError: When some rule of the ruler can't be pickled
+    :raises RuleSetConfigError: When the match of some rule set of the ruler can't be pickled
+    """
+
+    _payload: bytes
+    _workers: Optional[int]
+    _chunk_size: int
+    _executor: Optional[ProcessPoolExecutor]
+
+    def __init__(self, ruler: Ruler, workers: Optional[int] = None, chunk_size: int = 1000):
+        if chunk_size < 1:
+            raise RulerConfigError(f'Chunk size should be a positive number, got {chunk_size}')
+
+        ruler.check_picklable()
+
+        self._payload = pickle.dumps(ruler)
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._executor = None
+
+    def apply_many(
+        self,
+        records: Iterable[Any],
+        sets: Optional[Union[AnyStr, Tuple, List[AnyStr], Set[AnyStr]]] = None,
+        fail_fast: Optional[bool] = True,
+    ) -> List[Tuple[Tuple[AnyStr, Tuple[int, ...]], ...]]:
+        """Apply the specified rule sets to a batch of records on the worker processes. The worker pool is started
+        on the first call and reused by the next ones.
+
+        :param records: Iterable object with the records to be validated
+        :param sets: Rule sets to be applied
+        :param fail_fast: Stop the validation of a record at the first failing rule
+        :return: Same results of Ruler.apply_many, on the order of the records
+        :raises RulerError: When some set can't be applied
+        """
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers, initializer=_init_worker, initargs=(self._payload, ))
+
+        results = []
+
+        for chunk_results in self._executor.map(partial(_apply_chunk, sets, fail_fast),
+                                                chunked(records, self._chunk_size)):
+            results.extend(chunk_results)
+
+        return results
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'ProcessRunner':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
@@ -0,0 +1,321 @@
+"""Sampling policies that apply low-risk rule sets to a fraction of the validated data."""
+
+import zlib
+from abc import ABC, abstractmethod
+from functools import partial
+from random import random
+from threading import Lock
+from time import perf_counter
+from typing import Any, AnyStr, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from .errors import RulerConfigError
+from .fields import MISSING, split_path, traverse
+from .result import ValidationResult
+from .ruleset import RuleSet
+
+_HASH_RANGE = 2 ** 32
+
+
+class Sampler(ABC):
+    """Base sampling policy of a rule set. It decides which data the set is applied to and counts the outcome of the
+    sampled validations, so the failures of the set can be extrapolated to all the data. Subclasses implement the
+    decision with the abstract _decide method.
+    """
+
+    __slots__ = ('seen', 'sampled', 'checked', 'failures', '_lock')
+
+    seen: int
+    sampled: int
+    checked: int
+    failures: int
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Set all the counters of the sampler to zero."""
+
+        with self._lock:
+            self.seen = 0
+            self.sampled = 0
+            self.checked = 0
+            self.failures = 0
+
+    def sample(self, data: Any) -> bool:
+        """Decide if the rule set should be applied to the data.
+
+        :param data: Data to be validated
+        :return bool: True when the set should be applied
+        """
+
+        sampled = self._decide(data)
+
+        with self._lock:
+            self.seen += 1
+
+            if sampled:
+                self.sampled += 1
+
+        return sampled
+
+    def observe(self, failed: bool) -> None:
+        """Register the outcome of a sampled validation.
+
+        :param failed: Flag that tells if the rule set failed
+        """
+
+        with self._lock:
+            self.checked += 1
+
+            if failed:
+                self.failures += 1
+
+    def snapshot(self) -> Dict[AnyStr, Any]:
+        """Return the counters of the sampler with the failures extrapolated to all the data it has seen.
+
+        :return Dict[AnyStr, Any]: Sampling statistics
+        """
+
+        with self._lock:
+            seen, sampled, checked, failures = self.seen, self.sampled, self.checked, self.failures
+
+        failure_rate = failures / checked if checked else 0.0
+
+        return {
+            'seen': seen,
+            'sampled': sampled,
+            'checked': checked,
+            'failures': failures,
+            'sample_rate': sampled / seen if seen else 0.0,
+            'failure_rate': failure_rate,
+            'estimated_failures': failure_rate * seen,
+        }
+
+    @abstractmethod
+    def _decide(self, data: Any) -> bool:
+        """Decide if the data is sampled, without counting the decision.
+
+        :param data: Data to be validated
+        :return bool: True when the set should be applied
+        """
+
+
+class FixedRate(Sampler):
+    """Sample the data at random with a fixed probability.
+
+    :param rate: Fraction of the data the rule set is applied to, between 0 and 1
+    :raises RulerConfigError: When the rate is out of range
+    """
+
+    __slots__ = ('_rate', )
+
+    _rate: float
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self._rate = _check_rate(rate)
+
+    def _decide(self, data: Any) -> bool:
+        return random() < self._rate
+
+
+class KeyRate(Sampler):
+    """Sample the data by the hash of a key field, so the same key is always sampled or always skipped, on every
+    process and run. The data without the key field is always sampled.
+
+    :param key: Dotted path of the key field
+    :param rate: Fraction of the keys the rule set is applied to, between 0 and 1
+    :raises RulerConfigError: When the rate is out of range
+    """
+
+    __slots__ = ('_parts', '_threshold')
+
+    _parts: Tuple[AnyStr, ...]
+    _threshold: int
+
+    def __init__(self, key: AnyStr, rate: float):
+        super().__init__()
+        self._parts = split_path(key)
+        self._threshold = int(_check_rate(rate) * _HASH_RANGE)
+
+    def _decide(self, data: Any) -> bool:
+        value = traverse(data, self._parts)
+
+        if value is MISSING:
+            return True
+
+        return zlib.crc32(str(value).encode()) < self._threshold
+
+
+class LoadRate(Sampler):  # pylint: disable=too-many-instance-attributes
+    """Sample the data with a rate that adapts to the current load, so the rule set is applied to about a target
+    number of records per second. The rate is recalculated at the end of each time window from the number of records
+    seen on the window.
+
+    :param target: Number of records per second the rule set should be applied to
+    :param window: Seconds between the updates of the rate
+    :param min_rate: Lowest rate used under any load, between 0 and 1
+    :raises RulerConfigError: When the target or the window are not positive or the minimum rate is out of range
+    """
+
+    __slots__ = ('_target', '_window', '_min_rate', '_rate', '_window_start', '_window_seen')
+
+    _target: float
+    _window: float
+    _min_rate: float
+    _rate: float
+    _window_start: float
+    _window_seen: int
+
+    def __init__(self, target: float, window: float = 1.0, min_rate: float = 0.0):
+        if target <= 0:
+            raise RulerConfigError(f'Sampling target should be a positive number, got {target}')
+
+        if window <= 0:
+            raise RulerConfigError(f'Sampling window should be a positive number, got {window}')
+
+        super().__init__()
+        self._target = target
+        self._window = window
+        self._min_rate = _check_rate(min_rate)
+        self._rate = 1.0
+        self._window_start = perf_counter()
+        self._window_seen = 0
+
+    @property
+    def rate(self) -> float:
+        """Sampling rate of the current window.
+
+        :return float: Fraction of the data the rule set is applied to
+        """
+
+        return self._rate
+
+    def _decide(self, data: Any) -> bool:
+        now = perf_counter()
+
+        with self._lock:
+            elapsed = now - self._window_start
+
+            if elapsed >= self._window:
+                load = self._window_seen / elapsed
+                self._rate = max(self._min_rate, min(1.0, self._target / load)) if load else 1.0
+                self._window_start = now
+                self._window_seen = 0
+
+            self._window_seen += 1
+            rate = self._rate
+
+        return rate >= 1.0 or random() < rate
+
+
+def sample_sets(
+    sampling: Mapping[AnyStr, Sampler],
+    rule_sets: Sequence[RuleSet],
+    layers: Sequence[Sequence[RuleSet]],
+    data: Any,
+) -> Tuple[Tuple[RuleSet, ...], Tuple[Tuple[RuleSet, ...], ...], Dict[AnyStr, Sampler]]:
+    """Remove the rule sets that don't sample the data from the execution order and the layers.
+
+    :param sampling: Sampling policies by set name
+    :param rule_sets: Rule sets to be applied, on their execution order
+    :param layers: Layers of the rule sets to be applied
+    :param data: Data to be validated
+    :return: Sampled execution order, sampled layers and samplers of the sets that sampled the data
+    """
+
+    sampled = {}
+    skipped = set()
+
+    for rule_set in rule_sets:
+        sampler = sampling.get(rule_set.name)
+
+        if sampler is None:
+            continue
+
+        if sampler.sample(data):
+            sampled[rule_set.name] = sampler
+        else:
+            skipped.add(rule_set.name)
+
+    if not skipped:
+        return tuple(rule_sets), tuple(map(tuple, layers)), sampled
+
+    layers = (tuple(rule_set for rule_set in layer if rule_set.name not in skipped) for layer in layers)
+
+    return (
+        tuple(rule_set for rule_set in rule_sets if rule_set.name not in skipped),
+        tuple(layer for layer in layers if layer),
+        sampled,
+    )
+
+
+def observe_result(sampled: Dict[AnyStr, Sampler], rule_sets: Sequence[RuleSet], result: ValidationResult) -> None:
+    """Register the outcome of the sampled rule sets that were applied. On fail fast mode the sets placed after the
+    failing set were not applied and are not counted.
+
+    :param sampled: Samplers of the sets that sampled the data
+    :param rule_sets: Applied rule sets, on their execution order
+    :param result: Result of the validation
+    """
+
+    failed = set(result.set_names)
+
+    for rule_set in rule_sets:
+        sampler = sampled.get(rule_set.name)
+
+        if sampler is not None and rule_set.name not in result.skipped_sets:
+            sampler.observe(rule_set.name in failed)
+
+        if result.fail_fast and rule_set.name in failed:
+            return
+
+
+def sampled_index(sampler: Sampler, index: Callable[[Any], Tuple[int, ...]], data: Any) -> Tuple[int, ...]:
+    """Apply a rule set validation function of a batch only to the sampled records. The skipped records pass.
+
+    :param sampler: Sampling policy of the set
+    :param index: Validation function of the set returning the positions of the failing rules
+    :param data: Data to be validated
+    :return Tuple[int, ...]: Positions of the failing rules
+    """
+
+    if not sampler.sample(data):
+        return ()
+
+    failed = index(data)
+    sampler.observe(bool(failed))
+
+    return failed
+
+
+def sampled_indexer(rule_set: RuleSet, fail_fast: Optional[bool],
+                    sampling: Optional[Mapping[AnyStr, Sampler]]) -> Callable[[Any], Tuple[int, ...]]:
+    """Get the batch validation function of a rule set, applied only to the sampled records when the set has a
+    sampling policy.
+
+    :param rule_set: Rule set to be applied
+    :param fail_fast: Stop the validation of a record at the first failing rule
+    :param sampling: Sampling policies by set name
+    :return: Validation function returning the positions of the failing rules
+    """
+
+    index = rule_set.indexer(fail_fast)
+    sampler = sampling.get(rule_set.name) if sampling else None
+
+    return index if sampler is None else partial(sampled_index, sampler, index)
+
+
+def _check_rate(rate: float) -> float:
+    """Check that a sampling rate is between 0 and 1.
+
+    :param rate: Sampling rate
+    :return float: Checked rate
+    :raises RulerConfigError: When the rate is out of range
+    """
+
+    if not 0 <= rate <= 1:
+        raise RulerConfigError(f'Sampling rate should be between 0 and 1, got {rate}')
+
+    return rate
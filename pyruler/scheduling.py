@@ -0,0 +1,472 @@
+"""Scheduling of the rule sets of a Ruler by their dependencies and routing of the data to the matching sets."""
+
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, AnyStr, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .aio import CANCELLED, gather_until
+from .errors import RulerConfigError, RulerError
+from .fields import call_with_values, overlaps, split_path, traverse
+from .parallel import map_until
+from .result import ValidationResult
+from .ruleset import RuleSet
+
+ROUTE_CACHE_SIZE = 1024
+
+Route = Tuple[Tuple[RuleSet, ...], Tuple[Tuple[RuleSet, ...], ...], bool]
+
+
+def check_cycles(rule_sets: Dict[AnyStr, RuleSet], names: Optional[Iterable[AnyStr]] = None,
+                 closed: bool = False) -> None:
+    """Check that the dependencies of the rule sets don't make a cycle. Dependencies on rule sets that are not
+    configured are ignored, they are reported when the dependant set is applied.
+
+    When only some of the sets changed, the walk starts from their names and only visits the sets reachable from them,
+    as a new cycle has to go through some of the changed sets.
+
+    :param rule_sets: Rule sets by name
+    :param names: Names of the added or replaced rule sets, by default all the sets are checked
+    :param closed: Tells that none of the other sets depends on the given sets, so they can't lead back to them and
+        the walk doesn't leave the given sets
+    :raises RulerConfigError: When the dependencies of the rule sets make a cycle
+    """
+
+    names = list(rule_sets if names is None else names)
+    scope = set(names) if closed else rule_sets
+    done = set()
+
+    for name in names:
+        if name in done:
+            continue
+
+        path = [name]
+        visiting = {name}
+        pending = [iter(rule_sets[name].depends_on)]
+
+        while pending:
+            dependency = next(pending[-1], None)
+
+            if dependency is None:
+                visiting.discard(path[-1])
+                done.add(path.pop())
+                pending.pop()
+            elif dependency in visiting:
+                cycle = ' -> '.join(f"'{set_name}'" for set_name in path[path.index(dependency):] + [dependency])
+                raise RulerConfigError(f'RuleSet dependencies make a cycle: {cycle}')
+            elif dependency not in done and dependency in scope and dependency in rule_sets:
+                path.append(dependency)
+                visiting.add(dependency)
+                pending.append(iter(rule_sets[dependency].depends_on))
+
+
+def dependents_index(rule_sets: Iterable[RuleSet]) -> Dict[AnyStr, Set[AnyStr]]:
+    """Index the names of the rule sets by the names of the sets they depend on.
+
+    :param rule_sets: Rule sets to be indexed
+    :return Dict[AnyStr, Set[AnyStr]]: Names of the dependent sets by the name of their dependency
+    """
+
+    dependents = dict()
+    update_dependents(dependents, (), rule_sets)
+
+    return dependents
+
+
+def update_dependents(dependents: Dict[AnyStr, Set[AnyStr]], removed: Iterable[RuleSet],
+                      added: Iterable[RuleSet]) -> None:
+    """Update in place an index built by dependents_index, dropping the names that no set depends on anymore.
+
+    :param dependents: Names of the dependent sets by the name of their dependency
+    :param removed: Rule sets removed or replaced on the index
+    :param added: Rule sets added to the index
+    """
+
+    for rule_set in removed:
+        for dependency in rule_set.depends_on:
+            names = dependents.get(dependency)
+
+            if names is not None:
+                names.discard(rule_set.name)
+
+                if not names:
+                    del dependents[dependency]
+
+    for rule_set in added:
+        for dependency in rule_set.depends_on:
+            dependents.setdefault(dependency, set()).add(rule_set.name)
+
+
+def prerequisites(rule_sets: Dict[AnyStr, RuleSet], selected: List[RuleSet]) -> List[RuleSet]:
+    """Get the rule sets that the selected sets depend on, directly or through other sets, and are not selected.
+
+    :param rule_sets: Configured rule sets by name
+    :param selected: Selected rule sets
+    :return List[RuleSet]: Missing rule sets on the order they were added to the ruler
+    :raises RulerError: When some of the rule sets is not configured on the ruler
+    """
+
+    names = {rule_set.name for rule_set in selected}
+    pending = list(selected)
+    missing = dict()
+
+    while pending:
+        for set_name in pending.pop().depends_on:
+            if set_name not in names and set_name not in missing:
+                if set_name not in rule_sets:
+                    raise RulerError(f"Not found RuleSet '{set_name}' on Ruler configuration")
+
+                missing[set_name] = rule_sets[set_name]
+                pending.append(missing[set_name])
+
+    return [rule_set for set_name, rule_set in rule_sets.items() if set_name in missing]
+
+
+def schedule_layers(selected: List[RuleSet]) -> Tuple[Tuple[RuleSet, ...], ...]:
+    """Group the rule sets on layers of sets that don't depend on each other, sorting each layer by priority and
+    cost. All the sets each set depends on should be selected.
+
+    :param selected: Selected rule sets
+    :return: Layers of rule sets
+    """
+
+    layers = []
+    done = set()
+
+    while selected:
+        layer = [rule_set for rule_set in selected if done.issuperset(rule_set.depends_on)]
+        selected = [rule_set for rule_set in selected if not done.issuperset(rule_set.depends_on)]
+        layers.append(tuple(sorted(layer, key=lambda rule_set: (-rule_set.priority, rule_set.cost))))
+        done.update(rule_set.name for rule_set in layer)
+
+    return tuple(layers)
+
+
+def shares_fields(rule_sets: Sequence[RuleSet]) -> bool:
+    """Tells if some field path or guard is read by more than one rule of the rule sets, so its value should be
+    extracted or evaluated once and shared between the rules.
+
+    :param rule_sets: Rule sets to be analyzed
+    :return bool: Assertion
+    """
+
+    reads = [path for rule_set in rule_sets for path in rule_set.reads()]
+    guards = [guard for rule_set in rule_sets for guard in rule_set.guards()]
+
+    return len(reads) > len(set(reads)) or len(guards) > len(set(guards))
+
+
+def check_layers(executor: Executor, layers: Sequence[Sequence[RuleSet]], data: Any, fail_fast: Optional[bool] = True,
+                 deadline: Optional[float] = None, shared: bool = False) -> List[Any]:
+    """Check the rule sets in parallel on the executor, one layer of independent sets after another. On fail fast
+    mode the sets placed after the first failing one are cancelled, so the outcome is the same as checking the
+    sets one after another. On collect all mode the sets that depend on a failing set are skipped.
+
+    :param executor: Executor that runs the rule sets
+    :param layers: Layers of rule sets to be applied, each set only depends on sets of the previous layers
+    :param data: Data to be validated by the rule sets
+    :param fail_fast: Run on fail fast mode
+    :param deadline: Deadline of the validation as a time.perf_counter value
+    :param shared: Share the extracted field values between the sets, as told by shares_fields
+    :return List[Any]: Result of each set on the order of the layers, CANCELLED for the sets cancelled on fail
+        fast mode or skipped because some set they depend on failed
+    """
+
+    values = dict() if shared else None
+    results = []
+    failed = set()
+
+    for layer in layers:
+        if failed and fail_fast:
+            results.extend(CANCELLED for _ in layer)
+            continue
+
+        runnable = [rule_set for rule_set in layer if not failed.intersection(rule_set.depends_on)]
+
+        if values is None:
+            checks = [partial(rule_set.check, data, fail_fast, None, deadline) for rule_set in runnable]
+        else:
+            checks = [
+                partial(call_with_values, data, values, rule_set.check, data, fail_fast, None, deadline)
+                for rule_set in runnable
+            ]
+
+        layer_results = dict(zip(runnable, map_until(executor, checks, lambda result: fail_fast and not result.ok)))
+
+        for rule_set in layer:
+            result = layer_results.get(rule_set, CANCELLED)
+            results.append(result)
+
+            if result is CANCELLED or not result.ok:
+                failed.add(rule_set.name)
+
+    return results
+
+
+def check_sets(rule_sets: Sequence[RuleSet], data: Any, fail_fast: Optional[bool] = True,
+               deadline: Optional[float] = None) -> ValidationResult:
+    """Check the rule sets one after another collecting their results. On collect all mode the sets that depend on a
+    failing set are skipped.
+
+    :param rule_sets: Rule sets to be applied, on their execution order
+    :param data: Data to be validated by the rule sets
+    :param fail_fast: Run on fail fast mode
+    :param deadline: Deadline of the validation as a time.perf_counter value
+    :return ValidationResult: Result of the validation
+    """
+
+    results = []
+    failed = set()
+    skipped = []
+
+    for rule_set in rule_sets:
+        if failed and failed.intersection(rule_set.depends_on):
+            failed.add(rule_set.name)
+            skipped.append(rule_set.name)
+            continue
+
+        result = rule_set.check(data, fail_fast, None, deadline)
+
+        if not result.ok:
+            if fail_fast:
+                return ValidationResult.combine([*results, result]) if results else result
+
+            results.append(result)
+            failed.add(rule_set.name)
+        elif result.skipped_rules:
+            results.append(result)
+
+    return ValidationResult.combine(results, fail_fast, tuple(skipped))
+
+
+def revalidate_sets(rule_sets: Sequence[RuleSet], data: Any, changed_fields: Tuple[AnyStr, ...],
+                    previous_result: ValidationResult) -> ValidationResult:
+    """Apply again the rules of the rule sets affected by a change of some fields, on collect all mode. The sets that
+    were skipped on the previous validation are applied again completely, and the sets that depend on a failing set
+    are skipped.
+
+    :param rule_sets: Rule sets to be applied, on their execution order
+    :param data: Changed data
+    :param changed_fields: Dotted paths of the changed fields
+    :param previous_result: Result of the previous validation of the data on collect all mode
+    :return ValidationResult: Result of the validation
+    """
+
+    results = []
+    failed = set()
+    skipped = []
+
+    for rule_set in rule_sets:
+        if failed and failed.intersection(rule_set.depends_on):
+            failed.add(rule_set.name)
+            skipped.append(rule_set.name)
+            continue
+
+        if rule_set.name in previous_result.skipped_sets:
+            result = rule_set.check(data, False)
+        else:
+            result = rule_set.revalidate(data, changed_fields, previous_result)
+
+        if not result.ok:
+            results.append(result)
+            failed.add(rule_set.name)
+
+    return ValidationResult.combine(results, False, tuple(skipped))
+
+
+async def check_layers_async(layers: Sequence[Sequence[RuleSet]], data: Any,
+                             fail_fast: Optional[bool] = True) -> List[Any]:
+    """Check the rule sets concurrently, one layer of independent sets after another. On collect all mode the sets
+    that depend on a failing set are skipped.
+
+    :param layers: Layers of rule sets to be applied, each set only depends on sets of the previous layers
+    :param data: Data to be validated by the rule sets
+    :param fail_fast: Run on fail fast mode
+    :return List[Any]: Result of each set on the order of the layers, CANCELLED for the sets cancelled on fail
+        fast mode or skipped because some set they depend on failed
+    """
+
+    results = []
+    failed = set()
+
+    for layer in layers:
+        if failed and fail_fast:
+            results.extend(CANCELLED for _ in layer)
+            continue
+
+        runnable = [rule_set for rule_set in layer if not failed.intersection(rule_set.depends_on)]
+        checks = [rule_set.check_async(data, fail_fast) for rule_set in runnable]
+        layer_results = dict(zip(runnable, await gather_until(checks, lambda result: fail_fast and not result.ok)))
+
+        for rule_set in layer:
+            result = layer_results.get(rule_set, CANCELLED)
+            results.append(result)
+
+            if result is CANCELLED or not result.ok:
+                failed.add(rule_set.name)
+
+    return results
+
+
+def merge_results(rule_sets: Sequence[RuleSet], results: Sequence[Any], fail_fast: Optional[bool]) -> ValidationResult:
+    """Merge the results of the rule sets checked concurrently on a single result.
+
+    :param rule_sets: Applied rule sets
+    :param results: Result of each set, CANCELLED for the sets that were cancelled or skipped
+    :param fail_fast: Run on fail fast mode
+    :return ValidationResult: Result of the validation
+    """
+
+    reported = []
+
+    for result in results:
+        if result is CANCELLED or (result.ok and not result.skipped_rules):
+            continue
+
+        reported.append(result)
+
+        if fail_fast and not result.ok:
+            break
+
+    if fail_fast:
+        return reported[0] if len(reported) == 1 and not reported[0].ok else ValidationResult.combine(reported)
+
+    skipped = (rule_set.name for rule_set, result in zip(rule_sets, results) if result is CANCELLED)
+
+    return ValidationResult.combine(reported, False, tuple(skipped))
+
+
+class RoutingIndex:
+    """Index of the rule sets scheduled by a Ruler by the kind of data they match. The sets that match a pair of
+    field path and value are indexed by the value on a dict for each path, so routing the data takes one lookup for
+    each distinct path, whatever the number of sets. The predicates of the sets that match a predicate function are
+    called with each data. The routes are cached by the values of the paths and the outcome of the predicates, with
+    the analysis of the field values shared by their sets.
+
+    :param layers: Scheduled layers of rule sets, each set only depends on sets of the previous layers
+    """
+
+    __slots__ = ('_layers', '_order', '_always', '_parts', '_indexes', '_predicates', '_routes')
+
+    _layers: Tuple[Tuple[RuleSet, ...], ...]
+    _order: Tuple[RuleSet, ...]
+    _always: Set[AnyStr]
+    _parts: Tuple[Tuple[AnyStr, ...], ...]
+    _indexes: Tuple[Dict[Hashable, Set[AnyStr]], ...]
+    _predicates: Tuple[Tuple[AnyStr, Any], ...]
+    _routes: Dict[Hashable, Route]
+
+    def __init__(self, layers: Tuple[Tuple[RuleSet, ...], ...]):
+        indexes = dict()
+        predicates = []
+
+        self._layers = layers
+        self._order = tuple(rule_set for layer in layers for rule_set in layer)
+        self._always = set()
+
+        for rule_set in self._order:
+            if rule_set.match is None:
+                self._always.add(rule_set.name)
+            elif callable(rule_set.match):
+                predicates.append((rule_set.name, rule_set.match))
+            else:
+                path, values = rule_set.match
+                index = indexes.setdefault(path, dict())
+
+                for value in values if isinstance(values, (list, tuple, set, frozenset)) else (values, ):
+                    index.setdefault(value, set()).add(rule_set.name)
+
+        self._parts = tuple(split_path(path) for path in indexes)
+        self._indexes = tuple(indexes.values())
+        self._predicates = tuple(predicates)
+        self._routes = dict()
+
+    def route(self, data: Any) -> Route:
+        """Get the rule sets that match the data and the sets they depend on.
+
+        :param data: Data to be validated
+        :return: Rule sets to be applied on their execution order, the same rule sets grouped on layers and whether
+            they share field values
+        """
+
+        key = tuple(traverse(data, parts) for parts in self._parts)
+
+        if self._predicates:
+            key += tuple(bool(predicate(data)) for _, predicate in self._predicates)
+
+        try:
+            route = self._routes.get(key)
+        except TypeError:
+            return self._build(key)
+
+        if route is None:
+            route = self._build(key)
+
+            if len(self._routes) >= ROUTE_CACHE_SIZE:
+                self._routes = dict()
+
+            self._routes[key] = route
+
+        return route
+
+    def affected_by(self, changed_fields: Iterable[AnyStr]) -> bool:
+        """Tells if a change of some fields of the data can change the rule sets it is routed to.
+
+        :param changed_fields: Dotted paths of the changed fields
+        :return bool: Assertion
+        """
+
+        if self._predicates:
+            return True
+
+        paths = ['.'.join(parts) for parts in self._parts]
+
+        return any(overlaps(path, changed) for changed in changed_fields for path in paths)
+
+    def _build(self, key: Tuple[Any, ...]) -> Route:
+        """Select the rule sets of a route.
+
+        :param key: Values of the indexed paths followed by the outcome of the predicates
+        :return: Rule sets to be applied on their execution order, the same rule sets grouped on layers and whether
+            they share field values
+        """
+
+        names = set(self._always)
+
+        for index, value in zip(self._indexes, key):
+            try:
+                names.update(index.get(value, ()))
+            except TypeError:
+                continue
+
+        for (name, _), matches in zip(self._predicates, key[len(self._indexes):]):
+            if matches:
+                names.add(name)
+
+        for rule_set in reversed(self._order):
+            if rule_set.name in names:
+                names.update(rule_set.depends_on)
+
+        layers: List[Tuple[RuleSet, ...]] = []
+
+        for layer in self._layers:
+            selected = tuple(rule_set for rule_set in layer if rule_set.name in names)
+
+            if selected:
+                layers.append(selected)
+
+        order = tuple(rule_set for layer in layers for rule_set in layer)
+
+        return order, tuple(layers), shares_fields(order)
+
+
+def routing_index(layers: Sequence[Tuple[RuleSet, ...]]) -> Optional[RoutingIndex]:
+    """Build the routing index of the scheduled rule sets, or None when all the sets apply to all the data.
+
+    :param layers: Scheduled layers of rule sets
+    :return Optional[RoutingIndex]: Routing index
+    """
+
+    if all(rule_set.match is None for layer in layers for rule_set in layer):
+        return None
+
+    return RoutingIndex(tuple(layers))
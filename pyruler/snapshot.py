@@ -0,0 +1,255 @@
+"""Binary snapshots of configured rulers with lazy loading of the rule sets."""
+
+import copy
+import os
+import pickle
+import struct
+import zlib
+from contextlib import contextmanager
+from threading import Lock
+from typing import IO, Any, AnyStr, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .errors import RulerConfigError
+from .metrics import Metrics
+from .ruleset import RuleSet
+
+MAGIC = b'PYRULER'
+VERSION = 1
+
+_HEADER = struct.Struct('>7sBQ')
+
+
+class LazyRuleSet:  # pylint: disable=too-many-instance-attributes
+    """Rule set of a snapshot that is only unpickled the first time the Ruler applies it. It carries the scheduling
+    configuration of the set, so a Ruler can order and route its rule sets without loading their rules.
+
+    :param name: Name of the rule set
+    :param config: Priority, cost, dependencies and match of the rule set
+    :param payload: Compressed pickle of the rule set
+    """
+
+    __slots__ = ('_name', '_priority', '_cost', '_depends_on', '_match', '_payload', '_rule_set', '_metrics', '_lock')
+
+    _name: AnyStr
+    _priority: int
+    _cost: float
+    _depends_on: Tuple[AnyStr, ...]
+    _match: Optional[Union[Callable[[Any], bool], Tuple[AnyStr, Any]]]
+    _payload: bytes
+    _rule_set: Optional[RuleSet]
+    _metrics: Optional[Metrics]
+    _lock: Lock
+
+    def __init__(self, name: AnyStr, config: Tuple[Any, ...], payload: bytes):
+        self._name = name
+        self._priority, self._cost, self._depends_on, self._match = config
+        self._payload = payload
+        self._rule_set = None
+        self._metrics = None
+        self._lock = Lock()
+
+    @property
+    def name(self) -> AnyStr:
+        """Name of the rule set.
+
+        :return AnyStr: Set name
+        """
+
+        return self._name
+
+    @property
+    def priority(self) -> int:
+        """Priority of the rule set.
+
+        :return int: Set priority
+        """
+
+        return self._priority
+
+    @property
+    def cost(self) -> float:
+        """Relative cost hint of the rule set.
+
+        :return float: Set cost
+        """
+
+        return self._cost
+
+    @property
+    def depends_on(self) -> Tuple[AnyStr, ...]:
+        """Names of the sets that should pass before the rule set is applied.
+
+        :return Tuple[AnyStr, ...]: Set names
+        """
+
+        return self._depends_on
+
+    @property
+    def match(self) -> Optional[Union[Callable[[Any], bool], Tuple[AnyStr, Any]]]:
+        """Kind of data the rule set applies to.
+
+        :return: Set match or None when the set applies to all the data
+        """
+
+        return self._match
+
+    @property
+    def payload(self) -> bytes:
+        """Compressed pickle of the rule set.
+
+        :return bytes: Pickled rule set
+        """
+
+        return self._payload
+
+    @property
+    def loaded(self) -> bool:
+        """Tells if the rules of the set were already unpickled.
+
+        :return bool: Assertion
+        """
+
+        return self._rule_set is not None
+
+    def load(self) -> RuleSet:
+        """Unpickle the rule set and compile its execution plan, only the first time it is called.
+
+        :return RuleSet: Loaded rule set
+        """
+
+        rule_set = self._rule_set
+
+        if rule_set is not None:
+            return rule_set
+
+        with self._lock:
+            if self._rule_set is None:
+                rule_set = pickle.loads(zlib.decompress(self._payload))
+
+                if self._metrics is not None:
+                    rule_set.instrument(self._metrics)
+
+                rule_set.compile()
+                self._rule_set = rule_set
+
+            return self._rule_set
+
+    def instrument(self, metrics: Optional[Metrics]) -> None:
+        """Record the executions of the rule set on the given metrics registry once it is loaded.
+
+        :param metrics: Metrics registry or None to disable the instrumentation
+        """
+
+        with self._lock:
+            self._metrics = metrics
+
+            if self._rule_set is not None:
+                self._rule_set.instrument(metrics)
+
+
+def materialize(rule_set: Union[RuleSet, LazyRuleSet]) -> RuleSet:
+    """Get the rule set object of a configured rule set, loading it when it comes from a snapshot.
+
+    :param rule_set: Configured rule set
+    :return RuleSet: Rule set object
+    """
+
+    return rule_set.load() if isinstance(rule_set, LazyRuleSet) else rule_set
+
+
+def copy_rule_set(rule_set: Union[RuleSet, LazyRuleSet]) -> Union[RuleSet, LazyRuleSet]:
+    """Copy a configured rule set with its rules, without loading it when it comes from a snapshot.
+
+    :param rule_set: Configured rule set
+    :return: Independent copy of the rule set
+    """
+
+    if isinstance(rule_set, LazyRuleSet):
+        return LazyRuleSet(rule_set.name, (rule_set.priority, rule_set.cost, rule_set.depends_on, rule_set.match),
+                           rule_set.payload)
+
+    return copy.deepcopy(rule_set)
+
+
+def write_snapshot(file: Union[AnyStr, os.PathLike, IO[bytes]], rule_sets: Iterable[Any], label: AnyStr) -> None:
+    """Write a snapshot of rule sets. The sets of a loaded snapshot that were not applied are copied without being
+    unpickled.
+
+    :param file: Path or binary file object
+    :param rule_sets: RuleSet or LazyRuleSet objects on their configuration order
+    :param label: Name of the ruler on the recorded metrics
+    :raises RuleConfigError: When some rule can't be pickled
+    :raises RuleSetConfigError: When the match of some rule set can't be pickled
+    """
+
+    entries = []
+    payloads = []
+
+    for rule_set in rule_sets:
+        if isinstance(rule_set, LazyRuleSet):
+            payload = rule_set.payload
+        else:
+            rule_set.check_picklable()
+            payload = zlib.compress(pickle.dumps(rule_set, pickle.HIGHEST_PROTOCOL))
+
+        config = (rule_set.priority, rule_set.cost, rule_set.depends_on, rule_set.match)
+        entries.append((rule_set.name, config, len(payload)))
+        payloads.append(payload)
+
+    index = pickle.dumps({'label': label, 'sets': entries}, pickle.HIGHEST_PROTOCOL)
+
+    with _open(file, 'wb') as stream:
+        stream.write(_HEADER.pack(MAGIC, VERSION, len(index)))
+        stream.write(index)
+
+        for payload in payloads:
+            stream.write(payload)
+
+
+def read_snapshot(file: Union[AnyStr, os.PathLike, IO[bytes]]) -> Tuple[AnyStr, List[LazyRuleSet]]:
+    """Read a snapshot of rule sets without unpickling their rules.
+
+    :param file: Path or binary file object
+    :return: Name of the ruler on the recorded metrics and the lazy rule sets on their configuration order
+    :raises RulerConfigError: When the file is not a snapshot of a supported version
+    """
+
+    with _open(file, 'rb') as stream:
+        content = stream.read()
+
+    if len(content) < _HEADER.size:
+        raise RulerConfigError('File is not a pyruler snapshot')
+
+    magic, version, size = _HEADER.unpack_from(content)
+
+    if magic != MAGIC:
+        raise RulerConfigError('File is not a pyruler snapshot')
+
+    if version != VERSION:
+        raise RulerConfigError(f'Snapshot version {version} is not supported, expected version {VERSION}')
+
+    offset = _HEADER.size + size
+    index = pickle.loads(content[_HEADER.size:offset])
+    rule_sets = []
+
+    for name, config, length in index['sets']:
+        rule_sets.append(LazyRuleSet(name, config, content[offset:offset + length]))
+        offset += length
+
+    return index['label'], rule_sets
+
+
+@contextmanager
+def _open(file: Union[AnyStr, os.PathLike, IO[bytes]], mode: AnyStr) -> Iterator[IO[bytes]]:
+    """Open a path, or use an already open binary file without closing it.
+
+    :param file: Path or binary file object
+    :param mode: Mode used to open paths
+    :return: Binary file object
+    """
+
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, mode) as stream:  # pylint: disable=unspecified-encoding
+            yield stream
+    else:
+        yield file
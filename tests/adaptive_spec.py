@@ -0,0 +1,146 @@
+"""AdaptiveOrder unit testing."""
+
+from threading import Event, Thread
+
+from expects import equal, expect
+from mamba import description, it
+
+from pyruler import AdaptiveOrder, Rule, RuleSet
+from pyruler.errors import RuleSetConfigError
+
+
+def slow_pass(_):
+    """Resolver that always passes spending some time."""
+    return sum(range(2000)) > 0
+
+
+with description('Should test adaptive rule ordering') as self:
+    with it('moves cheap failing rules first'):
+        adaptive = AdaptiveOrder(interval=10, decay=0.5)
+        rule_set = RuleSet(name='set1', adaptive=adaptive)
+
+        rule_set.add_many([
+            Rule(name='slow', resolver=slow_pass),
+            Rule(name='fails', resolver=lambda x: x > 0),
+        ])
+
+        for _ in range(10):
+            rule_set.check(-1)
+
+        expect([stats['name'] for stats in rule_set.adaptive_stats()]).to(equal(['fails', 'slow']))
+        expect(rule_set.check(-1).rule_names).to(equal(('fails', )))
+
+    with it('keeps order sensitive rules on their position'):
+        rule_set = RuleSet(name='set1', adaptive=AdaptiveOrder(interval=5))
+
+        rule_set.add_many([
+            Rule(name='has-value', resolver=lambda x: 'value' in x, order_sensitive=True),
+            Rule(name='slow', resolver=slow_pass),
+            Rule(name='positive', resolver=lambda x: x['value'] > 0),
+        ])
+
+        for _ in range(5):
+            rule_set.check({'value': -1})
+
+        expect([stats['name'] for stats in rule_set.adaptive_stats()]).to(equal(['has-value', 'positive', 'slow']))
+        expect(rule_set.check({}).rule_names).to(equal(('has-value', )))
+
+    with it('reports failing positions on batches'):
+        rule_set = RuleSet(name='set1', adaptive=True)
+
+        rule_set.add_many([
+            Rule(name='gt-0', resolver=lambda x: x > 0),
+            Rule(name='lt-10', resolver=lambda x: x < 10),
+        ])
+
+        expect(rule_set.apply_many([5, -1, 20])).to(equal([(), (0, ), (1, )]))
+
+    with it('tracks the statistics of new rules'):
+        rule_set = RuleSet(name='set1', adaptive=True)
+
+        rule_set.add_rule(Rule(name='gt-0', resolver=lambda x: x > 0))
+        rule_set.check(1)
+        rule_set.add_rule(Rule(name='lt-10', resolver=lambda x: x < 10))
+        rule_set.check(1)
+
+        stats = {stats['name']: stats['samples'] for stats in rule_set.adaptive_stats()}
+
+        expect(stats).to(equal({'gt-0': 2, 'lt-10': 1}))
+
+    with it('keeps running on its plan when the set is reloaded during the execution'):
+        rule_set = RuleSet(name='set1', adaptive=AdaptiveOrder(interval=3))
+
+        def shrink(_):
+            rule_set.remove_rule('fails')
+            rule_set.remove_rule('gt-0')
+            rule_set.compile()
+            return True
+
+        rule_set.add_many([
+            Rule(name='shrink', resolver=shrink, order_sensitive=True),
+            Rule(name='gt-0', resolver=lambda x: x > 0),
+            Rule(name='fails', resolver=lambda x: False),
+        ])
+
+        expect(rule_set.check(1).rule_names).to(equal(('fails', )))
+        expect([(stats['name'], stats['samples']) for stats in rule_set.adaptive_stats()]).to(equal([('shrink', 1)]))
+
+    with it('runs the rules while other thread reloads the set'):
+        rule_set = RuleSet(name='set1', adaptive=AdaptiveOrder(interval=3))
+        rule_set.add_many(Rule(name=f'rule-{index}', resolver=lambda x: x > 0) for index in range(8))
+        extra = [Rule(name=f'extra-{index}', resolver=lambda x: x > 0) for index in range(200)]
+        stop = Event()
+        errors = []
+
+        def reload():
+            while not stop.is_set():
+                rule_set.add_many(extra)
+                rule_set.compile()
+
+                for rule in extra:
+                    rule_set.remove_rule(rule.name)
+
+                rule_set.compile()
+
+        def validate():
+            try:
+                for _ in range(2000):
+                    if not rule_set.check(1).ok:
+                        errors.append('failed')
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        reloader = Thread(target=reload)
+        validators = [Thread(target=validate) for _ in range(3)]
+        reloader.start()
+
+        for thread in validators:
+            thread.start()
+
+        for thread in validators:
+            thread.join()
+
+        stop.set()
+        reloader.join()
+
+        expect(errors).to(equal([]))
+
+    with it('checks for error when an adaptive order is used by many sets'):
+        adaptive = AdaptiveOrder()
+        RuleSet(name='set1', adaptive=adaptive)
+
+        try:
+            RuleSet(name='set2', adaptive=adaptive)
+            assert False
+        except RuleSetConfigError as error:
+            expect(error.args[0]).to(
+                equal("AdaptiveOrder is already used by RuleSet 'set1', each RuleSet needs its own instance"))
+
+    with it('raises error for stats of non adaptive sets'):
+        rule_set = RuleSet(name='set1')
+
+        try:
+            rule_set.adaptive_stats()
+            assert False
+        except RuleSetConfigError as error:
+            expect(error.args[0]).to(equal('RuleSet set1 is not running on adaptive mode'))
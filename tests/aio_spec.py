@@ -0,0 +1,147 @@
+"""Asyncio support unit testing."""
+
+import asyncio
+
+from expects import be_a, equal, expect
+from mamba import description, it
+
+from pyruler import Metrics, Rule, Ruler, RuleSet
+from pyruler.errors import RuleConfigError, RuleError
+
+
+def async_rule(name, result, delay=0.0, events=None):
+    """Create a rule with an async resolver that records its start, finish and cancellation."""
+
+    async def resolver(_):
+        if events is not None:
+            events.append(f'{name}:start')
+
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if events is not None:
+                events.append(f'{name}:cancelled')
+            raise
+
+        if events is not None:
+            events.append(f'{name}:end')
+
+        return result
+
+    return Rule(name=name, resolver=resolver)
+
+
+with description('Should test async rules') as self:
+    with it('executes async rules'):
+        rule = async_rule('rule1', True)
+
+        expect(rule.is_async).to(equal(True))
+        expect(asyncio.run(rule.execute_async({}))).to(equal(True))
+        expect(asyncio.run(Rule(name='rule2', resolver=lambda x: False).execute_async({}))).to(equal(False))
+
+    with it('raises config error executing async rules synchronously'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(async_rule('rule1', True))
+
+        try:
+            rule_set.apply({})
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleConfigError))
+            expect(error.args[0]).to(equal("Rule 'rule1' has an async resolver and should be applied with apply_async"))
+
+    with it('runs async rules concurrently'):
+        events = []
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([async_rule('rule1', True, 0.02, events), async_rule('rule2', True, 0.01, events)])
+
+        result = asyncio.run(rule_set.check_async({}))
+
+        expect(result.ok).to(equal(True))
+        expect(events).to(equal(['rule1:start', 'rule2:start', 'rule2:end', 'rule1:end']))
+
+    with it('runs sync rules inline before scheduling the async rules'):
+        events = []
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([async_rule('rule1', True, 0, events), Rule(name='rule2', resolver=lambda x: False)])
+
+        result = asyncio.run(rule_set.check_async({}))
+
+        expect(result.rule_names).to(equal(('rule2', )))
+        expect(events).to(equal([]))
+
+    with it('cancels pending rules on fail fast mode'):
+        events = []
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([async_rule('slow', True, 1, events), async_rule('fails', False, 0.01, events)])
+
+        result = asyncio.run(rule_set.check_async({}))
+
+        expect(result.rule_names).to(equal(('fails', )))
+        expect(events).to(equal(['slow:start', 'fails:start', 'fails:end', 'slow:cancelled']))
+
+    with it('collects all the failing rules in order'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([
+            async_rule('rule1', False, 0.02),
+            Rule(name='rule2', resolver=lambda x: False),
+            async_rule('rule3', False, 0.01),
+        ])
+
+        result = asyncio.run(rule_set.check_async({}, fail_fast=False))
+
+        expect(result.rule_names).to(equal(('rule1', 'rule2', 'rule3')))
+
+    with it('raises rule errors applying async sets'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(async_rule('rule1', False))
+
+        try:
+            asyncio.run(rule_set.apply_async({}))
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleError))
+            expect(error.args[0]).to(equal("Rule 'rule1' fail"))
+
+    with it('applies the sets of a ruler concurrently'):
+        events = []
+        set1 = RuleSet(name='set1')
+        set1.add_rule(async_rule('rule1', True, 1, events))
+
+        set2 = RuleSet(name='set2')
+        set2.add_rule(async_rule('rule2', False, 0.01, events))
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2])
+
+        result = asyncio.run(ruler.check_async({}, sets=['set1', 'set2']))
+
+        expect(result.rule_names).to(equal(('rule2', )))
+        expect('rule1:cancelled' in events).to(equal(True))
+
+        try:
+            asyncio.run(ruler.apply_async({}, sets='set2', fail_fast=False))
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Rules '['rule2']' fail"))
+
+    with it('records async rule metrics'):
+        metrics = Metrics()
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(async_rule('rule1', True))
+        rule_set.instrument(metrics)
+
+        asyncio.run(rule_set.check_async({}))
+
+        expect(metrics.snapshot()['rules']['set1']['rule1']['calls']).to(equal(1))
+        expect(metrics.snapshot()['sets']['set1']['calls']).to(equal(1))
+
+    with it('rejects caches for async resolvers'):
+        async def resolver(_):
+            return True
+
+        try:
+            Rule(name='rule1', resolver=resolver, cache=object())
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleConfigError))
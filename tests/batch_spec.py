@@ -0,0 +1,59 @@
+"""Compact batch reports unit testing."""
+
+from expects import be_none, equal, expect
+from mamba import description, it
+
+from pyruler import BatchReport, Rule, RuleSet
+
+error = AssertionError('custom error')
+
+
+def build_report():
+    """Build a report of two sets with some failing records."""
+
+    set1 = RuleSet(name='set1')
+    set1.add_many([
+        Rule(name='rule1', resolver=lambda x: True, error=error),
+        Rule(name='rule2', resolver=lambda x: True),
+    ])
+    set2 = RuleSet(name='set2')
+    set2.add_rule(Rule(name='rule3', resolver=lambda x: True))
+
+    report = BatchReport({'set1': set1.compile(), 'set2': set2.compile()}, fail_fast=False)
+
+    for failures in ((), (('set1', (0, 1)), ('set2', (0, ))), (), (('set2', (0, )), ), (('set1', (1, )), )):
+        report.append(failures)
+
+    return report
+
+
+with description('Should test compact batch reports') as self:
+    with it('counts the failing records of each rule'):
+        report = build_report()
+
+        expect(report.size).to(equal(5))
+        expect(report.failed).to(equal(3))
+        expect(report.ok).to(equal(False))
+        expect(report.counts()).to(equal({('set1', 'rule1'): 1, ('set1', 'rule2'): 2, ('set2', 'rule3'): 2}))
+        expect(list(report.positions('set1', 'rule2'))).to(equal([1, 4]))
+        expect(list(report.positions('set1', 'missing'))).to(equal([]))
+        expect(report.nbytes).to(equal(5 * report.positions('set2', 'rule3').itemsize))
+
+    with it('builds the result of a single record'):
+        report = build_report()
+
+        result = report.row(1)
+
+        expect(result.rule_names).to(equal(('rule1', 'rule2', 'rule3')))
+        expect(result.set_names).to(equal(('set1', 'set1', 'set2')))
+        expect(result.errors).to(equal((error, None, None)))
+        expect(result.fail_fast).to(equal(False))
+        expect(report.row(0).ok).to(equal(True))
+        expect(report.row(0).exception()).to(be_none)
+        expect(report.row(3).rule_names).to(equal(('rule3', )))
+
+        try:
+            report.row(5)
+            assert False
+        except IndexError as index_error:
+            expect(index_error.args[0]).to(equal('Record 5 is out of a batch of 5 records'))
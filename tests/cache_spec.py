@@ -0,0 +1,72 @@
+"""RuleCache unit testing."""
+
+from time import sleep
+
+from expects import equal, expect
+from mamba import description, it
+
+from pyruler import Rule, RuleCache, RuleSet
+
+with description('Should test pure rules memoization') as self:
+    with it('caches the results by the extracted key'):
+        calls = []
+        rule = Rule(
+            name='known-country',
+            resolver=lambda x: calls.append(x['country']) or x['country'] in {'MX', 'US'},
+            cache=RuleCache(key=lambda x: x['country']),
+        )
+
+        expect(rule.execute({'country': 'MX', 'id': 1})).to(equal(True))
+        expect(rule.execute({'country': 'MX', 'id': 2})).to(equal(True))
+        expect(rule.execute({'country': 'BR', 'id': 3})).to(equal(False))
+
+        expect(calls).to(equal(['MX', 'BR']))
+        expect(rule.cache.stats()).to(equal({'hits': 1, 'misses': 2, 'size': 2, 'max_size': 1024}))
+
+    with it('evicts the least recently used results'):
+        cache = RuleCache(key=lambda x: x, size=2)
+        rule = Rule(name='positive', resolver=lambda x: x > 0, cache=cache)
+
+        rule.execute(1)
+        rule.execute(2)
+        rule.execute(1)
+        rule.execute(3)
+        rule.execute(1)
+
+        expect(len(cache)).to(equal(2))
+        expect(cache.hits).to(equal(2))
+        expect(cache.misses).to(equal(3))
+
+    with it('expires the results after the time to live'):
+        cache = RuleCache(key=lambda x: x, ttl=0.01)
+        rule = Rule(name='positive', resolver=lambda x: x > 0, cache=cache)
+
+        rule.execute(1)
+        sleep(0.02)
+        rule.execute(1)
+
+        expect(cache.misses).to(equal(2))
+
+    with it('invalidates the cached results'):
+        cache = RuleCache(key=lambda x: x)
+        rule = Rule(name='positive', resolver=lambda x: x > 0, cache=cache)
+
+        rule.execute(1)
+        rule.execute(2)
+        cache.invalidate(1)
+
+        expect(len(cache)).to(equal(1))
+
+        cache.invalidate()
+
+        expect(len(cache)).to(equal(0))
+
+    with it('uses the cache from the rule set execution plan'):
+        cache = RuleCache(key=lambda x: x['currency'])
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='known-currency', resolver=lambda x: x['currency'] == 'USD', cache=cache))
+
+        rule_set.apply_many([{'currency': 'USD'}, {'currency': 'USD'}, {'currency': 'EUR'}])
+
+        expect(cache.hits).to(equal(1))
+        expect(cache.misses).to(equal(2))
@@ -0,0 +1,90 @@
+"""Unit testing for ColumnRule objects."""
+
+from expects import be_a, contain, equal, expect
+from mamba import description, it
+
+from pyruler import ColumnRule, Rule, RuleSet, column_rule
+from pyruler.column_rule import numpy
+from pyruler.errors import RuleConfigError, RuleSetConfigError, RuleSetError
+
+with description('Should test ColumnRule configuration') as self:
+    with it('executes a vectorized rule'):
+        rule = ColumnRule(name='gt-0', resolver=lambda c: c['amount'] > 0)
+
+        mask = rule.execute({'amount': numpy.array([1, -1, 3])})
+
+        expect(mask.tolist()).to(equal([True, False, True]))
+
+    with it('applies column rules to a set'):
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            ColumnRule(name='gt-0', resolver=lambda c: c['amount'] > 0),
+            ColumnRule(name='lt-10', resolver=lambda c: c['amount'] < 10),
+            ColumnRule(name='has-currency', resolver=lambda c: c['currency'] != ''),
+        ])
+
+        result = rule_set.apply_columns({
+            'amount': numpy.array([1, -1, 30, 5]),
+            'currency': numpy.array(['USD', 'EUR', 'USD', '']),
+        })
+
+        expect(result.ok).to(equal(False))
+        expect(result.mask.tolist()).to(equal([True, False, False, False]))
+        expect(result.failing_rows.tolist()).to(equal([1, 2, 3]))
+        expect(result.failures['gt-0'].tolist()).to(equal([1]))
+        expect(result.failures['lt-10'].tolist()).to(equal([2]))
+        expect(result.failures['has-currency'].tolist()).to(equal([3]))
+
+    with it('stops the evaluation when every row failed'):
+        calls = []
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            ColumnRule(name='gt-0', resolver=lambda c: c['amount'] > 0),
+            ColumnRule(name='lt-10', resolver=lambda c: calls.append(1) or c['amount'] < 10),
+        ])
+
+        result = rule_set.apply_columns({'amount': numpy.array([-1, -2])})
+
+        expect(calls).to(equal([]))
+        expect(list(result.failures.keys())).to(equal(['gt-0']))
+
+    with it('raises config error for non column rules'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+
+        try:
+            rule_set.apply_columns({'amount': numpy.array([1])})
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleSetConfigError))
+            expect(error.args[0]).to(equal("Rule 'rule1' can't be applied over columns"))
+
+    with it('raises error for columns with different sizes'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(ColumnRule(name='gt-0', resolver=lambda c: c['a'] > 0))
+
+        try:
+            rule_set.apply_columns({'a': numpy.array([1]), 'b': numpy.array([1, 2])})
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleSetError))
+            expect(error.args[0]).to(equal('Columns should have the same size, got sizes [1, 2]'))
+
+    with it('raises config error when numpy is not installed'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(ColumnRule(name='gt-0', resolver=lambda c: c['a'] > 0))
+        column_rule.numpy = None
+
+        try:
+            for build, error_type in ((lambda: ColumnRule(name='lt-10'), RuleConfigError),
+                                      (lambda: rule_set.apply_columns({'a': [1]}), RuleSetConfigError)):
+                try:
+                    build()
+                    assert False
+                except Exception as error:
+                    expect(error).to(be_a(error_type))
+                    expect(error.args[0]).to(contain('requires numpy to be installed', 'pyruler[numpy]'))
+        finally:
+            column_rule.numpy = numpy
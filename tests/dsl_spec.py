@@ -0,0 +1,60 @@
+"""Rule expressions unit testing."""
+
+from expects import be_a, equal, expect
+from mamba import description, it
+
+from pyruler import Rule, RuleSet
+from pyruler.dsl import compile_expression
+from pyruler.errors import RuleConfigError
+
+with description('Should test rule expressions') as self:
+    with it('compiles expressions to rules'):
+        rule = Rule.expression('amount > 0 and currency in {"USD", "EUR"}')
+
+        expect(rule.name).to(equal('amount > 0 and currency in {"USD", "EUR"}'))
+        expect(rule.reads).to(equal(('amount', 'currency')))
+        expect(rule.execute({'amount': 10, 'currency': 'USD'})).to(equal(True))
+        expect(rule.execute({'amount': 10, 'currency': 'MXN'})).to(equal(False))
+
+    with it('reads nested fields'):
+        rule = Rule.expression('user.age >= 18 or user.guardian != None', name='adult')
+
+        expect(rule.name).to(equal('adult'))
+        expect(rule.reads).to(equal(('user.age', 'user.guardian')))
+        expect(rule.execute({'user': {'age': 20}})).to(equal(True))
+        expect(rule.execute({'user': {'age': 10, 'guardian': 'someone'}})).to(equal(True))
+        expect(rule.execute({'user': {'age': 10}})).to(equal(False))
+
+    with it('evaluates invalid operations as false'):
+        rule = Rule.expression('total / items > 10')
+
+        expect(rule.execute({'total': 100, 'items': 0})).to(equal(False))
+        expect(rule.execute({'items': 1})).to(equal(False))
+        expect(rule.execute({'total': 100, 'items': 2})).to(equal(True))
+
+    with it('caches compiled functions by expression text'):
+        expect(compile_expression('amount > 1')[0] is compile_expression('amount > 1')[0]).to(equal(True))
+
+    with it('rejects not allowed expressions'):
+        for expression in ('__import__("os").system("ls")', 'amount[0] > 1', 'lambda: 1'):
+            try:
+                Rule.expression(expression)
+                assert False
+            except Exception as error:
+                expect(error).to(be_a(RuleConfigError))
+
+    with it('rejects invalid syntax'):
+        try:
+            Rule.expression('amount >')
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleConfigError))
+            expect(error.args[0]).to(equal("Invalid rule expression 'amount >': invalid syntax"))
+
+    with it('adds expression rules to a set'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([Rule.expression('amount > 0'), Rule.expression('currency == "USD"')])
+
+        result = rule_set.check({'amount': -1, 'currency': 'USD'}, fail_fast=False)
+
+        expect(result.rule_names).to(equal(('amount > 0', )))
@@ -0,0 +1,184 @@
+"""Declarative field rules unit testing."""
+
+from expects import be_a, equal, expect
+from mamba import description, it
+
+from pyruler import Rule, Ruler, RuleSet
+from pyruler.errors import RuleConfigError
+from pyruler.fields import MISSING, ReadsIndex, split_path, traverse
+
+
+class CountingDict(dict):
+    """Dict that counts the lookups of each key."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = {}
+
+    def __getitem__(self, key):
+        self.lookups[key] = self.lookups.get(key, 0) + 1
+        return super().__getitem__(key)
+
+
+class CountingRuleSet(RuleSet):
+    """Rule set that counts the calls to its reads method."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads_calls = 0
+
+    def reads(self):
+        self.reads_calls += 1
+        return super().reads()
+
+
+with description('Should test declarative field rules') as self:
+    with it('traverses nested mappings, sequences and attributes'):
+        data = {'user': {'emails': ['a@b.com'], 'address': type('Address', (), {'country': 'MX'})()}}
+
+        expect(traverse(data, split_path('user.emails.0'))).to(equal('a@b.com'))
+        expect(traverse(data, split_path('user.address.country'))).to(equal('MX'))
+        expect(traverse(data, split_path('user.phone'))).to(equal(MISSING))
+        expect(traverse(data, split_path('user.emails.3'))).to(equal(MISSING))
+
+    with it('builds rules from a path and an operator'):
+        rule = Rule.field('user.age', '>=', 18)
+
+        expect(rule.name).to(equal('user.age >= 18'))
+        expect(rule.reads).to(equal(('user.age', )))
+        expect(rule.execute({'user': {'age': 20}})).to(equal(True))
+        expect(rule.execute({'user': {'age': 10}})).to(equal(False))
+        expect(rule.execute({'user': {}})).to(equal(False))
+        expect(rule.execute({'user': {'age': 'unknown'}})).to(equal(False))
+
+    with it('supports membership, regex and presence operators'):
+        expect(Rule.field('currency', 'in', {'USD', 'EUR'}).execute({'currency': 'USD'})).to(equal(True))
+        expect(Rule.field('currency', 'not in', {'USD', 'EUR'}).execute({'currency': 'USD'})).to(equal(False))
+        expect(Rule.field('tags', 'contains', 'vip').execute({'tags': ['vip']})).to(equal(True))
+        expect(Rule.field('email', 'matches', r'^\S+@\S+$').execute({'email': 'a@b.com'})).to(equal(True))
+        expect(Rule.field('email', 'exists').execute({})).to(equal(False))
+        expect(Rule.field('email', 'missing', name='no-email').execute({})).to(equal(True))
+
+    with it('raises config error for unknown operators'):
+        try:
+            Rule.field('amount', '=~', 1)
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleConfigError))
+            expect(error.args[0]).to(equal("Operator '=~' is not supported by field rules"))
+
+    with it('extracts each path once per record on a rule set'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([
+            Rule.field('payload', 'exists'),
+            Rule.field('payload', '!=', {}),
+        ])
+
+        data = CountingDict(payload={'a': 1})
+        rule_set.apply(data, fail_fast=False)
+
+        expect(data.lookups).to(equal({'payload': 1}))
+
+    with it('shares extracted paths across the sets of a ruler'):
+        set1 = RuleSet(name='set1')
+        set1.add_rule(Rule.field('payload', 'exists'))
+
+        set2 = RuleSet(name='set2')
+        set2.add_rule(Rule.field('payload', '!=', None))
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2])
+
+        data = CountingDict(payload={'a': 1})
+        ruler.apply(data)
+        ruler.check(data, fail_fast=False)
+        ruler.apply_many([data])
+
+        expect(data.lookups).to(equal({'payload': 3}))
+
+    with it('shares the paths of the rules added to scheduled sets'):
+        set1 = RuleSet(name='set1')
+        set1.add_rule(Rule.field('payload', 'exists'))
+
+        set2 = RuleSet(name='set2')
+        set2.add_rule(Rule.field('other', 'exists'))
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2])
+        ruler.apply({'payload': 1, 'other': 1})
+
+        set2.add_rule(Rule.field('payload', '!=', None))
+
+        data = CountingDict(payload=1, other=1)
+        ruler.apply(data)
+
+        expect(data.lookups).to(equal({'payload': 1, 'other': 1}))
+
+    with it('analyzes the shared paths once per ruler configuration'):
+        set1 = CountingRuleSet(name='set1')
+        set1.add_rule(Rule.field('payload', 'exists'))
+
+        set2 = CountingRuleSet(name='set2', match=('kind', 'payment'))
+        set2.add_rule(Rule.field('payload', '!=', None))
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2])
+
+        for _ in range(3):
+            ruler.apply({'kind': 'payment', 'payload': 1})
+            ruler.check({'kind': 'payment', 'payload': 1}, fail_fast=False, parallel=True)
+            ruler.apply_many([{'kind': 'refund', 'payload': 1}])
+
+        expect((set1.reads_calls, set2.reads_calls)).to(equal((3, 2)))
+
+        ruler.add_set(CountingRuleSet(name='set3'))
+        ruler.apply({'kind': 'payment', 'payload': 1}, sets=['set1'])
+
+        expect(set1.reads_calls).to(equal(4))
+
+    with it('evaluates each guard once per record for all the rules behind it'):
+        calls = []
+        resolved = []
+
+        def has_foo(data):
+            calls.append(data)
+            return data.get('foo')
+
+        def resolver(data):
+            resolved.append(data)
+            return False
+
+        set1 = RuleSet(name='set1')
+        set1.add_many([Rule(name='rule1', resolver=resolver, when=has_foo),
+                       Rule(name='rule2', resolver=resolver, when=has_foo)])
+
+        set2 = RuleSet(name='set2')
+        set2.add_many([Rule(name='rule3', resolver=resolver, when=has_foo),
+                       Rule.field('payload', 'exists', when='foo')])
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2])
+
+        expect(ruler.check({'payload': 1}, fail_fast=False).ok).to(equal(True))
+        expect(calls).to(equal([{'payload': 1}]))
+        expect(resolved).to(equal([]))
+
+        calls.clear()
+        result = ruler.check({'foo': 1}, fail_fast=False)
+
+        expect(result.rule_names).to(equal(('rule1', 'rule2', 'rule3', 'payload exists')))
+        expect(len(calls)).to(equal(1))
+        expect(len(resolved)).to(equal(3))
+
+        calls.clear()
+        set1.check({'foo': 1})
+        expect(len(calls)).to(equal(1))
+
+    with it('finds the rules affected by a change of some fields'):
+        index = ReadsIndex([('user.id', ), ('user', 'amount'), None, ('order.lines.0.price', )])
+
+        expect(index.affected(['user'])).to(equal({0, 1, 2}))
+        expect(index.affected(['user.id.type'])).to(equal({0, 1, 2}))
+        expect(index.affected(['user.name'])).to(equal({1, 2}))
+        expect(index.affected(['order'])).to(equal({2, 3}))
+        expect(index.affected(['currency'])).to(equal({2}))
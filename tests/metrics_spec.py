@@ -0,0 +1,121 @@
+"""Metrics unit testing."""
+
+from expects import contain, equal, expect
+from mamba import description, it
+
+from pyruler import Metrics, Rule, Ruler, RuleSet
+
+
+def build_ruler():
+    """Create a ruler with one set and two rules."""
+
+    rule_set = RuleSet(name='set1')
+    rule_set.add_many([
+        Rule(name='has-foo', resolver=lambda x: 'foo' in x),
+        Rule(name='has-bar', resolver=lambda x: 'bar' in x),
+    ])
+
+    ruler = Ruler()
+    ruler.add_set(rule_set)
+
+    return ruler, rule_set
+
+
+with description('Should test runtime instrumentation') as self:
+    with it('records rule, set and ruler executions'):
+        metrics = Metrics()
+        ruler, _ = build_ruler()
+
+        ruler.instrument(metrics, label='main')
+        ruler.check({'foo': 1, 'bar': 1})
+        ruler.check({'foo': 1})
+        ruler.check({}, fail_fast=False)
+
+        snapshot = metrics.snapshot()
+
+        expect(snapshot['rulers']['main']['calls']).to(equal(3))
+        expect(snapshot['rulers']['main']['failed']).to(equal(2))
+        expect(snapshot['sets']['set1']['passed']).to(equal(1))
+        expect(snapshot['rules']['set1']['has-foo']['failed']).to(equal(1))
+        expect(snapshot['rules']['set1']['has-bar']['calls']).to(equal(3))
+        expect(snapshot['rules']['set1']['has-bar']['latency']['buckets']['+Inf']).to(equal(3))
+
+    with it('records failing apply calls'):
+        metrics = Metrics()
+        ruler, _ = build_ruler()
+
+        ruler.instrument(metrics)
+
+        try:
+            ruler.apply({})
+            assert False
+        except Exception:
+            pass
+
+        expect(metrics.snapshot()['rulers']['default']['failed']).to(equal(1))
+
+    with it('records batch executions'):
+        metrics = Metrics()
+        ruler, _ = build_ruler()
+
+        ruler.instrument(metrics)
+        ruler.apply_many([{'foo': 1, 'bar': 1}, {}])
+
+        snapshot = metrics.snapshot()
+
+        expect(snapshot['rulers']['default']['calls']).to(equal(2))
+        expect(snapshot['sets']['set1']['failed']).to(equal(1))
+        expect(snapshot['rules']['set1']['has-foo']['calls']).to(equal(2))
+
+    with it('instruments sets added after the ruler'):
+        metrics = Metrics()
+        ruler = Ruler()
+        ruler.instrument(metrics)
+
+        rule_set = RuleSet(name='set2')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+        ruler.add_set(rule_set)
+        ruler.check({})
+
+        expect(metrics.snapshot()['sets']['set2']['calls']).to(equal(1))
+
+    with it('removes the instrumentation'):
+        metrics = Metrics()
+        ruler, rule_set = build_ruler()
+
+        ruler.instrument(metrics)
+        ruler.instrument(None)
+        ruler.check({})
+
+        expect(metrics.snapshot()).to(equal({'rulers': {}, 'sets': {}, 'rules': {}}))
+        expect(rule_set.compile()[0][1].__name__).to(equal('<lambda>'))
+
+    with it('exports prometheus text format'):
+        metrics = Metrics(buckets=(0.5, 1.0))
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule"1', resolver=lambda x: False))
+
+        rule_set.instrument(metrics)
+        rule_set.check({})
+
+        text = metrics.to_prometheus()
+
+        expect(text).to(contain('# TYPE pyruler_set_calls_total counter'))
+        expect(text).to(contain('pyruler_set_failures_total{set="set1"} 1'))
+        expect(text).to(contain('pyruler_rule_calls_total{set="set1",rule="rule\\"1"} 1'))
+        expect(text).to(contain('pyruler_rule_latency_seconds_bucket{set="set1",rule="rule\\"1",le="+Inf"} 1'))
+        expect(text).to(contain('pyruler_rule_latency_seconds_count{set="set1",rule="rule\\"1"} 1'))
+
+    with it('resets the recorded values'):
+        metrics = Metrics()
+        ruler, _ = build_ruler()
+
+        ruler.instrument(metrics)
+        ruler.check({})
+        metrics.reset()
+
+        expect(metrics.snapshot()['rulers']['default']['calls']).to(equal(0))
+
+        ruler.check({})
+
+        expect(metrics.snapshot()['rules']['set1']['has-foo']['calls']).to(equal(1))
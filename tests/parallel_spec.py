@@ -0,0 +1,170 @@
+"""Parallel execution unit testing."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from expects import be, equal, expect
+from mamba import description, it
+
+from pyruler import Rule, Ruler, RuleSet
+from pyruler.aio import CANCELLED
+from pyruler.parallel import chunked, map_until, prefetch, shared_thread_pool
+
+
+def delayed(value, delay=0.0, calls=None):
+    """Create a call that returns the value after the delay and records its execution."""
+
+    def call():
+        time.sleep(delay)
+
+        if calls is not None:
+            calls.append(value)
+
+        return value
+
+    return call
+
+
+with description('Should test parallel execution helpers') as self:
+    with it('returns the results in the order of the calls'):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            calls = [delayed(1, 0.03), delayed(2, 0.01), delayed(3)]
+
+            expect(map_until(executor, calls, lambda result: False)).to(equal([1, 2, 3]))
+
+    with it('cancels the calls placed after the first stopping result'):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            calls = []
+            results = map_until(executor, [delayed(1, calls=calls), delayed(2, calls=calls)], lambda result: True)
+
+            expect(results).to(equal([1, CANCELLED]))
+            expect(calls).to(equal([1]))
+
+    with it('waits for the calls placed before the stopping result'):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            calls = [delayed(0, 0.05), delayed(1), delayed(2)]
+
+            expect(map_until(executor, calls, lambda result: result > 0)).to(equal([0, 1, CANCELLED]))
+
+    with it('propagates the errors of the calls'):
+        def failing():
+            raise ValueError('boom')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            try:
+                map_until(executor, [delayed(1), failing], lambda result: False)
+                assert False
+            except ValueError as error:
+                expect(error.args[0]).to(equal('boom'))
+
+    with it('reuses the shared thread pool'):
+        expect(shared_thread_pool()).to(be(shared_thread_pool()))
+
+    with it('splits items on chunks'):
+        expect(list(chunked(iter(range(5)), 2))).to(equal([[0, 1], [2, 3], [4]]))
+        expect(list(chunked([], 2))).to(equal([]))
+
+    with it('prefetches the items on a background thread'):
+        expect(list(prefetch(iter(range(10)), 2))).to(equal(list(range(10))))
+
+    with it('raises the errors of the prefetched source'):
+        def source():
+            yield 1
+            raise ValueError('boom')
+
+        items = prefetch(source(), 2)
+
+        expect(next(items)).to(equal(1))
+
+        try:
+            next(items)
+            assert False
+        except ValueError as error:
+            expect(error.args[0]).to(equal('boom'))
+
+with description('Should test Ruler parallel execution') as self:
+    with it('applies the rule sets on the configured executor'):
+        started = Event()
+
+        def wait_other(_):
+            started.set()
+            return True
+
+        def needs_other(_):
+            return started.wait(1)
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=needs_other))
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule(name='rule2', resolver=wait_other))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ruler = Ruler(executor=executor)
+            ruler.add_many([rule_set, rule_set2])
+
+            ruler.apply({}, sets=['set1', 'set2'])
+
+    with it('raises the error of the failing set on parallel mode'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: time.sleep(0.02) or 'foo' in x))
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule(name='rule2', resolver=lambda x: 'bar' in x))
+
+        ruler.add_many([rule_set, rule_set2])
+
+        try:
+            ruler.apply({'bar': 1}, sets=('set1', 'set2'), parallel=True)
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Rule 'rule1' fail"))
+
+        ruler.apply({'foo': 1, 'bar': 1}, parallel=True)
+
+    with it('collects the failures of all the sets on parallel mode'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: 'foo' in x))
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule(name='rule2', resolver=lambda x: 'bar' in x))
+
+        ruler.add_many([rule_set, rule_set2])
+
+        result = ruler.check({}, sets=['set1', 'set2'], fail_fast=False, parallel=True)
+
+        expect(set(zip(result.set_names, result.rule_names))).to(equal({('set1', 'rule1'), ('set2', 'rule2')}))
+        expect(ruler.check({'foo': 1}, parallel=True).rule_names).to(equal(('rule2', )))
+        expect(ruler.check({'foo': 1, 'bar': 1}, parallel=True).ok).to(equal(True))
+
+    with it('shares the extracted fields between the parallel sets'):
+        reads = []
+
+        class Record:
+            """Record that counts the reads of its field."""
+
+            @property
+            def amount(self):
+                reads.append(1)
+                return 10
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule.field('amount', '>', 0))
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule.field('amount', '<', 100))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ruler = Ruler(executor=executor)
+            ruler.add_many([rule_set, rule_set2])
+
+            ruler.apply(Record())
+
+            expect(len(reads)).to(equal(1))
+            expect(ruler.check(Record(), fail_fast=False).ok).to(equal(True))
+            expect(len(reads)).to(equal(2))
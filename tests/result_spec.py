@@ -0,0 +1,61 @@
+"""ValidationResult unit testing."""
+
+from expects import be_a, be_none, equal, expect
+from mamba import description, it
+
+from pyruler import ValidationResult
+from pyruler.errors import RuleError
+
+with description('Should test ValidationResult') as self:
+    with it('creates a successful result'):
+        result = ValidationResult()
+
+        expect(result.ok).to(equal(True))
+        expect(bool(result)).to(equal(True))
+        expect(result.message).to(be_none)
+        expect(result.exception()).to(be_none)
+
+    with it('formats fail fast messages'):
+        result = ValidationResult(('rule1', ), (None, ), ('set1', ))
+
+        expect(result.ok).to(equal(False))
+        expect(result.message).to(equal("Rule 'rule1' fail"))
+        expect(result.exception()).to(be_a(RuleError))
+
+    with it('formats collected messages'):
+        result = ValidationResult(('rule1', 'rule2'), (None, None), ('set1', 'set1'), fail_fast=False)
+
+        expect(result.message).to(equal("Rules '['rule1', 'rule2']' fail"))
+        expect(result.exception().args[0]).to(equal("Rules '['rule1', 'rule2']' fail"))
+
+    with it('returns the custom rule error on fail fast mode'):
+        error = AssertionError('custom error')
+        result = ValidationResult(('rule1', ), (error, ), ('set1', ))
+
+        expect(result.exception() is error).to(equal(True))
+
+    with it('does not use slots dict'):
+        result = ValidationResult()
+
+        expect(hasattr(result, '__dict__')).to(equal(False))
+
+    with it('combines many results'):
+        result = ValidationResult.combine([
+            ValidationResult(('rule1', ), (None, ), ('set1', ), False),
+            ValidationResult(('rule2', ), (None, ), ('set2', ), False),
+        ], fail_fast=False, skipped_sets=('set3', ))
+
+        expect(result.rule_names).to(equal(('rule1', 'rule2')))
+        expect(result.set_names).to(equal(('set1', 'set2')))
+        expect(result.skipped_sets).to(equal(('set3', )))
+
+    with it('combines the rules skipped by the time budget'):
+        result = ValidationResult.combine([
+            ValidationResult(skipped_rules=('rule1', )),
+            ValidationResult(('rule2', ), (None, ), ('set2', ), skipped_rules=('rule3', )),
+        ])
+
+        expect(result.ok).to(equal(False))
+        expect(result.complete).to(equal(False))
+        expect(result.skipped_rules).to(equal(('rule1', 'rule3')))
+        expect(ValidationResult().complete).to(equal(True))
@@ -1,6 +1,8 @@
 """Unit testing for Rule objects."""
 
-from expects import be_a, equal, expect
+import asyncio
+
+from expects import be, be_a, equal, expect
 from mamba import description, it
 
 from pyruler import Rule
@@ -29,3 +31,47 @@ with description('Should test Rule configuration') as self:
         except Exception as error:
             expect(error).to(be_a(AssertionError))
             expect(error.args[0]).to(equal('custom error'))
+
+    with it('skips the resolver when the guard is false'):
+        rule = Rule(name='test-rule', resolver=lambda x: False, when=lambda x: x.get('foo'))
+
+        expect(rule.execute({})).to(equal(True))
+        expect(rule.execute({'foo': 1})).to(equal(False))
+
+        rule = Rule.expression('amount > 10', when='user.active')
+
+        expect(rule.reads).to(equal(('user.active', 'amount')))
+        expect(rule.execute({'amount': 5, 'user': {'active': False}})).to(equal(True))
+        expect(rule.execute({'amount': 5, 'user': {'active': True}})).to(equal(False))
+
+    with it('compiles the resolver once'):
+        rule = Rule(name='test-rule', resolver=lambda x: x['foo'] > 0, when='foo')
+
+        expect(rule.compile()).to(be(rule.compile()))
+        expect(rule.execute({'foo': 1})).to(equal(True))
+
+    with it('skips the async resolver when the guard is false'):
+        async def resolver(data):
+            return False
+
+        rule = Rule(name='test-rule', resolver=resolver, when='foo')
+
+        expect(asyncio.run(rule.execute_async({}))).to(equal(True))
+        expect(asyncio.run(rule.execute_async({'foo': 1}))).to(equal(False))
+
+    with it('configures the cost tier of the rule'):
+        expect(Rule(name='test-rule', resolver=lambda x: True).tier).to(equal('normal'))
+        expect(Rule.field('amount', '>', 10, tier='cheap').tier).to(equal('cheap'))
+
+        try:
+            Rule(name='test-rule', resolver=lambda x: True, tier='free')
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Tier 'free' of rule 'test-rule' is not supported, use one of cheap, "
+                                           "normal, expensive"))
+
+    with it('declares the fields read by the rule'):
+        expect(Rule(name='test-rule', resolver=lambda x: True).declared_reads).to(equal(None))
+        expect(Rule(name='test-rule', resolver=lambda x: True, reads=['foo']).declared_reads).to(equal(('foo', )))
+        expect(Rule.field('amount', '>', 10, when='user.active').declared_reads).to(equal(('user.active', 'amount')))
+        expect(Rule.expression('amount > 10', when=lambda x: True).declared_reads).to(equal(None))
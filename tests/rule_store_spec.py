@@ -0,0 +1,54 @@
+"""RuleStore unit testing."""
+
+from expects import be, be_none, equal, expect
+from mamba import description, it
+
+from pyruler import Rule
+from pyruler.rule_store import RuleStore
+
+with description('Should test RuleStore') as self:
+    with it('stores the rules in order'):
+        rules = [Rule(name=f'rule{index}', resolver=bool) for index in range(3)]
+        store = RuleStore(rules)
+
+        expect(len(store)).to(equal(3))
+        expect(list(store)).to(equal(rules))
+        expect(store[1]).to(be(rules[1]))
+        expect(store.names()).to(equal(['rule0', 'rule1', 'rule2']))
+
+    with it('looks up the rules by name'):
+        rule = Rule(name='rule1', resolver=bool)
+        store = RuleStore([Rule(name='rule0', resolver=bool), rule])
+
+        expect(store.get('rule1')).to(be(rule))
+        expect(store.index('rule1')).to(equal(1))
+        expect(store.get('rule2')).to(be_none)
+        expect('rule1' in store).to(equal(True))
+        expect('rule2' in store).to(equal(False))
+
+    with it('inserts, removes and replaces rules updating the name index'):
+        store = RuleStore([Rule(name='rule0', resolver=bool), Rule(name='rule1', resolver=bool)])
+
+        store.insert(0, Rule(name='first', resolver=bool))
+        expect(store.index('rule1')).to(equal(2))
+
+        removed = store.remove('rule0')
+        expect(removed.name).to(equal('rule0'))
+        expect(store.names()).to(equal(['first', 'rule1']))
+        expect(store.index('rule1')).to(equal(1))
+
+        store.replace('first', Rule(name='other', resolver=bool))
+        expect(store.names()).to(equal(['other', 'rule1']))
+        expect(store.get('first')).to(be_none)
+
+        try:
+            store.remove('first')
+            assert False
+        except KeyError:
+            pass
+
+    with it('points to the first rule of a repeated name'):
+        rule = Rule(name='rule', resolver=bool)
+        store = RuleStore([rule, Rule(name='rule', resolver=str)])
+
+        expect(store.get('rule')).to(be(rule))
@@ -1,9 +1,13 @@
 """Testing ruler core."""
 
-from expects import equal, expect
+import asyncio
+import threading
+
+from expects import be, contain, equal, expect
 from mamba import description, it
 
-from pyruler import Rule, Ruler, RuleSet
+from pyruler import FixedRate, Rule, Ruler, RuleSet
+from pyruler.errors import RulerConfigError, RulerError
 
 with description('Should test Ruler configuration') as self:
     with it('creates ruler instance'):
@@ -119,3 +123,517 @@ with description('Should test Ruler configuration') as self:
             assert False
         except Exception as error:
             expect(error.args[0]).to(equal("Not found RuleSet 'set2' on Ruler configuration"))
+
+    with it('applies the rule sets to a batch of records'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: 'foo' in x),
+            Rule(name='rule2', resolver=lambda x: 'bar' in x),
+        ])
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule(name='rule3', resolver=lambda x: 'baz' in x))
+
+        ruler.add_many([rule_set, rule_set2])
+
+        records = [{'foo': 1, 'bar': 1, 'baz': 1}, {'baz': 1}, {'foo': 1}]
+
+        expect(ruler.apply_many(records, sets='set1')).to(equal([(), (('set1', (0, )), ), (('set1', (1, )), )]))
+        results = ruler.apply_many(records, sets=['set1', 'set2'], fail_fast=False)
+
+        expect([set(result) for result in results]).to(
+            equal([set(), {('set1', (0, 1))}, {('set1', (1, )), ('set2', (0, ))}])
+        )
+
+    with it('checks for error when try to apply a batch to a non configured rule set'):
+        ruler = Ruler()
+        ruler.add_set(RuleSet(name='set1'))
+
+        try:
+            ruler.apply_many([{}], sets='set2')
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Not found RuleSet 'set2' on Ruler configuration"))
+
+    with it('checks the rule sets without raising errors'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: 'foo' in x))
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule(name='rule2', resolver=lambda x: 'bar' in x))
+
+        ruler.add_many([rule_set, rule_set2])
+
+        expect(ruler.check({'foo': 1, 'bar': 1}).ok).to(equal(True))
+        expect(ruler.check({'foo': 1}).rule_names).to(equal(('rule2', )))
+
+        result = ruler.check({}, fail_fast=False)
+
+        expect(set(zip(result.set_names, result.rule_names))).to(equal({('set1', 'rule1'), ('set2', 'rule2')}))
+
+    with it('streams the results of the records by chunks'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: x % 3 != 0))
+        ruler.add_set(rule_set)
+
+        consumed = []
+
+        def records():
+            for record in range(1, 8):
+                consumed.append(record)
+                yield record
+
+        stream = ruler.stream(records(), sets='set1', chunk_size=3)
+
+        expect(next(stream)).to(equal([(0, 1, ()), (1, 2, ()), (2, 3, (('set1', (0, )), ))]))
+        expect(consumed).to(equal([1, 2, 3]))
+        expect(list(stream)).to(equal([[(3, 4, ()), (4, 5, ()), (5, 6, (('set1', (0, )), ))], [(6, 7, ())]]))
+
+    with it('streams only the failures with prefetched chunks'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: x % 3 != 0))
+        ruler.add_set(rule_set)
+
+        stream = ruler.stream(iter(range(1, 8)), chunk_size=2, only_failures=True, prefetch_size=1)
+
+        expect(list(stream)).to(equal([[(2, 3, (('set1', (0, )), ))], [(5, 6, (('set1', (0, )), ))]]))
+
+    with it('checks for error with invalid stream configuration'):
+        ruler = Ruler()
+
+        try:
+            ruler.stream([], chunk_size=0)
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal('Chunk size should be a positive number, got 0'))
+
+        try:
+            ruler.stream([], sets='set2')
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Not found RuleSet 'set2' on Ruler configuration"))
+
+    with it('replaces, removes and swaps rule sets'):
+        ruler = Ruler()
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: 'foo' in x))
+
+        rule_set2 = RuleSet(name='set2')
+        rule_set2.add_rule(Rule(name='rule2', resolver=lambda x: 'bar' in x))
+
+        ruler.add_many([rule_set, rule_set2])
+
+        new_set = RuleSet(name='set1')
+        new_set.add_rule(Rule(name='rule3', resolver=lambda x: 'baz' in x))
+
+        expect(ruler.replace_set(new_set)).to(equal(rule_set))
+        expect(ruler.check({'foo': 1}, sets='set1').rule_names).to(equal(('rule3', )))
+
+        expect(ruler.remove_set('set2')).to(equal(rule_set2))
+        expect(ruler.rule_set_names()).to(equal(['set1']))
+
+        other = Ruler()
+        other.add_many([rule_set, rule_set2])
+
+        previous = ruler.swap(other)
+
+        expect(previous).to(equal([new_set]))
+        expect(sorted(ruler.rule_set_names())).to(equal(['set1', 'set2']))
+        expect(ruler.check({'foo': 1, 'bar': 1}).ok).to(equal(True))
+
+        ruler.swap(previous)
+        expect(ruler.rule_set_names()).to(equal(['set1']))
+
+        for change in (lambda: ruler.replace_set(rule_set2), lambda: ruler.remove_set('set2')):
+            try:
+                change()
+                assert False
+            except Exception as error:
+                expect(error.args[0]).to(equal("RuleSet 'set2' is not configured on the ruler"))
+
+        try:
+            ruler.swap([rule_set, rule_set])
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("RuleSet 'set1' is duplicated on the given rule sets"))
+
+        expect(ruler.rule_set_names()).to(equal(['set1']))
+
+    with it('copies the rule sets of a swapped ruler'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: 'foo' in x))
+
+        other = Ruler()
+        other.add_set(rule_set)
+
+        ruler = Ruler()
+        ruler.swap(other)
+        rule_set.add_rule(Rule(name='rule2', resolver=lambda x: 'bar' in x))
+
+        expect(ruler.check({'foo': 1}).ok).to(equal(True))
+        expect(other.check({'foo': 1}).rule_names).to(equal(('rule2', )))
+
+    with it('checks for error when removing a rule set that other sets depend on'):
+        ruler = Ruler()
+        ruler.add_many([
+            RuleSet(name='set1'),
+            RuleSet(name='set2', depends_on=['set1']),
+            RuleSet(name='set3', depends_on=['set1']),
+        ])
+
+        try:
+            ruler.remove_set('set1')
+            assert False
+        except RulerConfigError as error:
+            expect(error.args[0]).to(
+                equal("RuleSet 'set1' can't be removed because other sets depend on it: 'set2', 'set3'"))
+
+        ruler.remove_set('set2')
+        ruler.replace_set(RuleSet(name='set3'))
+
+        expect(ruler.remove_set('set1').name).to(equal('set1'))
+        expect(ruler.rule_set_names()).to(equal(['set3']))
+        expect(ruler._dependents).to(equal({}))
+
+    with it('reloads the rule sets while other threads apply them'):
+        def build(index):
+            rule_set = RuleSet(name='set1')
+            rule_set.add_many([Rule(name=f'rule{index}-{rule}', resolver=lambda x: True) for rule in range(5)])
+            return rule_set
+
+        ruler = Ruler()
+        ruler.add_set(build(0))
+
+        errors = []
+        stop = threading.Event()
+
+        def validate():
+            while not stop.is_set():
+                try:
+                    ruler.apply({}, sets='set1')
+                except Exception as error:
+                    errors.append(error)
+
+        threads = [threading.Thread(target=validate) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for index in range(1, 200):
+            if index % 2:
+                ruler.replace_set(build(index))
+            else:
+                ruler.swap([build(index)])
+
+            ruler.check({}, sets='set1')
+
+        stop.set()
+
+        for thread in threads:
+            thread.join()
+
+        expect(errors).to(equal([]))
+
+    with it('applies the rule sets on a deterministic prioritized order'):
+        calls = []
+
+        def build(name, priority=0, cost=1.0):
+            rule_set = RuleSet(name=name, priority=priority, cost=cost)
+            rule_set.add_rule(Rule(name=f'{name}-rule', resolver=lambda x: calls.append(name) or name not in x))
+            return rule_set
+
+        ruler = Ruler()
+        ruler.add_many([build('set1'), build('set2'), build('set3')])
+
+        ruler.check({}, sets=['set3', 'set1', 'set2'])
+        expect(calls).to(equal(['set3', 'set1', 'set2']))
+
+        calls.clear()
+        ruler.check({}, sets={'set3', 'set1'})
+        expect(calls).to(equal(['set1', 'set3']))
+
+        calls.clear()
+        ruler.check({})
+        expect(calls).to(equal(['set1', 'set2', 'set3']))
+
+        expect(ruler.check({'set2': 1, 'set3': 1}, sets=['set3', 'set2']).rule_names).to(equal(('set3-rule', )))
+
+        ruler.add_many([build('cheap', cost=0.1), build('urgent', priority=10, cost=5)])
+
+        calls.clear()
+        ruler.check({}, fail_fast=False)
+        expect(calls).to(equal(['urgent', 'cheap', 'set1', 'set2', 'set3']))
+
+    with it('caches the execution order until the configuration changes'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+
+        ruler = Ruler()
+        ruler.add_set(rule_set)
+
+        order = ruler._resolve_sets(['set1'])
+
+        expect(ruler._resolve_sets(['set1'])).to(be(order))
+
+        rule_set2 = RuleSet(name='set2', priority=1)
+        rule_set2.add_rule(Rule(name='rule2', resolver=lambda x: True))
+        ruler.add_set(rule_set2)
+
+        expect(ruler._resolve_sets(['set1'])).not_to(be(order))
+        expect([rule_set.name for rule_set in ruler._resolve_sets(None)]).to(equal(['set2', 'set1']))
+
+    with it('schedules the rule sets after the sets they depend on'):
+        calls = []
+
+        def build(name, depends_on=(), priority=0):
+            rule_set = RuleSet(name=name, priority=priority, depends_on=depends_on)
+            rule_set.add_rule(Rule(name=f'{name}-rule', resolver=lambda x: calls.append(name) or name not in x))
+            return rule_set
+
+        ruler = Ruler()
+        ruler.add_many([
+            build('geo-lookup', depends_on=['address-format'], priority=10),
+            build('address-format'),
+            build('score', depends_on=['geo-lookup', 'identity']),
+            build('identity'),
+        ])
+
+        ruler.check({}, sets='score')
+        expect(calls).to(equal(['address-format', 'identity', 'geo-lookup', 'score']))
+
+        result = ruler.check({'address-format': 1, 'identity': 1}, sets=['geo-lookup', 'identity'], fail_fast=False)
+        expect(result.rule_names).to(equal(('identity-rule', 'address-format-rule')))
+        expect(result.skipped_sets).to(equal(('geo-lookup', )))
+
+        result = ruler.check({'address-format': 1}, fail_fast=False, parallel=True)
+        expect(result.rule_names).to(equal(('address-format-rule', )))
+        expect(result.skipped_sets).to(equal(('geo-lookup', 'score')))
+
+        result = asyncio.run(ruler.check_async({'address-format': 1}, fail_fast=False))
+        expect(result.skipped_sets).to(equal(('geo-lookup', 'score')))
+
+        expect(ruler.apply_many([{'address-format': 1}, {'score': 1}], fail_fast=False)).to(
+            equal([(('address-format', (0, )), ), (('score', (0, )), )]))
+
+    with it('checks for error with rule set dependency cycles'):
+        ruler = Ruler()
+        ruler.add_many([RuleSet(name='set1', depends_on=['set3']), RuleSet(name='set2', depends_on=['set1'])])
+
+        try:
+            ruler.add_set(RuleSet(name='set3', depends_on=['set2']))
+            assert False
+        except RulerConfigError as error:
+            expect(error.args[0]).to(equal("RuleSet dependencies make a cycle: 'set3' -> 'set2' -> 'set1' -> 'set3'"))
+
+        expect(ruler.rule_set_names()).to(equal(['set1', 'set2']))
+
+        try:
+            ruler.apply({}, sets='set2')
+            assert False
+        except RulerError as error:
+            expect(error.args[0]).to(equal("Not found RuleSet 'set3' on Ruler configuration"))
+
+    with it('checks the dependencies of the added rule sets without walking the configured ones'):
+        walked = []
+
+        class WalkedRuleSet(RuleSet):
+            """Rule set that records the reads of its dependencies."""
+
+            @property
+            def depends_on(self):
+                walked.append(self.name)
+                return super().depends_on
+
+        ruler = Ruler()
+        ruler.add_set(WalkedRuleSet(name='set-0'))
+
+        for index in range(1, 200):
+            ruler.add_set(WalkedRuleSet(name=f'set-{index}', depends_on=[f'set-{index - 1}']))
+
+        expect(len(walked)).to(equal(400))
+
+        walked.clear()
+        ruler.replace_set(WalkedRuleSet(name='set-100', depends_on=['set-99']))
+
+        expect(len(walked)).to(equal(103))
+
+        try:
+            ruler.replace_set(RuleSet(name='set-2', depends_on=['set-199']))
+            assert False
+        except RulerConfigError as error:
+            expect(error.args[0]).to(contain("'set-2' -> 'set-199' -> 'set-198'"))
+
+    with it('routes the data to the rule sets that match it'):
+        calls = []
+
+        def build(name, match=None):
+            rule_set = RuleSet(name=name, match=match)
+            rule_set.add_rule(Rule(name=f'{name}-rule', resolver=lambda x: calls.append(name) or name not in x))
+            return rule_set
+
+        ruler = Ruler()
+        ruler.add_many([
+            build('common'),
+            build('payment', match=('event_type', 'payment')),
+            build('refund', match=('event_type', 'refund')),
+        ])
+
+        ruler.apply({'event_type': 'refund'})
+        expect(calls).to(equal(['common', 'refund']))
+
+        calls.clear()
+        expect(ruler.check({'event_type': 'payment', 'payment': 1}, sets=['payment', 'refund']).rule_names).to(
+            equal(('payment-rule', )))
+        expect(calls).to(equal(['payment']))
+
+        records = [{'event_type': 'payment', 'payment': 1}, {'event_type': 'refund', 'common': 1}, {'refund': 1}]
+        expect(ruler.apply_many(records, fail_fast=False)).to(
+            equal([(('payment', (0, )), ), (('common', (0, )), ), ()]))
+
+    with it('shares the time budget between the rule sets'):
+        set1 = RuleSet(name='set1')
+        set1.add_many([
+            Rule(name='rule1', resolver=lambda x: 'foo' in x, tier='cheap'),
+            Rule(name='rule2', resolver=lambda x: False, tier='expensive'),
+        ])
+        set2 = RuleSet(name='set2')
+        set2.add_many([
+            Rule(name='rule3', resolver=lambda x: 'bar' in x, tier='cheap'),
+            Rule(name='rule4', resolver=lambda x: False),
+        ])
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2])
+
+        for parallel in (False, True):
+            result = ruler.check({'foo': 1, 'bar': 1}, parallel=parallel, budget=0)
+
+            expect(result.ok).to(equal(True))
+            expect(result.skipped_rules).to(equal(('rule2', 'rule4')))
+
+            result = ruler.check({'foo': 1}, parallel=parallel, budget=0)
+
+            expect(result.rule_names).to(equal(('rule3', )))
+            expect(result.skipped_rules).to(equal(('rule2', )))
+
+            result = ruler.check({}, fail_fast=False, parallel=parallel, budget=0)
+
+            expect(result.rule_names).to(equal(('rule1', 'rule3')))
+            expect(result.skipped_rules).to(equal(('rule2', 'rule4')))
+
+        ruler.apply({'foo': 1, 'bar': 1}, budget=0)
+        expect(ruler.check({'foo': 1, 'bar': 1}, budget=60).rule_names).to(equal(('rule2', )))
+
+    with it('applies the rule sets to the sampled data only'):
+        calls = []
+
+        def build(name):
+            rule_set = RuleSet(name=name)
+            rule_set.add_rule(Rule(name=f'{name}-rule', resolver=lambda x: calls.append(name) or name not in x))
+            return rule_set
+
+        ruler = Ruler()
+        ruler.add_many([build('set1'), build('set2'), build('set3')])
+        sampling = {'set2': FixedRate(0), 'set3': FixedRate(1)}
+
+        ruler.apply({'set2': 1}, sampling=sampling)
+        expect(calls).to(equal(['set1', 'set3']))
+
+        result = ruler.check({'set1': 1, 'set3': 1}, fail_fast=False, sampling=sampling)
+
+        expect(result.rule_names).to(equal(('set1-rule', 'set3-rule')))
+        expect(sampling['set3'].snapshot()['failures']).to(equal(1))
+
+        try:
+            ruler.apply({'set3': 1}, sampling=sampling)
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Rule 'set3-rule' fail"))
+
+        results = ruler.apply_many([{'set2': 1}, {'set3': 1}], sampling=sampling)
+
+        expect(results).to(equal([(), (('set3', (0, )), )]))
+        expect(sampling['set2'].snapshot()).to(equal({
+            'seen': 5,
+            'sampled': 0,
+            'checked': 0,
+            'failures': 0,
+            'sample_rate': 0.0,
+            'failure_rate': 0.0,
+            'estimated_failures': 0.0,
+        }))
+        expect(sampling['set3'].snapshot()['checked']).to(equal(5))
+        expect(sampling['set3'].snapshot()['failures']).to(equal(3))
+
+    with it('revalidates the rule sets affected by the changed fields'):
+        calls = []
+
+        def build(name, path, match=None, depends_on=()):
+            rule_set = RuleSet(name=name, match=match, depends_on=depends_on)
+            rule_set.add_rule(Rule(name=f'{name}-rule', resolver=lambda x: calls.append(name) or x.get(path, 0) > 0,
+                                   reads=[path]))
+            return rule_set
+
+        ruler = Ruler()
+        ruler.add_many([
+            build('set1', 'foo'),
+            build('set2', 'bar', depends_on=['set1']),
+            build('set3', 'baz', match=('kind', 'order')),
+        ])
+
+        data = {'kind': 'order'}
+        previous = ruler.check(data, fail_fast=False)
+
+        expect(previous.rule_names).to(equal(('set1-rule', 'set3-rule')))
+        expect(previous.skipped_sets).to(equal(('set2', )))
+
+        calls.clear()
+        data['foo'] = 1
+        result = ruler.revalidate(data, 'foo', previous)
+
+        expect(calls).to(equal(['set1', 'set2']))
+        expect(result.rule_names).to(equal(('set3-rule', 'set2-rule')))
+
+        calls.clear()
+        data['kind'] = 'refund'
+        result = ruler.revalidate(data, ['kind'], result)
+
+        expect(calls).to(equal(['set1', 'set2']))
+        expect(result.rule_names).to(equal(('set2-rule', )))
+
+        try:
+            ruler.revalidate(data, ['foo'], ruler.check({'kind': 'order'}))
+            assert False
+        except RulerError as error:
+            expect(error.args[0]).to(equal('Previous result should be checked on collect all mode to be revalidated'))
+
+    with it('reports the failures of a batch on a compact report'):
+        set1 = RuleSet(name='set1')
+        set1.add_rule(Rule(name='rule1', resolver=lambda x: 'foo' in x))
+        set2 = RuleSet(name='set2', depends_on=['set1'])
+        set2.add_rule(Rule(name='rule2', resolver=lambda x: 'bar' in x))
+        set3 = RuleSet(name='set3')
+        set3.add_rule(Rule(name='rule3', resolver=lambda x: 'baz' in x))
+
+        ruler = Ruler()
+        ruler.add_many([set1, set2, set3])
+
+        records = [{}, {'foo': 1}, {'foo': 1, 'bar': 1, 'baz': 1}]
+        report = ruler.apply_many(records, fail_fast=False, compact=True)
+
+        expect(report.size).to(equal(3))
+        expect(report.failed).to(equal(2))
+        expect(report.counts()).to(equal({('set1', 'rule1'): 1, ('set2', 'rule2'): 1, ('set3', 'rule3'): 2}))
+        expect(report.row(0).rule_names).to(equal(('rule1', 'rule3')))
+        expect(report.row(1).rule_names).to(equal(('rule3', 'rule2')))
+        expect(ruler.apply_many(records, sets='set2', compact=True).counts()).to(equal({('set1', 'rule1'): 1,
+                                                                                        ('set2', 'rule2'): 1}))
@@ -4,6 +4,7 @@ from expects import be_a, equal, expect
 from mamba import description, it
 
 from pyruler import Rule, RuleSet
+from pyruler.errors import RuleConfigError
 
 with description('Should test RuleSet configuration') as self:
     with it('checks add_rule method'):
@@ -124,3 +125,223 @@ with description('Should test RuleSet configuration') as self:
         except Exception as error:
             expect(error).to(be_a(AssertionError))
             expect(error.args[0]).to(equal('custom error'))
+
+    with it('compiles the rules on a cached execution plan'):
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+
+        plan = rule_set.compile()
+
+        expect(len(plan)).to(equal(1))
+        expect(plan[0][2]).to(equal('rule1'))
+        expect(rule_set.compile() is plan).to(equal(True))
+
+    with it('invalidates the execution plan when new rules are added'):
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+        rule_set.apply({})
+        rule_set.add_many([Rule(name='rule2', resolver=lambda x: False)])
+
+        expect([entry[2] for entry in rule_set.compile()]).to(equal(['rule1', 'rule2']))
+
+        try:
+            rule_set.apply({})
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Rule 'rule2' fail"))
+
+    with it('raises config error when compiling rules without resolver'):
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_rule(Rule(name='rule1'))
+
+        try:
+            rule_set.compile()
+            assert False
+        except Exception as error:
+            expect(error).to(be_a(RuleConfigError))
+            expect(error.args[0]).to(equal("Rule 'rule1' doesn't have a Callable resolver"))
+
+    with it('applies the set to a batch of records'):
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: x > 0),
+            Rule(name='rule2', resolver=lambda x: x < 10),
+        ])
+
+        expect(rule_set.apply_many([1, -1, 20])).to(equal([(), (0, ), (1, )]))
+        expect(rule_set.apply_many([5, -20], fail_fast=False)).to(equal([(), (0, )]))
+
+    with it('collects all the failing rules of each record on a batch'):
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: 'foo' in x),
+            Rule(name='rule2', resolver=lambda x: 'bar' in x),
+        ])
+
+        results = rule_set.apply_many([{}, {'foo': 1}, {'foo': 1, 'bar': 1}], fail_fast=False)
+
+        expect(results).to(equal([(0, 1), (1, ), ()]))
+
+    with it('checks the data without raising errors'):
+        error = AssertionError('custom error')
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: 'foo' in x, error=error),
+            Rule(name='rule2', resolver=lambda x: 'bar' in x),
+        ])
+
+        expect(rule_set.check({'foo': 1, 'bar': 1}).ok).to(equal(True))
+
+        result = rule_set.check({})
+
+        expect(result.ok).to(equal(False))
+        expect(result.rule_names).to(equal(('rule1', )))
+        expect(result.errors).to(equal((error, )))
+        expect(result.set_names).to(equal(('set1', )))
+
+        result = rule_set.check({}, fail_fast=False)
+
+        expect(result.rule_names).to(equal(('rule1', 'rule2')))
+        expect(result.message).to(equal("Rules '['rule1', 'rule2']' fail"))
+
+    with it('gets the rules by name and adds rules at a position'):
+        rule1 = Rule(name='rule1', resolver=lambda x: True)
+        rule2 = Rule(name='rule2', resolver=lambda x: False)
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(rule1)
+        rule_set.add_rule(rule2, position=0)
+
+        expect(rule_set.rule_names()).to(equal(['rule2', 'rule1']))
+        expect(rule_set.get_rule('rule1')).to(equal(rule1))
+        expect(rule_set.check({}).rule_names).to(equal(('rule2', )))
+
+        try:
+            rule_set.get_rule('rule3')
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Rule 'rule3' is not configured in the RuleSet"))
+
+    with it('adds the rules of a generator'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many(Rule(name=f'rule{index}', resolver=lambda x: True) for index in range(3))
+
+        expect(rule_set.count_rules()).to(equal(3))
+
+    with it('removes and replaces rules by name'):
+        rule1 = Rule(name='rule1', resolver=lambda x: 'foo' in x)
+        rule2 = Rule(name='rule2', resolver=lambda x: 'bar' in x)
+
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([rule1, rule2])
+
+        expect(rule_set.check({'foo': 1}).rule_names).to(equal(('rule2', )))
+
+        expect(rule_set.replace_rule('rule2', Rule(name='rule3', resolver=lambda x: 'baz' in x))).to(equal(rule2))
+        expect(rule_set.rule_names()).to(equal(['rule1', 'rule3']))
+        expect(rule_set.check({'foo': 1}).rule_names).to(equal(('rule3', )))
+
+        expect(rule_set.remove_rule('rule3').name).to(equal('rule3'))
+        expect(rule_set.check({'foo': 1}).ok).to(equal(True))
+
+        rule_set.add_rule(rule2)
+        expect(rule_set.rule_names()).to(equal(['rule1', 'rule2']))
+
+        for change in (lambda: rule_set.remove_rule('rule3'), lambda: rule_set.replace_rule('rule3', rule2)):
+            try:
+                change()
+                assert False
+            except Exception as error:
+                expect(error.args[0]).to(equal("Rule 'rule3' is not configured in the RuleSet"))
+
+        try:
+            rule_set.replace_rule('rule1', rule2)
+            assert False
+        except Exception as error:
+            expect(error.args[0]).to(equal("Rule 'rule2' was already configured in the RuleSet"))
+
+    with it('keeps the running plan when the rules change'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+
+        plan = rule_set.compile()
+        rule_set.add_rule(Rule(name='rule2', resolver=lambda x: False))
+
+        expect(len(plan)).to(equal(1))
+        expect(len(rule_set.compile())).to(equal(2))
+
+    with it('skips the rules out of the cheap tier when the time budget runs out'):
+        calls = []
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: calls.append('rule1') or True, tier='expensive'),
+            Rule(name='rule2', resolver=lambda x: calls.append('rule2') or True),
+            Rule(name='rule3', resolver=lambda x: calls.append('rule3') or 'foo' in x, tier='cheap'),
+        ])
+
+        result = rule_set.check({}, budget=0)
+
+        expect(calls).to(equal(['rule3']))
+        expect(result.rule_names).to(equal(('rule3', )))
+        expect(result.skipped_rules).to(equal(()))
+
+        calls.clear()
+        result = rule_set.check({'foo': 1}, budget=0)
+
+        expect(calls).to(equal(['rule3']))
+        expect(result.ok).to(equal(True))
+        expect(result.complete).to(equal(False))
+        expect(result.skipped_rules).to(equal(('rule1', 'rule2')))
+
+        calls.clear()
+        result = rule_set.check({'foo': 1}, budget=60)
+
+        expect(calls).to(equal(['rule3', 'rule2', 'rule1']))
+        expect(result.complete).to(equal(True))
+
+    with it('applies again only the rules affected by the changed fields'):
+        calls = []
+        rule_set = RuleSet(name='set1')
+
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: calls.append('rule1') or x['foo'] > 0, reads=['foo']),
+            Rule(name='rule2', resolver=lambda x: calls.append('rule2') or x['bar']['baz'] > 0, reads=['bar.baz']),
+            Rule(name='rule3', resolver=lambda x: calls.append('rule3') or True),
+        ])
+
+        data = {'foo': 0, 'bar': {'baz': 0}}
+        previous = rule_set.check(data, fail_fast=False)
+
+        calls.clear()
+        data['foo'] = 1
+        result = rule_set.revalidate(data, ['foo'], previous)
+
+        expect(calls).to(equal(['rule1', 'rule3']))
+        expect(result.rule_names).to(equal(('rule2', )))
+
+        calls.clear()
+        data['bar']['baz'] = 1
+        result = rule_set.revalidate(data, ['bar'], result)
+
+        expect(calls).to(equal(['rule2', 'rule3']))
+        expect(result.ok).to(equal(True))
+
+    with it('reports the failures of a batch on a compact report'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_many([
+            Rule(name='rule1', resolver=lambda x: 'foo' in x),
+            Rule(name='rule2', resolver=lambda x: 'bar' in x),
+        ])
+
+        report = rule_set.apply_many([{}, {'foo': 1}, {'foo': 1, 'bar': 1}], fail_fast=False, compact=True)
+
+        expect(report.counts()).to(equal({('set1', 'rule1'): 1, ('set1', 'rule2'): 2}))
+        expect(report.row(0).rule_names).to(equal(('rule1', 'rule2')))
+        expect(report.row(2).ok).to(equal(True))
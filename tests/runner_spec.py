@@ -0,0 +1,181 @@
+"""Process runner and pickling unit testing."""
+
+import copy
+import operator
+import pickle
+
+from expects import be_none, contain, equal, expect
+from mamba import description, it
+
+from pyruler import AdaptiveOrder, Metrics, ProcessRunner, Rule, RuleCache, Ruler, RuleSet
+from pyruler.errors import RuleConfigError, RulerConfigError, RuleSetConfigError
+
+
+class TaggedRule(Rule):
+    """Rule with an attribute out of the slots."""
+
+    def __init__(self, name, resolver, tag):
+        super().__init__(name, resolver)
+        self.tag = tag
+
+
+def build_ruler():
+    """Create a ruler with picklable rules."""
+
+    amounts = RuleSet(name='amounts', adaptive=AdaptiveOrder(interval=10))
+    amounts.add_many([
+        Rule.field('amount', '>', 0),
+        Rule.expression('amount < limit', name='under-limit'),
+    ])
+
+    flags = RuleSet(name='flags')
+    flags.add_rule(Rule(name='not-empty', resolver='operator:truth'))
+
+    ruler = Ruler()
+    ruler.add_many([amounts, flags])
+
+    return ruler
+
+
+with description('Should test pickling of rules') as self:
+    with it('imports resolvers from references'):
+        rule = Rule(name='truthy', resolver='operator:truth')
+
+        expect(rule.execute(1)).to(equal(True))
+        expect(rule.execute(0)).to(equal(False))
+
+    with it('checks for error with invalid resolver references'):
+        for reference in ('operator', 'operator:missing_function', 'missing_module:function'):
+            try:
+                Rule(name='invalid', resolver=reference)
+                assert False
+            except RuleConfigError as error:
+                expect(error.args[0].startswith(f"Resolver reference '{reference}'")).to(equal(True))
+
+    with it('rebuilds the resolvers of pickled rules'):
+        cache = RuleCache(key=operator.truth)
+        cache.resolve(operator.truth, 1)
+
+        rules = [
+            Rule(name='truthy', resolver='operator:truth', cache=cache),
+            Rule.field('user.age', '>=', 18),
+            Rule.expression('amount > 0 and currency in {"USD", "EUR"}'),
+        ]
+
+        for rule in rules:
+            restored = pickle.loads(pickle.dumps(rule))
+
+            expect(restored.name).to(equal(rule.name))
+            expect(restored.reads).to(equal(rule.reads))
+
+        truthy, age, expression = [pickle.loads(pickle.dumps(rule)) for rule in rules]
+
+        expect(len(truthy.cache)).to(equal(0))
+        expect(truthy.execute(1)).to(equal(True))
+        expect(age.execute({'user': {'age': 20}})).to(equal(True))
+        expect(expression.execute({'amount': 1, 'currency': 'MXN'})).to(equal(False))
+
+    with it('checks for error when the resolver is a lambda'):
+        rule = Rule(name='lambda-rule', resolver=lambda x: True)
+
+        try:
+            rule.check_picklable()
+            assert False
+        except RuleConfigError as error:
+            expect(error.args[0]).to(
+                contain("Rule 'lambda-rule' can't be pickled", '<lambda>', 'package.module:function'))
+
+        rule = Rule.field('amount', '>', 0, when=lambda x: True)
+
+        try:
+            rule.check_picklable()
+            assert False
+        except RuleConfigError as error:
+            expect(error.args[0]).to(contain("Rule 'amount > 0' can't be pickled because its guard"))
+
+        expect(pickle.loads(pickle.dumps(Rule.field('amount', '>', 0, when='active'))).execute({'amount': 0})).to(
+            equal(True))
+
+    with it('checks for error when the cache key is a lambda'):
+        rule_set = RuleSet(name='cached')
+        rule_set.add_rule(Rule(name='truthy', resolver='operator:truth', cache=RuleCache(key=lambda x: x)))
+
+        ruler = Ruler()
+        ruler.add_set(rule_set)
+
+        try:
+            ProcessRunner(ruler)
+            assert False
+        except RuleConfigError as error:
+            expect(error.args[0]).to(contain("Rule 'truthy' can't be pickled because its cache key", '<lambda>'))
+
+    with it('checks for error when the set match is a lambda'):
+        rule_set = RuleSet(name='matched', match=lambda data: True)
+        rule_set.add_rule(Rule(name='not-empty', resolver='operator:truth'))
+
+        ruler = Ruler()
+        ruler.add_set(rule_set)
+
+        try:
+            ProcessRunner(ruler)
+            assert False
+        except RuleSetConfigError as error:
+            expect(error.args[0]).to(
+                contain("RuleSet 'matched' can't be pickled because its match", '<lambda>', 'field path and value'))
+
+    with it('copies the rules and the rule sets that can not be pickled'):
+        rule = Rule(name='lambda-rule', resolver=lambda x: x > 0, when=lambda x: True)
+        rule_set = RuleSet(name='matched', match=lambda data: True)
+        rule_set.add_rule(rule)
+
+        expect(copy.copy(rule).execute(1)).to(equal(True))
+        expect(copy.deepcopy(rule).execute(0)).to(equal(False))
+        expect(copy.deepcopy(rule_set).rule_names()).to(equal(['lambda-rule']))
+
+        tagged = copy.copy(TaggedRule(name='tagged', resolver='operator:truth', tag='vip'))
+
+        expect(tagged.tag).to(equal('vip'))
+        expect(tagged.execute(1)).to(equal(True))
+
+    with it('pickles rulers without metrics'):
+        ruler = build_ruler()
+        ruler.instrument(Metrics(), label='orders')
+
+        restored = pickle.loads(pickle.dumps(ruler))
+
+        expect(restored.rule_set_names()).to(equal(ruler.rule_set_names()))
+        expect(restored._metrics).to(be_none)
+        expect(restored.check({'amount': 5, 'limit': 10}, sets='amounts').ok).to(equal(True))
+        expect(restored.check({'amount': 15, 'limit': 10}, sets='amounts').rule_names).to(equal(('under-limit', )))
+
+with description('Should test ProcessRunner') as self:
+    with it('validates the records on worker processes in input order'):
+        records = [{'amount': amount, 'limit': 10} for amount in range(-3, 15)]
+        ruler = build_ruler()
+
+        with ProcessRunner(ruler, workers=2, chunk_size=4) as runner:
+            results = runner.apply_many(records, sets='amounts')
+            expect(results).to(equal(ruler.apply_many(records, sets='amounts')))
+
+            results = runner.apply_many(iter(records), sets=['amounts'], fail_fast=False)
+            expect(results).to(equal(ruler.apply_many(records, sets=['amounts'], fail_fast=False)))
+
+    with it('checks for error with invalid chunk size'):
+        try:
+            ProcessRunner(build_ruler(), chunk_size=0)
+            assert False
+        except RulerConfigError as error:
+            expect(error.args[0]).to(equal('Chunk size should be a positive number, got 0'))
+
+    with it('checks for error when the ruler is not picklable'):
+        rule_set = RuleSet(name='set1')
+        rule_set.add_rule(Rule(name='rule1', resolver=lambda x: True))
+
+        ruler = Ruler()
+        ruler.add_set(rule_set)
+
+        try:
+            ProcessRunner(ruler)
+            assert False
+        except RuleConfigError as error:
+            expect(error.args[0].startswith("Rule 'rule1' can't be pickled")).to(equal(True))
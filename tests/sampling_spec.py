@@ -0,0 +1,90 @@
+"""Sampling policies unit testing."""
+
+import time
+
+from expects import be_above, be_below, contain, equal, expect
+from mamba import description, it
+
+from pyruler import FixedRate, KeyRate, LoadRate, Sampler
+from pyruler.errors import RulerConfigError
+
+with description('Should test sampling policies') as self:
+    with it('samples a fixed fraction of the data'):
+        expect(sum(FixedRate(1).sample({}) for _ in range(100))).to(equal(100))
+        expect(sum(FixedRate(0).sample({}) for _ in range(100))).to(equal(0))
+
+        sampler = FixedRate(0.5)
+        sampled = sum(sampler.sample({}) for _ in range(2000))
+
+        expect(sampled).to(be_above(800))
+        expect(sampled).to(be_below(1200))
+        expect(sampler.snapshot()['seen']).to(equal(2000))
+
+    with it('samples always the same keys'):
+        sampler = KeyRate('user.id', 0.3)
+        records = [{'user': {'id': index}} for index in range(1000)]
+
+        sampled = [record for record in records if sampler.sample(record)]
+
+        expect(len(sampled)).to(be_above(200))
+        expect(len(sampled)).to(be_below(400))
+        expect([record for record in records if KeyRate('user.id', 0.3).sample(record)]).to(equal(sampled))
+        expect(sampler.sample({})).to(equal(True))
+
+    with it('adapts the rate to the load'):
+        sampler = LoadRate(target=10, window=0.01)
+
+        for _ in range(1000):
+            sampler.sample({})
+
+        time.sleep(0.02)
+        sampler.sample({})
+
+        expect(sampler.rate).to(be_below(1.0))
+
+    with it('extrapolates the failures of the sampled data'):
+        records = [{'id': index} for index in range(100)]
+        sampled = [record for record in records if KeyRate('id', 0.5).sample(record)][:4]
+        skipped = [record for record in records if not KeyRate('id', 0.5).sample(record)][:4]
+
+        sampler = KeyRate('id', 0.5)
+
+        for record, failed in zip(sampled, (True, False, False, False)):
+            expect(sampler.sample(record)).to(equal(True))
+            sampler.observe(failed)
+
+        for record in skipped:
+            expect(sampler.sample(record)).to(equal(False))
+
+        expect(sampler.snapshot()).to(equal({
+            'seen': 8,
+            'sampled': 4,
+            'checked': 4,
+            'failures': 1,
+            'sample_rate': 0.5,
+            'failure_rate': 0.25,
+            'estimated_failures': 2.0,
+        }))
+
+        sampler.reset()
+        expect(sampler.snapshot()['seen']).to(equal(0))
+
+    with it('checks for error with invalid policies'):
+        for build, message in (
+            (lambda: FixedRate(1.5), 'Sampling rate should be between 0 and 1, got 1.5'),
+            (lambda: KeyRate('id', -1), 'Sampling rate should be between 0 and 1, got -1'),
+            (lambda: LoadRate(0), 'Sampling target should be a positive number, got 0'),
+            (lambda: LoadRate(10, window=0), 'Sampling window should be a positive number, got 0'),
+        ):
+            try:
+                build()
+                assert False
+            except RulerConfigError as error:
+                expect(error.args[0]).to(equal(message))
+
+    with it('checks for error when creating the base sampler'):
+        try:
+            Sampler()  # pylint: disable=abstract-class-instantiated
+            assert False
+        except TypeError as error:
+            expect(error.args[0]).to(contain('abstract', '_decide'))
@@ -0,0 +1,90 @@
+"""Rule set scheduling and routing unit testing."""
+
+from expects import be, be_none, equal, expect
+from mamba import description, it
+
+from pyruler import RuleSet
+from pyruler.errors import RulerConfigError, RulerError, RuleSetConfigError
+from pyruler.scheduling import check_cycles, prerequisites, routing_index, schedule_layers
+
+
+def names(rule_sets):
+    """Get the names of the given rule sets."""
+
+    return [rule_set.name for rule_set in rule_sets]
+
+
+with description('Should test rule set scheduling') as self:
+    with it('groups the rule sets on layers by their dependencies'):
+        rule_sets = [
+            RuleSet(name='score', depends_on=['geo-lookup', 'identity']),
+            RuleSet(name='geo-lookup', depends_on=['address-format']),
+            RuleSet(name='identity', cost=0.5),
+            RuleSet(name='address-format'),
+        ]
+
+        layers = schedule_layers(rule_sets)
+
+        expect([names(layer) for layer in layers]).to(equal([['identity', 'address-format'], ['geo-lookup'],
+                                                             ['score']]))
+
+    with it('gets the prerequisites of the selected rule sets'):
+        rule_sets = {
+            'address-format': RuleSet(name='address-format'),
+            'identity': RuleSet(name='identity'),
+            'geo-lookup': RuleSet(name='geo-lookup', depends_on=['address-format']),
+            'score': RuleSet(name='score', depends_on=['geo-lookup', 'identity']),
+        }
+
+        expect(names(prerequisites(rule_sets, [rule_sets['score']]))).to(
+            equal(['address-format', 'identity', 'geo-lookup']))
+
+        rule_set = RuleSet(name='set1', depends_on=['set2'])
+
+        try:
+            prerequisites({'set1': rule_set}, [rule_set])
+            assert False
+        except RulerError as error:
+            expect(error.args[0]).to(equal("Not found RuleSet 'set2' on Ruler configuration"))
+
+    with it('checks for error with dependency cycles'):
+        check_cycles({'set1': RuleSet(name='set1', depends_on=['missing'])})
+
+        try:
+            check_cycles({'set1': RuleSet(name='set1', depends_on=['set1'])})
+            assert False
+        except RulerConfigError as error:
+            expect(error.args[0]).to(equal("RuleSet dependencies make a cycle: 'set1' -> 'set1'"))
+
+with description('Should test rule set routing') as self:
+    with it('does not build an index when no rule set has a match'):
+        expect(routing_index(((RuleSet(name='set1'), ), ))).to(be_none)
+
+    with it('routes the data to the matching rule sets'):
+        common = RuleSet(name='common')
+        address = RuleSet(name='address', match=('event_type', 'never'))
+        payment = RuleSet(name='payment', match=('event_type', 'payment'), depends_on=['address'])
+        refunds = RuleSet(name='refunds', match=('event_type', ['refund', 'chargeback']))
+        large = RuleSet(name='large', match=lambda data: data.get('amount', 0) > 100)
+
+        router = routing_index(((common, address, refunds, large), (payment, )))
+
+        expect(names(router.route({'event_type': 'payment'})[0])).to(equal(['common', 'address', 'payment']))
+        expect(names(router.route({'event_type': 'chargeback'})[0])).to(equal(['common', 'refunds']))
+        expect(names(router.route({'event_type': 'refund', 'amount': 200})[0])).to(
+            equal(['common', 'refunds', 'large']))
+        expect(names(router.route({})[0])).to(equal(['common']))
+        expect(names(router.route({'event_type': ['unhashable']})[0])).to(equal(['common']))
+        expect([names(layer) for layer in router.route({'event_type': 'payment'})[1]]).to(
+            equal([['common', 'address'], ['payment']]))
+
+        expect(router.route({'event_type': 'payment', 'id': 2})).to(be(router.route({'event_type': 'payment'})))
+
+    with it('checks for error with invalid matches'):
+        try:
+            RuleSet(name='set1', match='event_type')
+            assert False
+        except RuleSetConfigError as error:
+            expect(error.args[0]).to(
+                equal("Match of RuleSet 'set1' should be a predicate or a pair of field path and value, "
+                      "got 'event_type'"))
@@ -0,0 +1,107 @@
+"""Ruler snapshots unit testing."""
+
+import io
+import os
+import tempfile
+
+from expects import be_a, equal, expect
+from mamba import description, it
+
+from pyruler import Metrics, Rule, Ruler, RuleSet
+from pyruler.errors import RulerConfigError
+from pyruler.snapshot import LazyRuleSet
+
+
+def build_ruler():
+    """Create a ruler with picklable rules."""
+
+    amounts = RuleSet(name='amounts', priority=5)
+    amounts.add_many([
+        Rule.field('amount', '>', 0),
+        Rule.expression('amount < limit', name='under-limit', when='limit'),
+    ])
+
+    flags = RuleSet(name='flags', depends_on=['amounts'], match=('kind', 'flagged'))
+    flags.add_rule(Rule(name='not-empty', resolver='operator:truth'))
+
+    ruler = Ruler()
+    ruler.add_many([flags, amounts])
+    ruler.instrument(None, label='orders')
+
+    return ruler
+
+
+with description('Should test Ruler snapshots') as self:
+    with it('loads the rule sets lazily'):
+        ruler = build_ruler()
+        snapshot = io.BytesIO()
+        ruler.dump(snapshot)
+
+        snapshot.seek(0)
+        loaded = Ruler.load(snapshot)
+
+        expect(loaded.rule_set_names()).to(equal(['flags', 'amounts']))
+        expect(loaded._label).to(equal('orders'))
+        expect([rule_set.loaded for rule_set in loaded._rule_sets.values()]).to(equal([False, False]))
+
+        expect(loaded.check({'amount': 15, 'limit': 10}, sets='amounts').rule_names).to(equal(('under-limit', )))
+        expect([rule_set.loaded for rule_set in loaded._rule_sets.values()]).to(equal([False, True]))
+
+        records = [{'amount': 5, 'limit': 10, 'kind': 'flagged'}, {'amount': -1}, {'amount': 20, 'limit': 10}]
+        expect(loaded.apply_many(records, fail_fast=False)).to(equal(ruler.apply_many(records, fail_fast=False)))
+        expect(loaded._resolve_sets(None)[0]).to(be_a(RuleSet))
+
+    with it('writes loaded snapshots without loading the pending rule sets'):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ruler.bin')
+            build_ruler().dump(path)
+
+            loaded = Ruler.load(path)
+            loaded.check({'amount': 1}, sets='amounts')
+            loaded.dump(path)
+
+            expect(loaded._rule_sets['flags'].loaded).to(equal(False))
+            expect(Ruler.load(path).check({'amount': 0}, sets=['flags']).rule_names).to(equal(('amount > 0', )))
+
+    with it('instruments the rule sets when they are loaded'):
+        snapshot = io.BytesIO()
+        build_ruler().dump(snapshot)
+        snapshot.seek(0)
+
+        metrics = Metrics()
+        loaded = Ruler.load(snapshot)
+        loaded.instrument(metrics, label='orders')
+        loaded.check({'amount': 1}, sets='amounts')
+
+        expect(metrics.snapshot()['sets']['amounts']['calls']).to(equal(1))
+        expect(loaded.replace_set(RuleSet(name='flags'))).to(be_a(RuleSet))
+        expect(loaded._rule_sets['amounts']).to(be_a(LazyRuleSet))
+
+    with it('swaps loaded rulers without loading their rule sets'):
+        snapshot = io.BytesIO()
+        build_ruler().dump(snapshot)
+        snapshot.seek(0)
+
+        loaded = Ruler.load(snapshot)
+        ruler = Ruler()
+        ruler.swap(loaded)
+
+        expect([rule_set.loaded for rule_set in ruler._rule_sets.values()]).to(equal([False, False]))
+        expect(ruler.check({'amount': 0}, sets='amounts').rule_names).to(equal(('amount > 0', )))
+        expect([rule_set.loaded for rule_set in loaded._rule_sets.values()]).to(equal([False, False]))
+
+        previous = ruler.swap([])
+
+        expect([rule_set.loaded for rule_set in previous]).to(equal([False, True]))
+
+    with it('checks for error with invalid snapshots'):
+        for content, message in (
+            (b'', 'File is not a pyruler snapshot'),
+            (b'NOTRULE\x01' + bytes(8), 'File is not a pyruler snapshot'),
+            (b'PYRULER\x09' + bytes(8), 'Snapshot version 9 is not supported, expected version 1'),
+        ):
+            try:
+                Ruler.load(io.BytesIO(content))
+                assert False
+            except RulerConfigError as error:
+                expect(error.args[0]).to(equal(message))